@@ -1,13 +1,21 @@
 # main.py
+import argparse
 import asyncio
 import os
 from datetime import datetime
 from src.news_collector import SmartNewsCollector
+from src.article_store import ArticleStore
+from src.article_extractor import ArticleExtractor
 from src.script_generator import DialogueScriptGenerator
+from src.script_cache import ScriptCache
+from src.tts_cache import TTSCache
+from src.build_journal import BuildJournal
 from src.podcast_creator import MultiVoicePodcastCreator
+from src.tts_backends import get_backend
 from src.rss_generator import PodcastRSSGenerator
 
-async def generate_daily_podcast():
+async def generate_daily_podcast(enrich=False, refresh_script=False, stream_script=False, sectioned=False,
+                                 coalesce_tts=False, resume=False, tts_backend=None):
     """Main function to generate daily podcast"""
     
     print("=" * 60)
@@ -20,37 +28,33 @@ async def generate_daily_podcast():
     else:
         print("[INFO] Using template-based script generation (set GEMINI_API_KEY for AI)")
     
-    # 1. Collect and filter news
-    print("\n[STEP 1] Collecting news...")
-    collector = SmartNewsCollector()
-    articles = collector.fetch_and_filter_news()
-    market_data = collector.get_market_data()
-    
-    if not articles:
-        print("[ERROR] No relevant news found today")
-        return
-    
-    print(f"[OK] Found {len(articles)} relevant articles")
-    for i, article in enumerate(articles[:5], 1):
-        print(f"   {i}. {article['title'][:60]}...")
+    date_str = datetime.now().strftime('%Y%m%d')
+    journal = BuildJournal(date_str)
     
-    # 2. Generate dialogue script
-    print("\n[STEP 2] Generating script...")
-    generator = DialogueScriptGenerator()
-    dialogue_script = generator.generate_dialogue_script(articles, market_data)
-    print(f"[OK] Generated {len(dialogue_script)} dialogue segments")
+    if resume and journal.script:
+        # Steps 1-2 already ran: reuse the journaled script and any finished segments
+        print(f"\n[INFO] Resuming today's build: {len(journal.script)} dialogue segments, "
+              f"{len(journal.segments)} already synthesized")
+        dialogue_script = journal.script
+    else:
+        if resume:
+            print("\n[INFO] No resumable build for today, starting from scratch")
+        journal.reset()
+        dialogue_script = prepare_script(enrich, refresh_script, stream_script, sectioned)
+        if dialogue_script is None:
+            return
     
     # 3. Create multi-voice podcast
-    print("\n[STEP 3] Creating podcast with Edge TTS...")
-    creator = MultiVoicePodcastCreator()
+    backend = get_backend(tts_backend)
+    print(f"\n[STEP 3] Creating podcast with the {backend.name} TTS backend...")
+    creator = MultiVoicePodcastCreator(tts_cache=TTSCache(), coalesce=coalesce_tts, backend=backend)
     
     # Ensure directories exist
     os.makedirs('docs/episodes', exist_ok=True)
     
-    date_str = datetime.now().strftime('%Y%m%d')
     output_file = f'docs/episodes/oil_news_{date_str}.mp3'
     
-    await creator.create_podcast(dialogue_script, output_file)
+    await creator.create_podcast(dialogue_script, output_file, journal=journal)
     
     # 4. Update RSS feed
     print("\n[STEP 4] Updating RSS feed...")
@@ -63,11 +67,52 @@ async def generate_daily_podcast():
     generate_html_index()
     print("[OK] HTML index updated")
     
+    # The episode is published, nothing left to resume
+    journal.reset()
+    
     print("\n" + "=" * 60)
     print(f"[SUCCESS] PODCAST GENERATED SUCCESSFULLY!")
     print(f"[FILE] {output_file}")
     print("=" * 60)
 
+def prepare_script(enrich, refresh_script, stream_script, sectioned):
+    """Steps 1-2: collect today's news and write the dialogue script (None if there is no news)"""
+    
+    # 1. Collect and filter news
+    print("\n[STEP 1] Collecting news...")
+    collector = SmartNewsCollector(store=ArticleStore(), fast_parser=True)
+    articles = collector.fetch_and_filter_news()
+    market_data = collector.get_market_data()
+    
+    if not articles:
+        print("[ERROR] No relevant news found today")
+        return None
+    
+    print(f"[OK] Found {len(articles)} relevant articles")
+    for i, article in enumerate(articles[:5], 1):
+        print(f"   {i}. {article['title'][:60]}...")
+    
+    # Optional: pull the full article text so the script has more than the RSS summary
+    if enrich:
+        print("\n[STEP 1.5] Extracting full article text...")
+        ArticleExtractor().enrich(articles)
+    
+    # 2. Generate dialogue script
+    print("\n[STEP 2] Generating script...")
+    script_cache = ScriptCache()
+    if refresh_script:
+        print(f"[INFO] Cleared {script_cache.invalidate()} cached scripts")
+    generator = DialogueScriptGenerator(cache=script_cache, sectioned=sectioned)
+    if stream_script:
+        # Turns are handed to TTS as soon as Gemini finishes writing each one
+        dialogue_script = generator.stream_dialogue_script(articles, market_data)
+        print("[OK] Streaming script straight into speech synthesis")
+    else:
+        dialogue_script = generator.generate_dialogue_script(articles, market_data)
+        print(f"[OK] Generated {len(dialogue_script)} dialogue segments")
+    
+    return dialogue_script
+
 def generate_html_index():
     """Generate simple HTML page for GitHub Pages"""
     html_content = """
@@ -136,5 +181,35 @@ def generate_html_index():
     with open('docs/index.html', 'w', encoding='utf-8') as f:
         f.write(html_content)
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate the daily Oil Field Insights podcast")
+    parser.add_argument('--enrich', action='store_true',
+                        help="fetch the linked article pages and give the script their full text")
+    parser.add_argument('--refresh-script', action='store_true',
+                        help="clear the script cache and regenerate the script with Gemini")
+    # Streaming reads one Gemini response as it is written; sectioned mode makes several
+    script_mode = parser.add_mutually_exclusive_group()
+    script_mode.add_argument('--stream-script', action='store_true',
+                             help="start speech synthesis while Gemini is still writing the script")
+    script_mode.add_argument('--sectioned', action='store_true',
+                             help="outline the episode, then write each section in its own parallel Gemini request")
+    parser.add_argument('--coalesce-tts', action='store_true',
+                        help="synthesize runs of same-voice turns in one request and split them by word timings")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue today's interrupted build from its journal instead of starting over")
+    parser.add_argument('--tts-backend', choices=['edge', 'local', 'tone', 'espeak'],
+                        help="speech engine (default: TTS_BACKEND from the environment, else edge); "
+                             "'local' runs offline with espeak if installed, otherwise a test tone synthesizer")
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    asyncio.run(generate_daily_podcast())
\ No newline at end of file
+    args = parse_args()
+    asyncio.run(generate_daily_podcast(
+        enrich=args.enrich,
+        refresh_script=args.refresh_script,
+        stream_script=args.stream_script,
+        sectioned=args.sectioned,
+        coalesce_tts=args.coalesce_tts,
+        resume=args.resume,
+        tts_backend=args.tts_backend
+    ))
\ No newline at end of file
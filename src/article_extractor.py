@@ -0,0 +1,139 @@
+# src/article_extractor.py
+import os
+import json
+import hashlib
+import requests
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from lxml import html as lxml_html
+from src.file_cache import atomic_write
+
+# Elements that never hold article text
+_BOILERPLATE_TAGS = ['script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside', 'form',
+                     'iframe', 'svg', 'button', 'figure']
+
+def extract_main_text(page, max_chars=4000):
+    """
+    Extract the main article text from an HTML page.
+    
+    Picks the element whose direct <p> children carry the most text (the
+    usual shape of an article body), falling back to every paragraph on
+    the page. Module-level so it can run in a process pool.
+    """
+    try:
+        tree = lxml_html.fromstring(page)
+    except (ValueError, lxml_html.etree.ParserError):
+        return ''
+    
+    for element in tree.xpath('//' + ' | //'.join(_BOILERPLATE_TAGS)):
+        element.drop_tree()
+    
+    best, best_length = None, 0
+    for container in tree.xpath('//*[p]'):
+        length = sum(len(p.text_content().strip()) for p in container.findall('p'))
+        if length > best_length:
+            best, best_length = container, length
+    
+    paragraphs = best.findall('p') if best is not None else tree.xpath('//p')
+    text = '\n\n'.join(' '.join(p.text_content().split()) for p in paragraphs)
+    return text.strip()[:max_chars]
+
+class ArticleExtractor:
+    """
+    Optional enrichment stage: fetch the linked article pages and extract their body text.
+    
+    Pages are downloaded concurrently in a thread pool and parsed in a
+    process pool. Extracted bodies are cached on disk by URL (so known
+    pages are not fetched again) and by content hash (so the same page
+    served under a different URL is not parsed again).
+    """
+    
+    def __init__(self, cache_dir='.cache/articles', max_fetchers=8, max_parsers=None,
+                 timeout=10, max_chars=4000):
+        self.cache_dir = cache_dir
+        self.max_fetchers = max_fetchers
+        self.max_parsers = max_parsers or min(os.cpu_count() or 1, 4)
+        self.timeout = timeout
+        self.max_chars = max_chars
+        self.user_agent = "Oil Podcast Generator/1.0 (+https://github.com/shariqbaig/oil-podcast-generator)"
+        os.makedirs(os.path.join(self.cache_dir, 'by_url'), exist_ok=True)
+        os.makedirs(os.path.join(self.cache_dir, 'by_content'), exist_ok=True)
+    
+    @staticmethod
+    def _digest(value):
+        return hashlib.sha256(value).hexdigest()
+    
+    def _read(self, kind, key):
+        try:
+            with open(os.path.join(self.cache_dir, kind, f"{key}.json"), 'r', encoding='utf-8') as f:
+                return json.load(f)['body']
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    def _write(self, kind, key, body):
+        try:
+            atomic_write(os.path.join(self.cache_dir, kind, f"{key}.json"), json.dumps({'body': body}))
+        except OSError as e:
+            print(f"  Could not cache article body: {e}")
+    
+    def _download(self, url):
+        response = requests.get(url, headers={'User-Agent': self.user_agent}, timeout=self.timeout)
+        response.raise_for_status()
+        return response.content
+    
+    def enrich(self, articles):
+        """Add a 'body' key to each article (empty string when extraction fails)"""
+        pending = {}
+        for article in articles:
+            url = article.get('link')
+            body = self._read('by_url', self._digest(url.encode('utf-8'))) if url else ''
+            if body is None:
+                pending.setdefault(url, []).append(article)
+            else:
+                article['body'] = body
+        
+        if not pending:
+            return articles
+        
+        print(f"Fetching {len(pending)} article pages...")
+        pages = {}
+        with ThreadPoolExecutor(max_workers=self.max_fetchers) as fetchers:
+            futures = {url: fetchers.submit(self._download, url) for url in pending}
+            for url, future in futures.items():
+                try:
+                    pages[url] = future.result()
+                except Exception as e:
+                    print(f"  Could not fetch {url}: {e}")
+        
+        # Identical pages (syndication, redirects) only need parsing once
+        to_parse = {}
+        bodies = {}
+        for url, page in pages.items():
+            content_key = self._digest(page)
+            cached = self._read('by_content', content_key)
+            if cached is not None:
+                bodies[url] = cached
+            else:
+                to_parse.setdefault(content_key, (page, []))[1].append(url)
+        
+        if to_parse:
+            with ProcessPoolExecutor(max_workers=self.max_parsers) as parsers:
+                keys = list(to_parse)
+                results = parsers.map(
+                    extract_main_text,
+                    [to_parse[key][0] for key in keys],
+                    [self.max_chars] * len(keys)
+                )
+                for content_key, body in zip(keys, results):
+                    self._write('by_content', content_key, body)
+                    for url in to_parse[content_key][1]:
+                        bodies[url] = body
+        
+        for url, waiting in pending.items():
+            body = bodies.get(url, '')
+            if url in bodies:
+                self._write('by_url', self._digest(url.encode('utf-8')), body)
+            for article in waiting:
+                article['body'] = body
+        
+        print(f"[OK] Extracted {sum(1 for body in bodies.values() if body)} article bodies")
+        return articles
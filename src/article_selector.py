@@ -0,0 +1,132 @@
+# src/article_selector.py
+import heapq
+
+class DiverseTopK:
+    """
+    Streaming top-k article selector with a per-source quota.
+    
+    Articles are pushed one at a time and only the current selection is
+    kept, so memory is bounded by ``k`` no matter how many feeds are
+    scanned. Without near-duplicate clusters the result is exactly what
+    sorting everything by score and walking the list with the quota would
+    give; ties keep the article that arrived first.
+    
+    Articles carrying a ``cluster`` key are treated as copies of the same
+    story: a better-scoring copy replaces the selected one, a worse copy
+    is dropped. A replacement can free two slots (the old copy and a pick
+    from the new copy's full source), so the best ``k`` articles turned
+    away for capacity or quota are kept in reserve to refill the selection.
+    """
+    
+    def __init__(self, k=10, per_source=2):
+        self.k = k
+        self.per_source = per_source
+        self._heap = []        # min-heap of entries, lazily invalidated
+        self._by_source = {}   # source -> live entries
+        self._by_cluster = {}  # cluster -> live entry
+        self._reserve = []     # min-heap of (rank, article) turned away, for refills
+        self._size = 0
+        self._seq = 0
+    
+    def __len__(self):
+        return self._size
+    
+    def push(self, article):
+        """Offer an article; returns True if it is (for now) part of the selection"""
+        if self.k <= 0 or self.per_source <= 0:
+            return False
+        
+        # Entry layout: [rank, article, alive]; higher rank is better, earlier wins ties
+        entry = [(article['score'], -self._seq), article, True]
+        self._seq += 1
+        
+        cluster = article.get('cluster')
+        rival = self._by_cluster.get(cluster) if cluster is not None else None
+        if rival is not None and entry[0] <= rival[0]:
+            return False
+        
+        # Source quota - a full source only admits an article that beats its weakest pick
+        victim = None
+        source_entries = [e for e in self._by_source.get(article['source'], []) if e is not rival]
+        if len(source_entries) >= self.per_source:
+            victim = min(source_entries, key=lambda e: e[0])
+            if entry[0] <= victim[0]:
+                self._drop(entry)
+                return False
+        
+        if rival is not None:
+            self._remove(rival)
+        if victim is not None:
+            self._remove(victim)
+            self._drop(victim)
+        self._add(entry)
+        
+        # Over capacity - drop the weakest selected article (possibly this one)
+        if self._size > self.k:
+            weakest = self._peek_min()
+            self._remove(weakest)
+            self._drop(weakest)
+            return weakest is not entry
+        
+        if rival is not None and victim is not None:
+            self._refill()
+        return True
+    
+    def extend(self, articles):
+        for article in articles:
+            self.push(article)
+    
+    def results(self):
+        """Selected articles, best first"""
+        live = [entry for entry in self._heap if entry[2]]
+        live.sort(key=lambda e: e[0], reverse=True)
+        return [entry[1] for entry in live]
+    
+    def _add(self, entry):
+        heapq.heappush(self._heap, entry)
+        article = entry[1]
+        self._by_source.setdefault(article['source'], []).append(entry)
+        if article.get('cluster') is not None:
+            self._by_cluster[article['cluster']] = entry
+        self._size += 1
+    
+    def _remove(self, entry):
+        entry[2] = False
+        article = entry[1]
+        self._by_source[article['source']].remove(entry)
+        if self._by_cluster.get(article.get('cluster')) is entry:
+            del self._by_cluster[article['cluster']]
+        self._size -= 1
+        
+        # Keep the lazily-invalidated heap from growing past a small multiple of k
+        if len(self._heap) > 4 * self.k + 16:
+            self._heap = [e for e in self._heap if e[2]]
+            heapq.heapify(self._heap)
+    
+    def _drop(self, entry):
+        """Reserve an article turned away for capacity or quota if it is among the best ``k``"""
+        heapq.heappush(self._reserve, (entry[0], entry[1]))
+        if len(self._reserve) > self.k:
+            heapq.heappop(self._reserve)
+    
+    def _refill(self):
+        """Add the best reserved articles that fit without displacing anything"""
+        kept = []
+        for rank, article in sorted(self._reserve, reverse=True):
+            cluster = article.get('cluster')
+            fits = (
+                self._size < self.k
+                and (cluster is None or cluster not in self._by_cluster)
+                and len(self._by_source.get(article['source'], [])) < self.per_source
+            )
+            if fits:
+                self._add([rank, article, True])
+            else:
+                kept.append((rank, article))
+        heapq.heapify(kept)
+        self._reserve = kept
+    
+    def _peek_min(self):
+        while not self._heap[0][2]:
+            heapq.heappop(self._heap)
+        return self._heap[0]
@@ -0,0 +1,179 @@
+# src/article_store.py
+import os
+import re
+import sqlite3
+import hashlib
+import numpy as np
+from datetime import datetime
+
+class ArticleStore:
+    """
+    Embedded SQLite store of every article the collector has seen.
+    
+    Articles are keyed by link and by a hash of the normalized title, so
+    entries already ingested on a previous run can be skipped before any
+    scoring happens. Links are known forever; titles only for
+    ``title_window_days``, since recurring headlines ("Oil prices rise as
+    OPEC+ meets", weekly inventory reports) are new stories each time.
+    Selection queries run against the store, indexed on published time,
+    source and relevance.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS articles (
+            link TEXT PRIMARY KEY,
+            title_hash TEXT NOT NULL,
+            title TEXT NOT NULL,
+            summary TEXT NOT NULL DEFAULT '',
+            source TEXT NOT NULL DEFAULT 'Unknown',
+            relevance INTEGER NOT NULL,
+            published REAL NOT NULL,
+            dated INTEGER NOT NULL DEFAULT 1,
+            first_seen REAL NOT NULL,
+            signature BLOB,
+            cluster TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_articles_title_hash ON articles (title_hash);
+        CREATE INDEX IF NOT EXISTS idx_articles_published ON articles (published);
+        CREATE INDEX IF NOT EXISTS idx_articles_source ON articles (source);
+        CREATE INDEX IF NOT EXISTS idx_articles_relevance ON articles (relevance);
+    """
+    
+    def __init__(self, db_path='.cache/articles.db', title_window_days=7):
+        self.db_path = db_path
+        self.title_window_days = title_window_days
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(self.SCHEMA)
+        self._migrate()
+    
+    def _migrate(self):
+        """Add columns introduced after a database was first created"""
+        columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(articles)")}
+        with self.conn:
+            for name, definition in (('signature', 'BLOB'), ('cluster', 'TEXT')):
+                if name not in columns:
+                    self.conn.execute(f"ALTER TABLE articles ADD COLUMN {name} {definition}")
+    
+    @staticmethod
+    def title_hash(title):
+        """Hash of the title with case, punctuation and spacing normalized away"""
+        normalized = re.sub(r'[^\w\s]', '', title.lower())
+        normalized = ' '.join(normalized.split())
+        return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def _key(link, title_hash):
+        """Entries without a link fall back to their title hash as the key"""
+        return link or f"title:{title_hash}"
+    
+    def key(self, article):
+        """Primary key the store uses for an article dict"""
+        return self._key(article['link'], self.title_hash(article['title']))
+    
+    def is_known(self, link, title):
+        """True if this link was ever ingested, or this normalized title in the recent window"""
+        title_hash = self.title_hash(title)
+        cutoff = datetime.now().timestamp() - self.title_window_days * 86400
+        if link and self.conn.execute("SELECT 1 FROM articles WHERE link = ? LIMIT 1", (link,)).fetchone():
+            return True
+        row = self.conn.execute(
+            "SELECT 1 FROM articles WHERE title_hash = ? AND first_seen >= ? LIMIT 1",
+            (title_hash, cutoff)
+        ).fetchone()
+        return row is not None
+    
+    def upsert(self, article):
+        """
+        Insert or update an article.
+        
+        Expects the collector's article dict: title, summary, link, source,
+        relevance, published (datetime) and dated (False when the feed gave
+        no publication date and ``published`` is the time it was first seen).
+        Relevant articles also carry their MinHash ``signature`` and the
+        near-duplicate ``cluster`` they belong to.
+        """
+        title_hash = self.title_hash(article['title'])
+        now = datetime.now().timestamp()
+        signature = article.get('signature')
+        with self.conn:
+            self.conn.execute(
+                """
+                INSERT INTO articles
+                    (link, title_hash, title, summary, source, relevance, published, dated, first_seen,
+                     signature, cluster)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(link) DO UPDATE SET
+                    -- A linkless headline seen again after the title window is a new story
+                    published = CASE WHEN articles.link LIKE 'title:%'
+                                     THEN excluded.published ELSE articles.published END,
+                    first_seen = CASE WHEN articles.link LIKE 'title:%'
+                                      THEN excluded.first_seen ELSE articles.first_seen END,
+                    title = excluded.title,
+                    summary = excluded.summary,
+                    source = excluded.source,
+                    relevance = excluded.relevance,
+                    signature = excluded.signature,
+                    cluster = excluded.cluster
+                """,
+                (
+                    self._key(article['link'], title_hash),
+                    title_hash,
+                    article['title'],
+                    article.get('summary', ''),
+                    article.get('source', 'Unknown'),
+                    article['relevance'],
+                    article['published'].timestamp(),
+                    1 if article.get('dated', True) else 0,
+                    now,
+                    signature.tobytes() if signature is not None else None,
+                    article.get('cluster')
+                )
+            )
+    
+    def recent(self, hours=48, min_relevance=1):
+        """Yield articles published in the last ``hours``, most relevant first"""
+        cutoff = datetime.now().timestamp() - hours * 3600
+        cursor = self.conn.execute(
+            """
+            SELECT link, title, summary, source, relevance, published, dated, cluster
+            FROM articles
+            WHERE published >= ? AND relevance >= ?
+            ORDER BY relevance DESC, published DESC
+            """,
+            (cutoff, min_relevance)
+        )
+        for row in cursor:
+            yield {
+                'title': row['title'],
+                'summary': row['summary'],
+                'link': '' if row['link'].startswith('title:') else row['link'],
+                'source': row['source'],
+                'relevance': row['relevance'],
+                'published': datetime.fromtimestamp(row['published']),
+                'dated': bool(row['dated']),
+                'cluster': row['cluster'] or row['link']
+            }
+    
+    def recent_signatures(self, days=7):
+        """Yield (key, signature, cluster) for articles first seen in the last ``days``"""
+        cutoff = datetime.now().timestamp() - days * 86400
+        cursor = self.conn.execute(
+            """
+            SELECT link, signature, cluster FROM articles
+            WHERE first_seen >= ? AND signature IS NOT NULL
+            """,
+            (cutoff,)
+        )
+        for row in cursor:
+            yield row['link'], np.frombuffer(row['signature'], dtype=np.uint32), row['cluster'] or row['link']
+    
+    def count(self):
+        """Total number of articles in the store"""
+        return self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+    
+    def close(self):
+        self.conn.close()
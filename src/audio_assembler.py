@@ -0,0 +1,84 @@
+# src/audio_assembler.py
+import numpy as np
+from pydub import AudioSegment
+
+class AudioAssembler:
+    """
+    Joins speech segments and pauses into one AudioSegment in linear time.
+
+    Segments are collected first; ``build`` works out the total frame count,
+    allocates one PCM buffer and copies each segment into place once. Pauses
+    are just zero-filled ranges of that buffer. Chaining pydub's ``+``
+    instead copies the whole episode so far for every segment added.
+    """
+
+    def __init__(self, frame_rate=24000, channels=1, sample_width=2):
+        # Used only when no speech has been added (edge-tts MP3 decodes to 24 kHz mono 16-bit)
+        self.default_format = (frame_rate, channels, sample_width)
+        self.parts = []
+        self.duration_ms = 0.0
+
+    def __len__(self):
+        return len(self.parts)
+
+    def add(self, audio):
+        self.parts.append(audio)
+        self.duration_ms += audio.frame_count() * 1000.0 / audio.frame_rate
+
+    def add_silence(self, duration_ms):
+        if duration_ms > 0:
+            self.parts.append(duration_ms)
+            self.duration_ms += duration_ms
+
+    @property
+    def has_audio(self):
+        return any(isinstance(part, AudioSegment) for part in self.parts)
+
+    def _target_format(self):
+        # Same choice pydub makes when adding segments: the highest of each parameter
+        speech = [part for part in self.parts if isinstance(part, AudioSegment)]
+        if not speech:
+            return self.default_format
+        return (
+            max(audio.frame_rate for audio in speech),
+            max(audio.channels for audio in speech),
+            max(audio.sample_width for audio in speech)
+        )
+
+    def build(self, lead_in_ms=0, tail_ms=0):
+        """Return the assembled audio, with optional silence before and after"""
+        frame_rate, channels, sample_width = self._target_format()
+        frame_width = channels * sample_width
+
+        def silent_bytes(duration_ms):
+            return int(duration_ms * frame_rate / 1000.0) * frame_width
+
+        chunks = []
+        for part in self.parts:
+            if isinstance(part, AudioSegment):
+                if (part.frame_rate, part.channels, part.sample_width) != (frame_rate, channels, sample_width):
+                    part = part.set_frame_rate(frame_rate).set_channels(channels).set_sample_width(sample_width)
+                chunks.append(part.raw_data)
+            else:
+                chunks.append(silent_bytes(part))
+
+        lead = silent_bytes(lead_in_ms)
+        total = lead + sum(len(c) if isinstance(c, (bytes, bytearray)) else c for c in chunks) + silent_bytes(tail_ms)
+
+        # Zero-filled, so lead-in, pauses and tail need no writes at all
+        pcm = bytearray(total)
+        view = np.frombuffer(pcm, dtype=np.uint8)
+        offset = lead
+        for chunk in chunks:
+            if isinstance(chunk, int):
+                offset += chunk
+            else:
+                view[offset:offset + len(chunk)] = np.frombuffer(chunk, dtype=np.uint8)
+                offset += len(chunk)
+
+        return AudioSegment(
+            data=pcm,
+            sample_width=sample_width,
+            frame_rate=frame_rate,
+            channels=channels
+        )
@@ -0,0 +1,119 @@
+# src/build_journal.py
+import os
+import json
+import shutil
+import hashlib
+from src.file_cache import atomic_write
+
+class BuildJournal:
+    """
+    On-disk record of one episode build, so a failed build can be resumed.
+
+    The finished script is saved as soon as it is complete, and each
+    synthesized segment's audio is written to the episode directory before a
+    line describing it is appended to ``segments.jsonl``. A crash can at
+    worst lose the segment being written; a torn last line is skipped on
+    load. Segments are matched to turns by a hash of speaker, emotion and
+    text as well as position, so audio is never reused for a turn that
+    changed.
+    """
+
+    def __init__(self, episode_id, root='.cache/builds'):
+        self.path = os.path.join(root, episode_id)
+        self.audio_dir = os.path.join(self.path, 'audio')
+        self.script = None
+        self.segments = {}
+        self._audio = {}
+        self.load()
+
+    @staticmethod
+    def turn_key(turn):
+        payload = json.dumps(
+            [turn.get('speaker'), turn.get('emotion', 'neutral'), turn.get('text', '')],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+    def load(self):
+        """Read the script and completed segments from disk"""
+        self.script = None
+        self.segments = {}
+        self._audio = {}
+        try:
+            with open(os.path.join(self.path, 'script.json'), 'r', encoding='utf-8') as f:
+                self.script = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+        try:
+            with open(os.path.join(self.path, 'segments.jsonl'), 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    for turn in entry['turns']:
+                        self.segments[turn['index']] = (
+                            turn['key'], entry['file'], turn['start_ms'], turn['end_ms'], turn.get('words', [])
+                        )
+        except OSError:
+            pass
+
+    def reset(self):
+        """Forget any previous build of this episode"""
+        shutil.rmtree(self.path, ignore_errors=True)
+        self.load()
+
+    def save_script(self, script):
+        os.makedirs(self.path, exist_ok=True)
+        atomic_write(os.path.join(self.path, 'script.json'), json.dumps(script, ensure_ascii=False))
+        self.script = list(script)
+
+    def _read_audio(self, name):
+        # One bytes object per file, so turns cut from the same merged audio share it
+        if name not in self._audio:
+            with open(os.path.join(self.audio_dir, name), 'rb') as f:
+                self._audio[name] = f.read()
+        return self._audio[name]
+
+    def lookup(self, index, turn):
+        """Journaled (mp3_data, start_ms, end_ms, words) piece for turn ``index``, or None"""
+        entry = self.segments.get(index)
+        if not entry or entry[0] != self.turn_key(turn):
+            return None
+        _, name, start_ms, end_ms, words = entry
+        try:
+            return (self._read_audio(name), start_ms, end_ms, words)
+        except OSError:
+            return None
+
+    def record(self, first_index, group, pieces, audio_format='mp3'):
+        """Persist the synthesized pieces of a group of turns starting at ``first_index``"""
+        os.makedirs(self.audio_dir, exist_ok=True)
+
+        entries = {}
+        for offset, (turn, piece) in enumerate(zip(group, pieces)):
+            if not piece:
+                continue
+            mp3_data, start_ms, end_ms, words = piece
+            name = entries.setdefault(id(mp3_data), (f"{first_index + offset:04d}.{audio_format}", mp3_data, []))[0]
+            entries[id(mp3_data)][2].append({
+                'index': first_index + offset,
+                'key': self.turn_key(turn),
+                'start_ms': start_ms,
+                'end_ms': end_ms,
+                'words': words
+            })
+
+        lines = []
+        for name, mp3_data, turns in entries.values():
+            atomic_write(os.path.join(self.audio_dir, name), mp3_data)
+            lines.append(json.dumps({'file': name, 'turns': turns}) + '\n')
+            for turn in turns:
+                self.segments[turn['index']] = (turn['key'], name, turn['start_ms'], turn['end_ms'], turn['words'])
+
+        if lines:
+            with open(os.path.join(self.path, 'segments.jsonl'), 'a', encoding='utf-8') as f:
+                f.write(''.join(lines))
+                f.flush()
+                os.fsync(f.fileno())
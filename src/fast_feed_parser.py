@@ -0,0 +1,109 @@
+# src/fast_feed_parser.py
+"""
+Lightweight streaming RSS/Atom parser built on lxml iterparse.
+
+Only extracts what the news collector uses (channel title plus each
+entry's title, summary, link and publication date) and stops as soon
+as ``max_entries`` entries have been read. Malformed documents raise
+FeedParseError so the caller can fall back to feedparser.
+"""
+from io import BytesIO
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from lxml import etree
+
+class FeedParseError(Exception):
+    """The document is not a well-formed RSS/Atom feed"""
+
+_ENTRY_TAGS = ('item', 'entry')
+_CHANNEL_TAGS = ('channel', 'feed')
+_SUMMARY_TAGS = ('description', 'summary', 'content', 'encoded')
+_DATE_TAGS = ('pubDate', 'published', 'updated', 'date', 'issued', 'modified')
+
+def _localname(element):
+    tag = element.tag
+    if not isinstance(tag, str):
+        return None  # comments and processing instructions
+    return tag.rsplit('}', 1)[-1]
+
+def _text(element):
+    """Text content, including nested markup such as Atom xhtml content"""
+    if len(element):
+        return ''.join(element.itertext()).strip()
+    return (element.text or '').strip()
+
+def _parse_date(value):
+    """UTC [year, month, day, hour, minute, second] like feedparser's *_parsed, or None"""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)  # RFC 822, used by RSS
+    except (TypeError, ValueError, IndexError):
+        try:
+            parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))  # RFC 3339, used by Atom
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return [parsed.year, parsed.month, parsed.day, parsed.hour, parsed.minute, parsed.second]
+
+def _entry_fields(element):
+    entry = {'title': '', 'summary': '', 'link': '', 'published': None}
+    summary_rank = len(_SUMMARY_TAGS)
+    date_rank = len(_DATE_TAGS)
+    
+    for child in element:
+        name = _localname(child)
+        if name == 'title':
+            entry['title'] = _text(child)
+        elif name == 'link':
+            # Atom links live in href; prefer rel="alternate" (or no rel at all)
+            href = child.get('href')
+            if href is not None:
+                if child.get('rel', 'alternate') == 'alternate' or not entry['link']:
+                    entry['link'] = href
+            elif not entry['link']:
+                entry['link'] = _text(child)
+        elif name in _SUMMARY_TAGS and _SUMMARY_TAGS.index(name) < summary_rank:
+            entry['summary'] = _text(child)
+            summary_rank = _SUMMARY_TAGS.index(name)
+        elif name in _DATE_TAGS and _DATE_TAGS.index(name) < date_rank:
+            entry['published'] = _text(child) or None
+            date_rank = _DATE_TAGS.index(name)
+    
+    entry['published_parsed'] = _parse_date(entry['published'])
+    return entry
+
+def parse_feed(content, max_entries=10):
+    """
+    Parse up to ``max_entries`` entries from an RSS or Atom document.
+    
+    Returns:
+        (channel_title, entries) with entries shaped like the collector's
+        normalized entries: title, summary, link, published, published_parsed
+    """
+    title = None
+    entries = []
+    
+    try:
+        for _, element in etree.iterparse(BytesIO(content), events=('end',),
+                                          resolve_entities=False, no_network=True):
+            name = _localname(element)
+            if name == 'title' and title is None:
+                parent = element.getparent()
+                if parent is not None and _localname(parent) in _CHANNEL_TAGS:
+                    title = _text(element)
+            elif name in _ENTRY_TAGS:
+                entry = _entry_fields(element)
+                if entry['title']:
+                    entries.append(entry)
+                element.clear()
+                if len(entries) >= max_entries:
+                    break
+    except etree.XMLSyntaxError as e:
+        raise FeedParseError(str(e)) from e
+    
+    if not entries:
+        raise FeedParseError("no RSS items or Atom entries found")
+    
+    return title or 'Unknown', entries
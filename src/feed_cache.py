@@ -0,0 +1,56 @@
+# src/feed_cache.py
+import os
+import json
+import hashlib
+from datetime import datetime
+from src.file_cache import atomic_write
+
+class FeedCache:
+    """On-disk cache of feed validators (ETag / Last-Modified) and parsed entries"""
+    
+    def __init__(self, cache_dir='.cache/feeds'):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+    
+    def _path(self, feed_url):
+        """One JSON file per feed, named by a hash of the URL"""
+        digest = hashlib.sha1(feed_url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+    
+    def get(self, feed_url):
+        """Return the cached record for a feed, or None if there is none"""
+        try:
+            with open(self._path(feed_url), 'r', encoding='utf-8') as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        # Guard against hash collisions and hand-edited files
+        if record.get('url') != feed_url:
+            return None
+        return record
+    
+    def conditional_headers(self, feed_url):
+        """Build If-None-Match / If-Modified-Since headers from the cached validators"""
+        record = self.get(feed_url)
+        headers = {}
+        if record:
+            if record.get('etag'):
+                headers['If-None-Match'] = record['etag']
+            if record.get('last_modified'):
+                headers['If-Modified-Since'] = record['last_modified']
+        return headers
+    
+    def put(self, feed_url, title, entries, etag=None, last_modified=None):
+        """Store parsed entries and validators for a feed"""
+        record = {
+            'url': feed_url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': datetime.now().isoformat(),
+            'title': title,
+            'entries': entries
+        }
+        
+        # Write to a temp file and rename so a crash never leaves a truncated cache entry
+        atomic_write(self._path(feed_url), json.dumps(record))
@@ -0,0 +1,125 @@
+# src/feed_health.py
+import os
+import json
+import time
+import threading
+from src.file_cache import atomic_write
+
+class FeedHealthRegistry:
+    """
+    Persisted per-feed health records driving a circuit breaker and adaptive polling.
+    
+    After ``failure_threshold`` consecutive failures a feed's circuit opens
+    and it is skipped until its backoff expires; the next attempt is a
+    single probe, and another failure doubles the backoff. Each feed also
+    gets a poll interval derived from how often its content actually
+    changes, so slow-moving feeds are not re-downloaded on every run.
+    """
+    
+    def __init__(self, path='.cache/feed_health.json', failure_threshold=3,
+                 base_backoff_minutes=30, max_backoff_hours=48,
+                 min_poll_minutes=0, max_poll_hours=72):
+        self.path = path
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff_minutes * 60
+        self.max_backoff = max_backoff_hours * 3600
+        self.min_poll = min_poll_minutes * 60
+        self.max_poll = max_poll_hours * 3600
+        self.lock = threading.Lock()
+        self.records = self._load()
+    
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def save(self):
+        """Write all records atomically"""
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        with self.lock:
+            data = json.dumps(self.records, indent=2)
+        try:
+            atomic_write(self.path, data)
+        except OSError as e:
+            print(f"[WARNING] Could not save feed health: {e}")
+    
+    def _record(self, feed_url):
+        return self.records.setdefault(feed_url, {
+            'successes': 0,
+            'failures': 0,
+            'consecutive_failures': 0,
+            'latency': None,          # seconds, exponentially weighted
+            'last_success': None,
+            'last_failure': None,
+            'open_until': None,       # circuit breaker
+            'digest': None,           # fingerprint of the last seen entries
+            'last_changed': None,
+            'change_interval': None,  # seconds between content changes, exponentially weighted
+            'next_poll': None
+        })
+    
+    @staticmethod
+    def _ewma(previous, value, alpha=0.3):
+        return value if previous is None else alpha * value + (1 - alpha) * previous
+    
+    def success_rate(self, feed_url):
+        record = self.records.get(feed_url)
+        if not record or not record['successes'] + record['failures']:
+            return None
+        return record['successes'] / (record['successes'] + record['failures'])
+    
+    def should_fetch(self, feed_url, now=None):
+        """Return (fetch, reason) - reason is 'circuit open' or 'not due' when skipping"""
+        now = now or time.time()
+        with self.lock:
+            record = self.records.get(feed_url)
+            if not record:
+                return True, None
+            if record['open_until'] and now < record['open_until']:
+                return False, 'circuit open'
+            if record['next_poll'] and now < record['next_poll']:
+                return False, 'not due'
+        return True, None
+    
+    def record_success(self, feed_url, latency, digest=None, now=None):
+        """Record a successful fetch; ``digest`` identifies the entries to detect changes"""
+        now = now or time.time()
+        with self.lock:
+            record = self._record(feed_url)
+            record['successes'] += 1
+            record['consecutive_failures'] = 0
+            record['open_until'] = None
+            record['latency'] = self._ewma(record['latency'], latency)
+            record['last_success'] = now
+            
+            if digest is not None and digest != record['digest']:
+                if record['digest'] is not None and record['last_changed']:
+                    record['change_interval'] = self._ewma(record['change_interval'], now - record['last_changed'])
+                record['digest'] = digest
+                record['last_changed'] = now
+            
+            # Poll about twice per observed update cycle
+            if record['change_interval']:
+                interval = min(max(record['change_interval'] / 2, self.min_poll), self.max_poll)
+                record['next_poll'] = now + interval
+            else:
+                record['next_poll'] = None
+    
+    def record_failure(self, feed_url, latency=None, now=None):
+        """Record a failed fetch, opening the circuit after repeated failures"""
+        now = now or time.time()
+        with self.lock:
+            record = self._record(feed_url)
+            record['failures'] += 1
+            record['consecutive_failures'] += 1
+            record['last_failure'] = now
+            if latency is not None:
+                record['latency'] = self._ewma(record['latency'], latency)
+            
+            excess = record['consecutive_failures'] - self.failure_threshold
+            if excess >= 0:
+                backoff = min(self.base_backoff * (2 ** excess), self.max_backoff)
+                record['open_until'] = now + backoff
@@ -0,0 +1,122 @@
+# src/file_cache.py
+import os
+import tempfile
+
+def atomic_write(path, data):
+    """
+    Write ``data`` (bytes or str) to ``path`` via a temp file and rename.
+
+    Readers see the old file or the new one, never a partial write. The
+    temp file is removed and the OSError re-raised if anything fails.
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+class FileCache:
+    """
+    Size-capped directory of files named ``<key>.<extension>``.
+
+    Files with one of ``extensions`` count towards ``max_bytes``; reading
+    one bumps its modification time, and ``evict`` drops the least
+    recently used first, along with any ``sidecars`` (e.g. ``<key>.json``
+    metadata) of the same key. The size is tracked as a running total so
+    a write does not have to list the directory.
+    """
+
+    def __init__(self, cache_dir, max_bytes, extensions, sidecars=()):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.extensions = tuple(extensions)
+        self.sidecars = tuple(sidecars)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._size = None
+
+    def _path(self, key, extension):
+        return os.path.join(self.cache_dir, f"{key}.{extension}")
+
+    def read(self, key, extension):
+        """Return the bytes stored for ``key``, or None"""
+        path = self._path(key, extension)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        # Bump the modification time so eviction treats it as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def write(self, key, extension, data):
+        """Store ``data`` atomically (raises OSError), then evict if over the size cap"""
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        atomic_write(self._path(key, extension), data)
+        if extension not in self.extensions:
+            return
+        if self._size is None:
+            self.evict()
+        else:
+            self._size += len(data)
+            if self._size > self.max_bytes:
+                self.evict()
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.rsplit('.', 1)[-1] not in self.extensions:
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+        return entries
+
+    def _remove(self, name):
+        """Delete one entry and its sidecars; True if the entry itself existed"""
+        key = name.rsplit('.', 1)[0]
+        try:
+            os.remove(os.path.join(self.cache_dir, name))
+            removed = True
+        except FileNotFoundError:
+            removed = False
+        for extension in self.sidecars:
+            try:
+                os.remove(self._path(key, extension))
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits in ``max_bytes``"""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(name)
+            total -= size
+        self._size = total
+
+    def invalidate(self, key=None):
+        """Remove one entry, or all of them when ``key`` is None; returns the count removed"""
+        if key is not None:
+            names = [f"{key}.{ext}" for ext in self.extensions]
+        else:
+            names = [name for _, _, name in self._entries()]
+        removed = sum(1 for name in names if self._remove(name))
+        self._size = None
+        return removed
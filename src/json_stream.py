@@ -0,0 +1,89 @@
+# src/json_stream.py
+import json
+
+class IncrementalJSONArrayParser:
+    """
+    Incremental parser for a streamed JSON array of objects.
+    
+    Feed it text chunks as they arrive; every call returns the objects
+    that were completed by that chunk. The array starts at the first '['
+    followed by '{', so anything before it (a markdown code fence, or a
+    preamble like "Here [is] the script:") is ignored. Objects that fail
+    to decode are skipped rather than aborting the stream.
+    """
+    
+    def __init__(self):
+        self.buffer = ''
+        self.pos = 0            # next unscanned index into buffer
+        self.depth = 0          # 1 inside the top-level array
+        self.in_string = False
+        self.escaped = False
+        self.object_start = None
+        self.started = False
+        self.finished = False
+        self.skipped = 0        # objects that failed to decode
+    
+    def feed(self, chunk):
+        """Consume a chunk of text and return the list of newly completed objects"""
+        if self.finished or not chunk:
+            return []
+        
+        self.buffer += chunk
+        completed = []
+        buffer = self.buffer
+        i = self.pos
+        
+        while not self.started:
+            i = buffer.find('[', i)
+            if i == -1:
+                self.buffer, self.pos = '', 0
+                return completed
+            j = i + 1
+            while j < len(buffer) and buffer[j].isspace():
+                j += 1
+            if j == len(buffer):
+                # Cannot tell yet whether this '[' opens the array
+                self.buffer, self.pos = buffer[i:], 0
+                return completed
+            if buffer[j] == '{':
+                self.started = True
+                self.depth = 1
+            i += 1
+        
+        while i < len(buffer):
+            char = buffer[i]
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in '{[':
+                if char == '{' and self.depth == 1:
+                    self.object_start = i
+                self.depth += 1
+            elif char in '}]':
+                self.depth -= 1
+                if char == '}' and self.depth == 1 and self.object_start is not None:
+                    try:
+                        completed.append(json.loads(buffer[self.object_start:i + 1]))
+                    except json.JSONDecodeError:
+                        self.skipped += 1
+                    self.object_start = None
+                elif self.depth == 0:
+                    self.finished = True
+                    break
+            i += 1
+        
+        # Keep only the unfinished object (if any) so the buffer stays small
+        if self.object_start is not None:
+            self.buffer = buffer[self.object_start:]
+            self.pos = i - self.object_start
+            self.object_start = 0
+        else:
+            self.buffer, self.pos = '', 0
+        
+        return completed
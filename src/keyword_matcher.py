@@ -0,0 +1,81 @@
+# src/keyword_matcher.py
+import re
+
+class KeywordMatcher:
+    """
+    Weighted keyword matcher compiled once into a single regex.
+    
+    A single scan over the text reports the weighted keyword count and
+    any exclusion hit. Keywords match on word boundaries and overlapping
+    keywords are all counted ("horizontal drilling" also counts "drilling"),
+    the same as running one search per keyword.
+    """
+    
+    def __init__(self, keywords, exclude_keywords=()):
+        """
+        Args:
+            keywords: Mapping of category -> {'words': [...], 'weight': n}
+            exclude_keywords: Substrings that disqualify a text outright
+        """
+        self.weights = {}
+        for data in keywords.values():
+            for word in data['words']:
+                word = word.lower()
+                self.weights[word] = self.weights.get(word, 0) + data['weight']
+        
+        self.exclude_keywords = [word.lower() for word in exclude_keywords]
+        
+        # The regex reports only the longest keyword starting at each position, so fold
+        # the weights of shorter keywords that are whole-word prefixes of it into its total
+        self.match_weights = {}
+        for word in self.weights:
+            total = 0
+            for other, weight in self.weights.items():
+                if word.startswith(other) and (len(other) == len(word) or not self._is_word_char(word[len(other)])):
+                    total += weight
+            self.match_weights[word] = total
+        
+        self.pattern = self._compile()
+    
+    @staticmethod
+    def _is_word_char(char):
+        return char.isalnum() or char == '_'
+    
+    @staticmethod
+    def _alternation(words):
+        """Longest first so the regex prefers "drilling permits" over "drilling"."""
+        return '|'.join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+    
+    def _compile(self):
+        """Build one zero-width pattern so overlapping matches are all visited"""
+        branches = []
+        if self.exclude_keywords:
+            # Exclusions are plain substring matches, as before
+            branches.append(f"(?P<exclude>{self._alternation(self.exclude_keywords)})")
+        if self.weights:
+            # Lookarounds instead of \b so keywords like "E&P" still match on both ends
+            branches.append(f"(?<!\\w)(?P<keyword>{self._alternation(self.weights)})(?!\\w)")
+        if not branches:
+            return None
+        return re.compile(f"(?=(?:{'|'.join(branches)}))")
+    
+    def scan(self, text):
+        """
+        Score a text in a single pass.
+        
+        Returns:
+            (score, excluded) where excluded is the first exclusion keyword
+            found (score is then 0) or None
+        """
+        if self.pattern is None:
+            return 0, None
+        
+        score = 0
+        match_weights = self.match_weights
+        for match in self.pattern.finditer(text.lower()):
+            keyword = match.group('keyword')
+            if keyword is not None:
+                score += match_weights[keyword]
+            else:
+                return 0, match.group('exclude')
+        return score, None
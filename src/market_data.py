@@ -0,0 +1,200 @@
+# src/market_data.py
+import os
+import json
+import time
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from src.price_history import PriceHistory
+from src.file_cache import atomic_write
+
+class TokenBucket:
+    """Thread-safe token bucket, e.g. 5 calls per 60 seconds for the Alpha Vantage free tier"""
+    
+    def __init__(self, capacity=5, period=60.0):
+        self.capacity = capacity
+        self.rate = capacity / period  # tokens per second
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def acquire(self, timeout=None):
+        """Take one token, waiting up to ``timeout`` seconds; returns False if none came free"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+class MarketDataClient:
+    """
+    Alpha Vantage client for the daily WTI and Brent series.
+    
+    Both series are fetched concurrently over a pooled session. Responses
+    are cached on disk for ``ttl_hours`` (the series only update once a
+    day), calls go through a token bucket sized for the free tier, and
+    when the API is throttled the last good response is served instead.
+    """
+    
+    BASE_URL = "https://www.alphavantage.co/query"
+    SERIES = ('WTI', 'BRENT')
+    
+    def __init__(self, api_key=None, cache_dir='.cache/market', ttl_hours=12,
+                 calls_per_minute=5, timeout=10, history=None):
+        load_dotenv()
+        self.api_key = api_key or os.getenv('ALPHA_VANTAGE_API_KEY')
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_hours * 3600
+        self.timeout = timeout
+        self.bucket = TokenBucket(capacity=calls_per_minute, period=60.0)
+        
+        # Every response carries the full daily history - keep it for range queries
+        self.history = history if history is not None else PriceHistory()
+        
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=len(self.SERIES))
+        self.session.mount('https://', adapter)
+        
+        os.makedirs(self.cache_dir, exist_ok=True)
+    
+    def _cache_path(self, function):
+        return os.path.join(self.cache_dir, f"{function.lower()}.json")
+    
+    def _read_cache(self, function):
+        """Return (payload, age_seconds) or (None, None)"""
+        path = self._cache_path(function)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+            return payload, time.time() - os.path.getmtime(path)
+        except (OSError, ValueError):
+            return None, None
+    
+    def _write_cache(self, function, payload):
+        try:
+            atomic_write(self._cache_path(function), json.dumps(payload))
+        except OSError as e:
+            print(f"[WARNING] Could not cache {function} data: {e}")
+    
+    def fetch_series(self, function):
+        """
+        Return the Alpha Vantage payload for one daily series.
+        
+        Serves the disk cache while it is fresh and falls back to the last
+        good (stale) payload when the API is throttled, unreachable or
+        returns an error.
+        Returns None only when there is nothing to serve.
+        """
+        cached, age = self._read_cache(function)
+        if cached is not None and age < self.ttl_seconds:
+            print(f"[INFO] Using cached {function} data ({age / 3600:.1f}h old)")
+            return cached
+        
+        if not self.bucket.acquire(timeout=self.timeout):
+            print(f"[WARNING] Local rate limit reached for {function}, using last good data")
+            return cached
+        
+        try:
+            print(f"[INFO] Fetching {function} data from Alpha Vantage...")
+            response = self.session.get(
+                self.BASE_URL,
+                params={'function': function, 'interval': 'daily', 'apikey': self.api_key},
+                timeout=self.timeout
+            )
+            payload = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"[ERROR] Failed to fetch {function} data: {e}")
+            return cached
+        
+        if 'Error Message' in payload:
+            print(f"[ERROR] Alpha Vantage API error for {function} - check your API key")
+            if cached is not None:
+                print(f"[WARNING] Serving last good {function} data ({age / 3600:.1f}h old)")
+            return cached
+        
+        # Free-tier throttling comes back as a 200 with a "Note" or "Information" message
+        if 'Note' in payload or 'Information' in payload:
+            print("[WARNING] Alpha Vantage API rate limit reached (5 calls/minute for free tier)")
+            if cached is not None:
+                print(f"[INFO] Serving last good {function} data")
+            return cached
+        
+        self._write_cache(function, payload)
+        return payload
+    
+    def _latest_and_change(self, payload, label):
+        """Latest value and day-over-day change string from a series payload"""
+        if not payload or not payload.get('data'):
+            print(f"[WARNING] No {label} data available")
+            return None, None
+        
+        # Alpha Vantage uses "." for days without a value
+        values = [float(point['value']) for point in payload['data'][:10] if point['value'] != '.']
+        if not values:
+            print(f"[WARNING] No {label} data available")
+            return None, None
+        
+        latest = values[0]
+        previous = values[1] if len(values) > 1 else latest
+        change = ((latest - previous) / previous) * 100
+        return latest, f"{'+' if change >= 0 else ''}{change:.2f}%"
+    
+    def get_market_data(self):
+        """Fetch current oil prices, or None if they are unavailable"""
+        if not self.api_key:
+            print("[WARNING] ALPHA_VANTAGE_API_KEY not found in environment")
+            return None
+        
+        try:
+            with ThreadPoolExecutor(max_workers=len(self.SERIES)) as executor:
+                wti_data, brent_data = executor.map(self.fetch_series, self.SERIES)
+            
+            wti_latest, wti_change_str = self._latest_and_change(wti_data, 'WTI')
+            brent_latest, brent_change_str = self._latest_and_change(brent_data, 'Brent')
+            if wti_latest is None or brent_latest is None:
+                return None
+            
+            market_data = {
+                'wti_crude': wti_latest,
+                'brent_crude': brent_latest,
+                'change_wti': wti_change_str,
+                'change_brent': brent_change_str
+            }
+            
+            # Weekly/monthly change, 30-day average and 52-week range from the local history
+            for function, payload in zip(self.SERIES, (wti_data, brent_data)):
+                try:
+                    self.history.update(function, payload['data'])
+                    market_data.update(self.history.context(function))
+                except OSError as e:
+                    print(f"[WARNING] Could not update {function} price history: {e}")
+            
+            print(f"[SUCCESS] Market Data Retrieved:")
+            print(f"  WTI Crude: ${wti_latest:.2f} ({wti_change_str})")
+            print(f"  Brent Crude: ${brent_latest:.2f} ({brent_change_str})")
+            
+            return market_data
+            
+        except (KeyError, ValueError, IndexError) as e:
+            print(f"[ERROR] Failed to parse market data: {e}")
+            return None
+        except Exception as e:
+            print(f"[ERROR] Unexpected error fetching market data: {e}")
+            return None
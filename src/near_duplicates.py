@@ -0,0 +1,96 @@
+# src/near_duplicates.py
+import re
+import zlib
+import numpy as np
+
+_MERSENNE_PRIME = (1 << 31) - 1
+
+def shingles(text, size=2):
+    """Set of overlapping word n-grams with HTML tags and punctuation removed"""
+    text = re.sub(r'<[^>]+>', ' ', text.lower())
+    words = re.findall(r'\w+', text)
+    if len(words) < size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+class MinHasher:
+    """MinHash signatures whose agreement rate estimates Jaccard similarity"""
+    
+    def __init__(self, num_perm=96, shingle_size=2, seed=1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        
+        # Fixed seed so signatures stay comparable across runs (they are persisted)
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, _MERSENNE_PRIME, size=(num_perm, 1)).astype(np.uint64)
+        self.b = rng.randint(0, _MERSENNE_PRIME, size=(num_perm, 1)).astype(np.uint64)
+    
+    def signature(self, text):
+        """Signature as a uint32 array of length ``num_perm``"""
+        items = shingles(text, self.shingle_size)
+        if not items:
+            return np.full(self.num_perm, _MERSENNE_PRIME, dtype=np.uint32)
+        
+        hashes = np.array(
+            [zlib.crc32(s.encode('utf-8')) % _MERSENNE_PRIME for s in items],
+            dtype=np.uint64
+        )
+        # (a * x + b) mod p stays below 2^62, so uint64 never overflows
+        permuted = (self.a * hashes + self.b) % _MERSENNE_PRIME
+        return permuted.min(axis=1).astype(np.uint32)
+
+class NearDuplicateIndex:
+    """
+    MinHash-LSH index for finding near-duplicate stories.
+    
+    Signatures are split into bands. Only items that agree on a whole band
+    share a bucket, so a lookup compares against a handful of candidates
+    instead of the whole history. Candidates are then confirmed with the
+    estimated Jaccard similarity.
+    """
+    
+    def __init__(self, threshold=0.45, num_perm=96, bands=32):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm=num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.buckets = [{} for _ in range(bands)]
+        self.signatures = {}
+    
+    def __len__(self):
+        return len(self.signatures)
+    
+    def signature(self, text):
+        return self.hasher.signature(text)
+    
+    def _band_keys(self, signature):
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+    
+    def add(self, key, signature):
+        """Index a signature under ``key``"""
+        self.signatures[key] = signature
+        for bucket, band_key in zip(self.buckets, self._band_keys(signature)):
+            bucket.setdefault(band_key, []).append(key)
+    
+    def find(self, signature):
+        """Return the key of the most similar indexed near-duplicate, or None"""
+        candidates = set()
+        for bucket, band_key in zip(self.buckets, self._band_keys(signature)):
+            candidates.update(bucket.get(band_key, ()))
+        
+        best_key, best_similarity = None, self.threshold
+        for key in candidates:
+            similarity = float(np.mean(self.signatures[key] == signature))
+            if similarity >= best_similarity:
+                best_key, best_similarity = key, similarity
+        return best_key
+    
+    def find_or_add(self, key, signature):
+        """Return the key of an existing near-duplicate, or index this one and return ``key``"""
+        match = self.find(signature)
+        if match is not None:
+            return match
+        self.add(key, signature)
+        return key
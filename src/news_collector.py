@@ -1,13 +1,23 @@
 # src/news_collector.py
 import feedparser
 import requests
-from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
-import re
-import json
+from datetime import datetime
+import math
+import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from src.feed_cache import FeedCache
+from src.feed_health import FeedHealthRegistry
+from src.fast_feed_parser import parse_feed, FeedParseError
+from src.keyword_matcher import KeywordMatcher
+from src.near_duplicates import NearDuplicateIndex
+from src.article_selector import DiverseTopK
+from src.market_data import MarketDataClient
 
 class SmartNewsCollector:
-    def __init__(self):
+    def __init__(self, max_workers=None, feed_timeout=10, feed_cache=None, store=None,
+                 max_articles=10, max_per_source=2, market_client=None, health=None,
+                 fast_parser=False):
         self.feeds = [
             # Verified working sources
             "https://www.rigzone.com/news/rss/rigzone_latest.aspx",  # Rigzone - WORKING
@@ -68,24 +78,40 @@ class SmartNewsCollector:
         
         # Exclusion keywords
         self.exclude_keywords = ['renewable', 'solar', 'wind power', 'electric vehicle']
-    
-    def calculate_relevance_score(self, text):
-        """Smart scoring based on keyword density and importance"""
-        text_lower = text.lower()
-        score = 0
         
-        # Check exclusions
-        for exclude in self.exclude_keywords:
-            if exclude in text_lower:
-                return -1
+        # Keyword table compiled once; scoring is a single pass per article
+        self.matcher = KeywordMatcher(self.keywords, self.exclude_keywords)
+        
+        # Fetch settings - feeds are downloaded concurrently, each with its own deadline
+        self.max_workers = max_workers or min(len(self.feeds), 32)
+        self.feed_timeout = feed_timeout  # seconds per feed, including the download
+        self.entries_per_feed = 10
+        self.fast_parser = fast_parser  # stream-parse with lxml and stop after entries_per_feed
+        self.user_agent = "Oil Podcast Generator/1.0 (+https://github.com/shariqbaig/oil-podcast-generator)"
+        
+        # Conditional-GET cache so unchanged feeds cost a 304 instead of a full download and parse
+        self.feed_cache = feed_cache if feed_cache is not None else FeedCache()
+        
+        # Per-feed health: circuit breaker for broken feeds, poll interval from update cadence
+        self.health = health if health is not None else FeedHealthRegistry()
         
-        # Calculate weighted score
-        for category, data in self.keywords.items():
-            for keyword in data['words']:
-                occurrences = len(re.findall(r'\b' + keyword + r'\b', text_lower))
-                score += occurrences * data['weight']
+        # Optional ArticleStore - when set, only unseen entries are scored and the
+        # final selection is queried from the store's 48-hour window
+        self.store = store
+        self.dedup_days = 7  # how much store history seeds the near-duplicate index
         
-        # Boost for recent content (within 24 hours)
+        # Final selection size and per-source diversity quota
+        self.max_articles = max_articles
+        self.max_per_source = max_per_source
+        
+        # Alpha Vantage client, created on first use so news-only runs never touch it
+        self.market_client = market_client
+    
+    def calculate_relevance_score(self, text):
+        """Smart scoring based on keyword density and importance"""
+        score, excluded = self.matcher.scan(text)
+        if excluded:
+            return -1
         return score
     
     def format_time_ago(self, hours):
@@ -102,188 +128,293 @@ class SmartNewsCollector:
             days = int(hours / 24)
             return f"{days} days ago"
     
-    def fetch_and_filter_news(self):
-        """Collect and intelligently filter news"""
-        all_articles = []
-        seen_titles = set()
-        
-        for feed_url in self.feeds:
+    def _normalize_entries(self, parsed):
+        """Reduce a feedparser result to the plain fields the collector uses"""
+        entries = []
+        for entry in parsed.entries[:self.entries_per_feed]:
+            if not entry.get('title'):
+                continue
+            published_parsed = entry.get('published_parsed')
+            entries.append({
+                'title': entry.title,
+                'summary': entry.get('summary', ''),
+                'link': entry.get('link', ''),
+                'published': entry.get('published'),
+                'published_parsed': list(published_parsed[:6]) if published_parsed else None
+            })
+        return parsed.feed.get('title', 'Unknown'), entries
+    
+    def _parse(self, content):
+        """Parse a feed body into (title, entries), preferring the fast parser when enabled"""
+        if self.fast_parser:
             try:
-                # Add timeout and user agent to avoid being blocked
-                import socket
-                socket.setdefaulttimeout(10)  # 10 second timeout
-                
-                # Set user agent to avoid blocking
-                feedparser.USER_AGENT = "Oil Podcast Generator/1.0 (+https://github.com/shariqbaig/oil-podcast-generator)"
-                
-                print(f"Fetching from: {feed_url}")
-                feed = feedparser.parse(feed_url)
-                
-                if not feed.entries:
-                    print(f"  No entries found")
-                    continue
-                    
-                print(f"  Found {len(feed.entries)} entries")
-                for entry in feed.entries[:10]:  # Get more initially for better filtering
-                    # De-duplicate by title
-                    title_hash = entry.title.lower().strip()
-                    if title_hash in seen_titles:
-                        continue
-                    seen_titles.add(title_hash)
-                    
-                    # Combine title and summary for scoring
-                    full_text = f"{entry.title} {entry.get('summary', '')}"
-                    score = self.calculate_relevance_score(full_text)
-                    
-                    if score > 0:
-                        # Try to get publication date
-                        pub_date = entry.get('published_parsed', None)
-                        pub_datetime = None
-                        
-                        if pub_date:
-                            try:
-                                pub_datetime = datetime.fromtimestamp(
-                                    datetime(*pub_date[:6]).timestamp()
-                                )
-                            except:
-                                pub_datetime = None
-                        
-                        # If no parsed date, try to parse from published string
-                        if not pub_datetime and hasattr(entry, 'published'):
-                            try:
-                                from dateutil import parser
-                                pub_datetime = parser.parse(entry.published)
-                            except:
-                                pub_datetime = None
-                        
-                        # Calculate article age
-                        if pub_datetime:
-                            hours_old = (datetime.now() - pub_datetime).total_seconds() / 3600
-                            
-                            # ONLY include articles from last 48 hours (2 days)
-                            if hours_old > 48:
-                                continue  # Skip old articles
-                            
-                            # Boost recent articles
-                            if hours_old < 6:  # Less than 6 hours old
-                                score += 10
-                            elif hours_old < 12:  # Less than 12 hours old
-                                score += 7
-                            elif hours_old < 24:  # Less than 24 hours old
-                                score += 5
-                            elif hours_old < 48:  # Less than 48 hours old
-                                score += 2
-                            
-                            time_ago = self.format_time_ago(hours_old)
-                        else:
-                            time_ago = "Recently"
-                        
-                        all_articles.append({
-                            'title': entry.title,
-                            'summary': entry.get('summary', '')[:500],
-                            'link': entry.link,
-                            'source': feed.feed.title if hasattr(feed, 'feed') else 'Unknown',
-                            'score': score,
-                            'published': pub_datetime if pub_datetime else datetime.now(),
-                            'time_ago': time_ago if pub_datetime else "Recently"
-                        })
-            except Exception as e:
-                print(f"Error processing feed {feed_url}: {e}")
+                return parse_feed(content, max_entries=self.entries_per_feed)
+            except FeedParseError:
+                pass  # malformed or unusual feed - feedparser is far more forgiving
+        return self._normalize_entries(feedparser.parse(content))
+    
+    def _fetch_feed(self, feed_url):
+        """Download and parse a single feed, giving up once the deadline passes"""
+        started = time.monotonic()
+        headers = {'User-Agent': self.user_agent}
+        headers.update(self.feed_cache.conditional_headers(feed_url))
         
-        # Sort by score and return top articles
-        all_articles.sort(key=lambda x: x['score'], reverse=True)
+        response = requests.get(
+            feed_url,
+            headers=headers,
+            timeout=self.feed_timeout,
+            stream=True
+        )
+        try:
+            # Unchanged since the last run - reuse the cached entries without parsing anything
+            if response.status_code == 304:
+                cached = self.feed_cache.get(feed_url)
+                if cached:
+                    print(f"  Not modified: {feed_url}")
+                    return cached['title'], cached['entries']
+            
+            response.raise_for_status()
+            
+            # requests only bounds each socket read, so enforce the overall deadline here
+            chunks = []
+            for chunk in response.iter_content(chunk_size=16384):
+                if time.monotonic() - started > self.feed_timeout:
+                    raise TimeoutError(f"exceeded {self.feed_timeout}s deadline")
+                chunks.append(chunk)
+        finally:
+            response.close()
         
-        # Ensure diversity - no more than 2 from same source, get more articles
-        final_articles = []
-        source_count = {}
-        for article in all_articles:
-            source = article['source']
-            if source_count.get(source, 0) < 2:
-                final_articles.append(article)
-                source_count[source] = source_count.get(source, 0) + 1
-                if len(final_articles) >= 10:  # Increased from 7 to 10 for more content
-                    break
+        title, entries = self._parse(b''.join(chunks))
         
-        return final_articles
-
-    def get_market_data(self):
-        """Fetch current oil prices from Alpha Vantage"""
-        import os
-        import requests
-        from dotenv import load_dotenv
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            try:
+                self.feed_cache.put(feed_url, title, entries, etag=etag, last_modified=last_modified)
+            except OSError as e:
+                print(f"  Could not cache feed {feed_url}: {e}")
+        
+        return title, entries
+    
+    def _fetch_and_record(self, feed_url):
+        """Fetch a feed and record the outcome in the health registry"""
+        started = time.monotonic()
+        try:
+            title, entries = self._fetch_feed(feed_url)
+        except Exception:
+            self.health.record_failure(feed_url, time.monotonic() - started)
+            raise
+        
+        digest = hashlib.sha1('\n'.join(e['link'] or e['title'] for e in entries).encode('utf-8')).hexdigest()
+        self.health.record_success(feed_url, time.monotonic() - started, digest)
+        return title, entries
+    
+    def _fetch_feeds(self):
+        """Fetch all feeds concurrently, yielding (url, title, entries) as each one arrives"""
+        due = []
+        for feed_url in self.feeds:
+            fetch, reason = self.health.should_fetch(feed_url)
+            if fetch:
+                due.append(feed_url)
+                continue
+            
+            # Not due yet - its last entries are still current, so serve them from the cache
+            cached = self.feed_cache.get(feed_url) if reason == 'not due' else None
+            if cached:
+                print(f"Skipping {feed_url} (not due), using cached entries")
+                yield feed_url, cached['title'], cached['entries']
+            elif reason == 'not due':
+                due.append(feed_url)
+            else:
+                print(f"Skipping {feed_url} ({reason})")
         
-        load_dotenv()
-        api_key = os.getenv('ALPHA_VANTAGE_API_KEY')
+        if not due:
+            return
         
-        if not api_key:
-            print("[WARNING] ALPHA_VANTAGE_API_KEY not found in environment")
-            return None
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        futures = {executor.submit(self._fetch_and_record, url): url for url in due}
         
+        # Workers only check feed_timeout between reads and DNS lookups have no timeout at all,
+        # so the whole step gets a deadline: one feed_timeout per wave of queued feeds, plus one
+        # for parsing. wait() returns finished fetches before checking the time, so a caller that
+        # is slow with the yielded feeds never makes a completed fetch count as timed out.
+        waves = math.ceil(len(due) / self.max_workers)
+        overall_timeout = (waves + 1) * self.feed_timeout
+        deadline = time.monotonic() + overall_timeout
+        pending = set(futures)
         try:
-            # Fetch WTI Crude (CL=F) and Brent Crude (BZ=F) data
-            # Alpha Vantage uses WTI and BRENT as commodity symbols
-            wti_url = f"https://www.alphavantage.co/query?function=WTI&interval=daily&apikey={api_key}"
-            brent_url = f"https://www.alphavantage.co/query?function=BRENT&interval=daily&apikey={api_key}"
-            
-            print("[INFO] Fetching WTI Crude data from Alpha Vantage...")
-            wti_response = requests.get(wti_url, timeout=10)
-            wti_data = wti_response.json()
-            
-            print("[INFO] Fetching Brent Crude data from Alpha Vantage...")
-            brent_response = requests.get(brent_url, timeout=10)
-            brent_data = brent_response.json()
-            
-            # Debug: Print raw response
-            print(f"[DEBUG] WTI Response: {wti_data}")
-            print(f"[DEBUG] Brent Response: {brent_data}")
-            
-            # Check for API errors
-            if 'Error Message' in wti_data or 'Error Message' in brent_data:
-                print("[ERROR] Alpha Vantage API error - check your API key")
-                return None
-            
-            if 'Note' in wti_data or 'Note' in brent_data:
-                print("[WARNING] Alpha Vantage API rate limit reached (5 calls/minute for free tier)")
-                return None
+            while pending:
+                done, pending = wait(pending, timeout=max(0, deadline - time.monotonic()),
+                                     return_when=FIRST_COMPLETED)
+                if not done:
+                    break
+                for future in done:
+                    feed_url = futures[future]
+                    try:
+                        title, entries = future.result()
+                    except Exception as e:
+                        print(f"Error fetching feed {feed_url}: {e}")
+                    else:
+                        yield feed_url, title, entries
             
-            # Extract latest prices
-            if 'data' in wti_data and len(wti_data['data']) > 0:
-                wti_latest = float(wti_data['data'][0]['value'])
-                wti_previous = float(wti_data['data'][1]['value']) if len(wti_data['data']) > 1 else wti_latest
-                wti_change = ((wti_latest - wti_previous) / wti_previous) * 100
-                wti_change_str = f"{'+' if wti_change >= 0 else ''}{wti_change:.2f}%"
-            else:
-                print("[WARNING] No WTI data available")
-                return None
+            for future in pending:
+                feed_url = futures[future]
+                print(f"Error fetching feed {feed_url}: deadline exceeded")
+                self.health.record_failure(feed_url, overall_timeout)
+        finally:
+            # Never block on a stalled worker; queued fetches are cancelled, and a stalled one
+            # that finishes later only updates the in-memory registry after it has been saved
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.health.save()
+    
+    def _parse_published(self, entry):
+        """Best-effort publication datetime for an entry, or None"""
+        pub_date = entry['published_parsed']
+        pub_datetime = None
+        
+        if pub_date:
+            try:
+                pub_datetime = datetime.fromtimestamp(
+                    datetime(*pub_date[:6]).timestamp()
+                )
+            except:
+                pub_datetime = None
+        
+        # If no parsed date, try to parse from published string
+        if not pub_datetime and entry['published']:
+            try:
+                from dateutil import parser
+                pub_datetime = parser.parse(entry['published'])
+            except:
+                pub_datetime = None
+        
+        return pub_datetime
+    
+    def _score_entry(self, entry, feed_title):
+        """Build an article dict with its base keyword relevance (no recency boost yet)"""
+        # Combine title and summary for scoring
+        full_text = f"{entry['title']} {entry['summary']}"
+        pub_datetime = self._parse_published(entry)
+        
+        return {
+            'title': entry['title'],
+            'summary': entry['summary'][:500],
+            'link': entry['link'],
+            'source': feed_title,
+            'relevance': self.calculate_relevance_score(full_text),
+            'published': pub_datetime if pub_datetime else datetime.now(),
+            'dated': pub_datetime is not None
+        }
+    
+    def _rank_article(self, article):
+        """Apply the 48-hour window and recency boost; returns None for stale articles"""
+        score = article['relevance']
+        
+        # Calculate article age
+        if article['dated']:
+            hours_old = (datetime.now() - article['published']).total_seconds() / 3600
             
-            if 'data' in brent_data and len(brent_data['data']) > 0:
-                brent_latest = float(brent_data['data'][0]['value'])
-                brent_previous = float(brent_data['data'][1]['value']) if len(brent_data['data']) > 1 else brent_latest
-                brent_change = ((brent_latest - brent_previous) / brent_previous) * 100
-                brent_change_str = f"{'+' if brent_change >= 0 else ''}{brent_change:.2f}%"
-            else:
-                print("[WARNING] No Brent data available")
-                return None
+            # ONLY include articles from last 48 hours (2 days)
+            if hours_old > 48:
+                return None  # Skip old articles
             
-            market_data = {
-                'wti_crude': wti_latest,
-                'brent_crude': brent_latest,
-                'change_wti': wti_change_str,
-                'change_brent': brent_change_str
-            }
+            # Boost recent articles
+            if hours_old < 6:  # Less than 6 hours old
+                score += 10
+            elif hours_old < 12:  # Less than 12 hours old
+                score += 7
+            elif hours_old < 24:  # Less than 24 hours old
+                score += 5
+            elif hours_old < 48:  # Less than 48 hours old
+                score += 2
             
-            print(f"[SUCCESS] Market Data Retrieved:")
-            print(f"  WTI Crude: ${wti_latest:.2f} ({wti_change_str})")
-            print(f"  Brent Crude: ${brent_latest:.2f} ({brent_change_str})")
+            time_ago = self.format_time_ago(hours_old)
+        else:
+            time_ago = "Recently"
+        
+        return dict(article, score=score, time_ago=time_ago)
+    
+    def _iter_entries(self):
+        """Pipeline stage: yield (feed_title, entry) as each feed arrives"""
+        for feed_url, feed_title, entries in self._fetch_feeds():
+            print(f"Fetched from: {feed_url}")
             
-            return market_data
+            if not entries:
+                print(f"  No entries found")
+                continue
             
-        except requests.exceptions.RequestException as e:
-            print(f"[ERROR] Failed to fetch market data: {e}")
-            return None
-        except (KeyError, ValueError, IndexError) as e:
-            print(f"[ERROR] Failed to parse market data: {e}")
-            return None
-        except Exception as e:
-            print(f"[ERROR] Unexpected error fetching market data: {e}")
-            return None
\ No newline at end of file
+            print(f"  Found {len(entries)} entries")
+            for entry in entries:
+                yield feed_title, entry
+    
+    def _iter_scored(self, entries):
+        """Pipeline stage: de-duplicate and score entries, yielding article dicts"""
+        seen_titles = set()
+        
+        # Near-duplicate index over title + summary, so the same wire story syndicated
+        # under different headlines only takes one slot. Seeded with recent history.
+        dedup_index = NearDuplicateIndex()
+        clusters = {}
+        if self.store:
+            for key, signature, cluster in self.store.recent_signatures(days=self.dedup_days):
+                dedup_index.add(key, signature)
+                clusters[key] = cluster
+        
+        for feed_title, entry in entries:
+            try:
+                # De-duplicate by title
+                title_hash = entry['title'].lower().strip()
+                if title_hash in seen_titles:
+                    continue
+                seen_titles.add(title_hash)
+                
+                # Already ingested on an earlier run - it will come back from the store query
+                if self.store and self.store.is_known(entry['link'], entry['title']):
+                    continue
+                
+                article = self._score_entry(entry, feed_title)
+                
+                if article['relevance'] > 0:
+                    key = self.store.key(article) if self.store else article['link'] or entry['title']
+                    signature = dedup_index.signature(f"{article['title']} {article['summary']}")
+                    match = dedup_index.find_or_add(key, signature)
+                    article['cluster'] = clusters.setdefault(key, clusters.get(match, match))
+                    if self.store:
+                        article['signature'] = signature
+                
+                yield article
+            except Exception as e:
+                print(f"Error processing entry from {feed_title}: {e}")
+    
+    def _iter_candidates(self):
+        """Pipeline stage: yield ranked articles inside the 48-hour window"""
+        scored = self._iter_scored(self._iter_entries())
+        
+        if self.store:
+            # Irrelevant entries are stored too, so they are never scored again
+            ingested = 0
+            for article in scored:
+                self.store.upsert(article)
+                ingested += 1
+            print(f"Ingested {ingested} new entries ({self.store.count()} articles in store)")
+            scored = self.store.recent(hours=48, min_relevance=1)
+        
+        for article in scored:
+            if article['relevance'] <= 0:
+                continue
+            ranked = self._rank_article(article)
+            if ranked:
+                yield ranked
+    
+    def fetch_and_filter_news(self):
+        """Collect and intelligently filter news"""
+        # Streaming top-k - ensure diversity, no more than max_per_source from the same source
+        selector = DiverseTopK(k=self.max_articles, per_source=self.max_per_source)
+        selector.extend(self._iter_candidates())
+        return selector.results()
+
+    def get_market_data(self):
+        """Fetch current oil prices from Alpha Vantage"""
+        if self.market_client is None:
+            self.market_client = MarketDataClient()
+        return self.market_client.get_market_data()
@@ -1,17 +1,38 @@
 # src/podcast_creator.py
-import os
-import tempfile
+import io
+import re
 import asyncio
 import random
 from pydub import AudioSegment
-import edge_tts
 from src.music_generator import BackgroundMusicGenerator
+from src.text_normalizer import TextNormalizer
+from src.audio_assembler import AudioAssembler
+from src.tts_batching import coalesce_turns, join_turns, split_points
+from src.tts_backends import EdgeTTSBackend
+from src.rate_controller import AIMDRateController
+from src.transcript import TranscriptBuilder
 
 class MultiVoicePodcastCreator:
-    def __init__(self, max_retries=3, base_delay=2):
+    def __init__(self, max_retries=3, base_delay=2, concurrency=4, tts_cache=None, normalizer=None,
+                 coalesce=False, max_batch_chars=1000, max_concurrency=16, transcripts=True, backend=None):
+        # Speech engine (see src/tts_backends.py); edge-tts unless another is given
+        self.backend = backend or EdgeTTSBackend()
         self.max_retries = max_retries
         self.base_delay = base_delay
+        # Segments in progress at once; the controller adapts the number of live
+        # TTS requests between 1 and max_concurrency from how the service responds
+        self.max_concurrency = max_concurrency
+        self.rate_controller = AIMDRateController(initial=concurrency, maximum=max_concurrency)
+        # Optional TTSCache - lines synthesized before are not sent to the TTS backend again
+        self.tts_cache = tts_cache
+        # Merge consecutive turns with the same voice and prosody into one request
+        self.coalesce = coalesce
+        self.max_batch_chars = max_batch_chars
+        # Write VTT/SRT/JSON transcripts (and chapters) next to the MP3 from TTS word timings
+        self.transcripts = transcripts
         self.music_generator = BackgroundMusicGenerator()
+        # Pronunciation lexicon from config/pronunciation.yaml, compiled once
+        self.normalizer = normalizer or TextNormalizer()
         
         # Soothing, conversational voices with more natural pace
         self.voices = {
@@ -39,65 +60,113 @@ class MultiVoicePodcastCreator:
             'skeptical': {'rate': '-4%', 'pitch': '-5Hz'}  # Slightly slower
         }
     
-    async def create_podcast(self, dialogue_script, output_file):
-        """Generate podcast using Edge TTS with robust retry logic"""
+    async def create_podcast(self, dialogue_script, output_file, journal=None):
+        """
+        Generate podcast with the configured TTS backend and robust retry logic
         
-        print("Generating podcast with Edge TTS (v7.2.3)...")
-        audio_segments = []
-        temp_files = []
+        With a BuildJournal, the script and every synthesized segment are
+        recorded as they complete, and segments already in the journal
+        are reused instead of synthesized again.
+        """
         
+        print(f"Generating podcast with the {self.backend.name} TTS backend...")
+        assembler = AudioAssembler()
+        transcript = TranscriptBuilder()
+        intro_ms = 1000
+        
+        # A list, or an async iterator of turns streamed from the script generator
+        total = f"/{len(dialogue_script)}" if hasattr(dialogue_script, '__len__') else ""
+        previous_speaker = None
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def synthesize(i, group):
+            if journal:
+                pieces = [journal.lookup(i + k, segment) for k, segment in enumerate(group)]
+                if all(pieces):
+                    return pieces
+            
+            async with semaphore:
+                emotion = group[0].get('emotion', 'neutral')
+                if len(group) > 1:
+                    print(f"Processing segments {i+1}-{i+len(group)}{total}: {emotion} tone (merged)")
+                    pieces = await self._generate_group_speech(group)
+                else:
+                    print(f"Processing segment {i+1}{total}: {emotion} tone")
+                    words = []
+                    mp3_data = await self._generate_speech_with_retry(
+                        group[0]['text'],
+                        group[0]['speaker'],
+                        emotion,
+                        words
+                    )
+                    pieces = [(mp3_data, 0, None, words) if mp3_data else None]
+            
+            if journal:
+                # The journal only helps a rerun; failing to write it must not fail this build
+                try:
+                    journal.record(i, group, pieces, self.backend.audio_format)
+                except OSError as e:
+                    print(f"  [WARNING] Could not journal segment {i+1}: {e}")
+            return pieces
+        
+        jobs = []
         try:
-            for i, segment in enumerate(dialogue_script):
-                emotion = segment.get('emotion', 'neutral')
-                print(f"Processing segment {i+1}/{len(dialogue_script)}: {emotion} tone")
-                
-                # Create temp file
-                tmp_file = tempfile.NamedTemporaryFile(suffix='.mp3', delete=False)
-                tmp_filename = tmp_file.name
-                tmp_file.close()
-                temp_files.append(tmp_filename)
-                
-                # Generate with retry logic
-                success = await self._generate_speech_with_retry(
-                    segment['text'],
-                    segment['speaker'],
-                    emotion,
-                    tmp_filename
-                )
+            # Start synthesis as each turn (or merged run of turns) arrives;
+            # the rate controller decides how many requests run at once
+            turn_count = 0
+            async for group in self._iter_groups(dialogue_script):
+                task = asyncio.ensure_future(synthesize(turn_count, group))
+                jobs.append((group, task))
+                turn_count += len(group)
+            
+            # The whole script has arrived (it may have been streamed), so a rerun can start from it
+            if journal and journal.script is None:
+                try:
+                    journal.save_script([segment for group, _ in jobs for segment in group])
+                except OSError as e:
+                    print(f"[WARNING] Could not journal the script, this build cannot be resumed: {e}")
+            
+            # Reassemble in script order, whatever order the segments finished in
+            i = -1
+            for group, task in jobs:
+                pieces = await task
+                decoded = {}
                 
-                if success:
-                    try:
-                        # Load and process audio
-                        audio = AudioSegment.from_file(tmp_filename, format="mp3")
-                        
-                        # Add minimal pauses for fluent conversation
-                        if i > 0 and dialogue_script[i-1]['speaker'] != segment['speaker']:
-                            silence = AudioSegment.silent(duration=300)  # Brief pause between speakers
-                            audio_segments.append(silence)
-                        elif i > 0:
-                            # Very short pause for same speaker
-                            silence = AudioSegment.silent(duration=100)
-                            audio_segments.append(silence)
-                        
-                        audio_segments.append(audio)
-                    except Exception as e:
-                        print(f"  Error loading audio for segment {i+1}: {e}")
-                else:
-                    print(f"  Failed to generate segment {i+1} after {self.max_retries} attempts")
+                for segment, piece in zip(group, pieces):
+                    i += 1
+                    if piece:
+                        try:
+                            mp3_data, start_ms, end_ms, words = piece
+                            if id(mp3_data) not in decoded:
+                                decoded[id(mp3_data)] = self._decode(mp3_data)
+                            audio = decoded[id(mp3_data)]
+                            if start_ms or end_ms is not None:
+                                audio = audio[start_ms:end_ms]
+                            
+                            # Add minimal pauses for fluent conversation
+                            if i > 0 and previous_speaker != segment['speaker']:
+                                assembler.add_silence(300)  # Brief pause between speakers
+                            elif i > 0:
+                                # Very short pause for same speaker
+                                assembler.add_silence(100)
+                            
+                            # Word timings shifted to where this turn lands in the episode
+                            transcript.add_turn(segment, intro_ms + assembler.duration_ms, len(audio), words)
+                            assembler.add(audio)
+                        except Exception as e:
+                            print(f"  Error loading audio for segment {i+1}: {e}")
+                    else:
+                        print(f"  Failed to generate segment {i+1} after {self.max_retries} attempts")
+                    
+                    previous_speaker = segment['speaker']
             
-            if not audio_segments:
+            if not assembler.has_audio:
                 raise Exception("No audio segments were generated")
             
-            # Combine all segments
+            # Combine all segments into one buffer, with intro/outro padding
             print("Combining audio segments...")
-            final_audio = AudioSegment.empty()
-            for segment in audio_segments:
-                final_audio += segment
-            
-            # Add intro/outro padding
-            intro_silence = AudioSegment.silent(duration=1000)
-            outro_silence = AudioSegment.silent(duration=1500)
-            final_with_padding = intro_silence + final_audio + outro_silence
+            final_with_padding = assembler.build(lead_in_ms=intro_ms, tail_ms=1500)
             
             # Add background music
             print("Adding subtle background music...")
@@ -129,169 +198,210 @@ class MultiVoicePodcastCreator:
             duration_min = int(duration_seconds // 60)
             duration_sec = int(duration_seconds % 60)
             
+            if self.transcripts:
+                try:
+                    written = transcript.write(output_file)
+                    print(f"[OK] Transcript written: {', '.join(written)}")
+                except OSError as e:
+                    print(f"Could not write transcript: {e}")
+            
+            print(f"[INFO] TTS concurrency ended at {int(self.rate_controller.limit)} "
+                  f"({self.rate_controller.throttles} throttles)")
+            if self.tts_cache:
+                print(f"[INFO] TTS cache: {self.tts_cache.hits} hits, {self.tts_cache.misses} misses")
             print(f"[SUCCESS] Podcast created: {output_file} (Duration: {duration_min}:{duration_sec:02d})")
             return output_file
             
         finally:
-            # Clean up temp files
-            for temp_file in temp_files:
-                if os.path.exists(temp_file):
-                    try:
-                        os.remove(temp_file)
-                    except:
-                        pass
+            # Stop any synthesis still running (e.g. the script stream failed)
+            for _, task in jobs:
+                task.cancel()
     
-    async def _generate_speech_with_retry(self, text, speaker, emotion, output_file):
-        """Generate speech with robust retry logic for handling 403 errors"""
-        
+    async def _iter_script(self, dialogue_script):
+        """Iterate a dialogue script given either as a list or as an async iterator"""
+        if hasattr(dialogue_script, '__aiter__'):
+            async for segment in dialogue_script:
+                yield segment
+        else:
+            for segment in dialogue_script:
+                yield segment
+    
+    def _prosody(self, speaker, emotion):
         voice_config = self.voices.get(speaker, self.voices['host1'])
         emotion_config = self.emotion_settings.get(emotion, self.emotion_settings['neutral'])
+        return voice_config, emotion_config
+    
+    def _batch_key(self, segment):
+        """Turns with the same key can share one synthesis request; None means never merge"""
+        if not re.search(r'\w', self._enhance_with_ssml(segment.get('text', ''))):
+            return None
+        voice_config, emotion_config = self._prosody(segment['speaker'], segment.get('emotion', 'neutral'))
+        return (voice_config['name'], emotion_config['rate'], emotion_config['pitch'])
+    
+    async def _iter_groups(self, dialogue_script):
+        """Script turns grouped for synthesis: runs of same-voice turns when coalescing, else one each"""
+        if self.coalesce:
+            async for group in coalesce_turns(self._iter_script(dialogue_script), self._batch_key,
+                                              self.max_batch_chars):
+                yield group
+        else:
+            async for segment in self._iter_script(dialogue_script):
+                yield [segment]
+    
+    async def _generate_group_speech(self, group):
+        """
+        Synthesize a run of same-voice turns as one request and cut it back into turns.
+        
+        Returns one (mp3_data, start_ms, end_ms, words) piece per turn, all sharing
+        the same audio. Falls back to a request per turn if the merged
+        request fails or its word boundaries cannot be matched to the turns.
+        """
+        voice_config, emotion_config = self._prosody(group[0]['speaker'], group[0].get('emotion', 'neutral'))
+        texts = [self._enhance_with_ssml(segment['text']) for segment in group]
+        merged_text = join_turns(texts)
+        
+        cache_key = None
+        cuts = None
+        mp3_data = None
+        words = []
+        if self.tts_cache:
+            cache_key = self._cache_key(voice_config, emotion_config, merged_text)
+            meta = self.tts_cache.get_meta(cache_key)
+            if meta:
+                mp3_data = self.tts_cache.get(cache_key, self.backend.audio_format)
+                cuts = meta.get('cuts')
+                words = meta.get('words', [])
+                if mp3_data:
+                    print("  [OK] Using cached audio")
+        
+        if not mp3_data or not cuts:
+            words = []
+            mp3_data = await self._tts_with_retry(merged_text, voice_config, emotion_config, words)
+            cuts = split_points(texts, words) if mp3_data else None
+            if mp3_data and cuts and cache_key:
+                self.tts_cache.put(cache_key, mp3_data, meta={'cuts': cuts, 'words': words},
+                                   audio_format=self.backend.audio_format)
+        
+        if not mp3_data or not cuts:
+            print(f"  Could not split merged audio, synthesizing {len(group)} turns separately")
+            pieces = []
+            for segment in group:
+                single_words = []
+                single = await self._generate_speech_with_retry(
+                    segment['text'], segment['speaker'], segment.get('emotion', 'neutral'), single_words
+                )
+                pieces.append((single, 0, None, single_words) if single else None)
+            return pieces
+        
+        edges = [0] + [int(cut) for cut in cuts] + [None]
+        pieces = []
+        for k in range(len(group)):
+            start, end = edges[k], edges[k + 1]
+            # Each turn's words, relative to where its audio is cut
+            turn_words = [[w_start - start, w_end - start, word] for w_start, w_end, word in words
+                          if w_start >= start and (end is None or w_start < end)]
+            pieces.append((mp3_data, start, end, turn_words))
+        return pieces
+    
+    def _decode(self, data):
+        """Decode backend audio from memory (MP3 from edge-tts, WAV from the local engines)"""
+        if data[:4] == b'RIFF':
+            # pydub reads WAV itself, without ffmpeg
+            return AudioSegment.from_file(io.BytesIO(data), format="wav")
+        # The explicit codec skips the ffprobe call
+        return AudioSegment.from_file(io.BytesIO(data), format="mp3", codec="mp3")
+    
+    def _cache_key(self, voice_config, emotion_config, text):
+        voice = voice_config['name']
+        if self.backend.name != 'edge':
+            # Keep other engines' audio apart; edge keys stay as they were so existing caches still hit
+            voice = f"{self.backend.name}:{voice}"
+        return self.tts_cache.make_key(voice, emotion_config['rate'], emotion_config['pitch'], text)
+    
+    async def _generate_speech_with_retry(self, text, speaker, emotion, words=None):
+        """
+        Generate speech with robust retry logic for handling 403 errors; returns MP3 bytes or None
+        
+        If ``words`` is a list it is filled with the [start_ms, end_ms, word]
+        timings the TTS backend reported for the audio.
+        """
+        
+        voice_config, emotion_config = self._prosody(speaker, emotion)
         
         # Enhance text with SSML
         enhanced_text = self._enhance_with_ssml(text)
         
+        cache_key = None
+        if self.tts_cache:
+            cache_key = self._cache_key(voice_config, emotion_config, enhanced_text)
+            cached = self.tts_cache.get(cache_key, self.backend.audio_format)
+            if cached:
+                print("  [OK] Using cached audio")
+                if words is not None:
+                    words.extend((self.tts_cache.get_meta(cache_key) or {}).get('words', []))
+                return cached
+        
+        timings = []
+        mp3_data = await self._tts_with_retry(enhanced_text, voice_config, emotion_config, timings)
+        if words is not None:
+            words.extend(timings)
+        if mp3_data and cache_key:
+            self.tts_cache.put(cache_key, mp3_data, meta={'words': timings}, audio_format=self.backend.audio_format)
+        return mp3_data
+    
+    async def _tts_with_retry(self, enhanced_text, voice_config, emotion_config, words=None):
+        """One TTS backend request with retries; returns audio bytes or None, filling ``words`` if given"""
+        
+        throttled = False
         for attempt in range(self.max_retries):
+            # After a throttle the controller's shared cooldown is the wait
+            if attempt > 0 and not throttled:
+                # Exponential backoff with jitter
+                delay = self.base_delay * (2 ** attempt) + random.uniform(0, 1)
+                print(f"  Retry {attempt + 1}/{self.max_retries} in {delay:.1f} seconds...")
+                await asyncio.sleep(delay)
+            elif attempt > 0:
+                print(f"  Retry {attempt + 1}/{self.max_retries} after cooldown...")
+            throttled = False
+            
+            await self.rate_controller.acquire()
+            outcome = 'error'
             try:
-                if attempt > 0:
-                    # Exponential backoff with jitter
-                    delay = self.base_delay * (2 ** attempt) + random.uniform(0, 1)
-                    print(f"  Retry {attempt + 1}/{self.max_retries} in {delay:.1f} seconds...")
-                    await asyncio.sleep(delay)
-                
-                # Create communicate instance
-                communicate = edge_tts.Communicate(
-                    enhanced_text,
-                    voice_config['name'],
-                    rate=emotion_config['rate'],
-                    pitch=emotion_config['pitch']
-                )
-                
-                # Save with timeout
-                await asyncio.wait_for(
-                    communicate.save(output_file),
+                # Synthesize into memory with timeout
+                mp3_data, timings = await asyncio.wait_for(
+                    self.backend.synthesize(
+                        enhanced_text,
+                        voice_config['name'],
+                        emotion_config['rate'],
+                        emotion_config['pitch']
+                    ),
                     timeout=30.0  # 30 second timeout
                 )
+                if words is not None:
+                    words[:] = timings
                 
+                outcome = 'ok'
                 print(f"  [OK] Success on attempt {attempt + 1}")
-                return True
+                return mp3_data
                 
             except asyncio.TimeoutError:
+                outcome = 'timeout'
                 print(f"  Timeout on attempt {attempt + 1}")
-                if attempt < self.max_retries - 1:
-                    continue
-                    
+                
             except Exception as e:
                 error_msg = str(e)
                 print(f"  Attempt {attempt + 1} failed: {error_msg}")
                 
-                # Check for specific errors
+                # 403s mean we are being rate limited: back off globally, not just here
                 if "403" in error_msg or "Invalid response status" in error_msg:
-                    if attempt < self.max_retries - 1:
-                        # For 403 errors, use longer delay
-                        await asyncio.sleep(self.base_delay * 3)
-                        continue
-                elif "connection" in error_msg.lower():
-                    # Network issues, retry
-                    if attempt < self.max_retries - 1:
-                        continue
-                
-                # For other errors or last attempt
-                if attempt == self.max_retries - 1:
-                    return False
+                    outcome = 'throttled'
+                    throttled = True
+            
+            finally:
+                await self.rate_controller.release(outcome)
         
-        return False
+        return None
     
     def _enhance_with_ssml(self, text):
-        """Clean and enhance text for natural speech"""
-        
-        # Clean up URLs before processing
-        text = self._clean_urls(text)
-        
-        # Process laugh and reaction markers
-        text = self._process_reactions(text)
-        
-        # Fix pronunciations for oil industry terms (without SSML tags)
-        text = text.replace('WTI', 'W T I')
-        text = text.replace('OPEC', 'O P E C')
-        text = text.replace('bbl', 'barrels')
-        text = text.replace('bbl/d', 'barrels per day')
-        text = text.replace('E&P', 'E and P')
-        text = text.replace('LNG', 'L N G')
-        text = text.replace('API', 'A P I')
-        text = text.replace('EIA', 'E I A')
-        text = text.replace('CEO', 'C E O')
-        text = text.replace('IPO', 'I P O')
-        text = text.replace('M&A', 'M and A')
-        
-        # Clean up common abbreviations
-        text = text.replace('vs.', 'versus')
-        text = text.replace('etc.', 'etcetera')
-        text = text.replace('i.e.', 'that is')
-        text = text.replace('e.g.', 'for example')
-        text = text.replace('Q1', 'first quarter')
-        text = text.replace('Q2', 'second quarter')
-        text = text.replace('Q3', 'third quarter')
-        text = text.replace('Q4', 'fourth quarter')
-        
-        # Add natural pauses with commas instead of SSML
-        text = text.replace('...', ', ')
-        text = text.replace(' - ', ', ')
-        text = text.replace('—', ', ')
-        
-        return text
-    
-    def _process_reactions(self, text):
-        """Convert reaction markers to more subtle expressions"""
-        import re
-        
-        # More subtle, natural reactions
-        reactions = {
-            '[laughs]': '',  # Remove explicit laughs, let emotion handle it
-            '[chuckles]': '',  # Remove explicit chuckles
-            '[sighs]': '',  # Remove sighs
-            '[surprised]': '',  # Remove marker, emotion handles it
-            '[upbeat]': '',  # Remove marker, emotion handles it
-            '[amused]': '',  # Remove marker, emotion handles it
-            'Hmm...': 'Hmm,',  # Shorter thinking sound
-            'Oh wow!': 'Wow',  # More subtle
-            'Actually, wait—': 'Actually,',  # Smoother
-            'Oh, that reminds me—': 'That reminds me,',  # Less abrupt
-            'ha ha': '',  # Remove any explicit ha ha
-            'haha': '',  # Remove variations
-            'Ha ha': '',  # Remove variations
-        }
-        
-        for marker, replacement in reactions.items():
-            text = text.replace(marker, replacement)
-        
-        # Remove any remaining brackets
-        text = re.sub(r'\[.*?\]', '', text)
-        
-        return text
-    
-    def _clean_urls(self, text):
-        """Remove or simplify URLs for better TTS output"""
-        import re
-        
-        # Pattern to match URLs
-        url_pattern = r'https?://[^\s<>"{}|\\^`\[\]]+|www\.[^\s<>"{}|\\^`\[\]]+'
-        
-        # Find all URLs in the text
-        urls = re.findall(url_pattern, text)
-        
-        for url in urls:
-            # Extract domain name for speaking
-            domain_match = re.search(r'(?:https?://)?(?:www\.)?([^/]+)', url)
-            if domain_match:
-                domain = domain_match.group(1)
-                # Clean up domain for speaking
-                domain = domain.replace('.com', ' dot com')
-                domain = domain.replace('.org', ' dot org')
-                domain = domain.replace('.net', ' dot net')
-                domain = domain.replace('.gov', ' dot gov')
-                domain = domain.replace('.', ' dot ')
-                
-                # Replace the full URL with just the domain name
-                text = text.replace(url, domain)
-        
-        return text
\ No newline at end of file
+        """Clean and enhance text for natural speech (URLs, reactions, pronunciations, pauses)"""
+        return self.normalizer.normalize(text)
@@ -0,0 +1,140 @@
+# src/price_history.py
+import os
+import numpy as np
+from datetime import date, datetime, timedelta
+
+_EPOCH = date(1970, 1, 1)
+
+class PriceHistory:
+    """
+    Append-only local store of daily price series.
+    
+    Each series is two flat binary files - dates as int32 days since the
+    epoch and prices as float64 - read back as memory-mapped NumPy arrays.
+    Dates are strictly increasing, so range queries are a binary search.
+    """
+    
+    def __init__(self, data_dir='.cache/prices'):
+        self.data_dir = data_dir
+        os.makedirs(self.data_dir, exist_ok=True)
+    
+    def _paths(self, series):
+        name = series.lower()
+        return (os.path.join(self.data_dir, f"{name}.dates.i32"),
+                os.path.join(self.data_dir, f"{name}.prices.f64"))
+    
+    def _count(self, dates_path, prices_path):
+        # A crash between the two appends can leave one file longer - only whole pairs count
+        if not os.path.exists(dates_path) or not os.path.exists(prices_path):
+            return 0
+        return min(os.path.getsize(dates_path) // 4, os.path.getsize(prices_path) // 8)
+    
+    def load(self, series):
+        """Return (dates, prices) as read-only arrays; dates are days since 1970-01-01"""
+        dates_path, prices_path = self._paths(series)
+        count = self._count(dates_path, prices_path)
+        if count == 0:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64)
+        dates = np.memmap(dates_path, dtype=np.int32, mode='r', shape=(count,))
+        prices = np.memmap(prices_path, dtype=np.float64, mode='r', shape=(count,))
+        return dates, prices
+    
+    def update(self, series, points):
+        """
+        Append Alpha Vantage data points newer than the last stored date.
+        
+        Args:
+            series: Series name, e.g. 'WTI'
+            points: List of {'date': 'YYYY-MM-DD', 'value': '71.23'} in any order
+            
+        Returns:
+            Number of points appended
+        """
+        dates_path, prices_path = self._paths(series)
+        count = self._count(dates_path, prices_path)
+        
+        # Drop any torn tail before appending, or every later date would pair with the wrong price
+        for path, width in ((dates_path, 4), (prices_path, 8)):
+            if os.path.exists(path) and os.path.getsize(path) != count * width:
+                with open(path, 'r+b') as f:
+                    f.truncate(count * width)
+        
+        dates, _ = self.load(series)
+        last = int(dates[-1]) if len(dates) else None
+        
+        new_points = {}
+        for point in points:
+            # Alpha Vantage uses "." for days without a value
+            if point.get('value') in (None, '', '.'):
+                continue
+            try:
+                day = (datetime.strptime(point['date'], '%Y-%m-%d').date() - _EPOCH).days
+                value = float(point['value'])
+            except (KeyError, ValueError):
+                continue
+            if last is None or day > last:
+                new_points[day] = value
+        
+        if not new_points:
+            return 0
+        
+        days = sorted(new_points)
+        
+        # A crash between these writes leaves one file longer; load() ignores the
+        # unpaired tail and the next update() truncates it before appending
+        with open(prices_path, 'ab') as f:
+            f.write(np.array([new_points[d] for d in days], dtype=np.float64).tobytes())
+        with open(dates_path, 'ab') as f:
+            f.write(np.array(days, dtype=np.int32).tobytes())
+        
+        return len(days)
+    
+    def window(self, series, days):
+        """(dates, prices) for the ``days`` calendar days up to the latest stored date"""
+        dates, prices = self.load(series)
+        if not len(dates):
+            return dates, prices
+        start = np.searchsorted(dates, dates[-1] - days, side='right')
+        return dates[start:], prices[start:]
+    
+    def latest(self, series):
+        """(date, price) of the most recent point, or None"""
+        dates, prices = self.load(series)
+        if not len(dates):
+            return None
+        return _EPOCH + timedelta(days=int(dates[-1])), float(prices[-1])
+    
+    def change(self, series, days):
+        """Percent change between the latest price and the last price at least ``days`` earlier"""
+        dates, prices = self.load(series)
+        if len(dates) < 2:
+            return None
+        index = np.searchsorted(dates, dates[-1] - days, side='right') - 1
+        if index < 0 or prices[index] == 0:
+            return None
+        return float((prices[-1] - prices[index]) / prices[index] * 100)
+    
+    def moving_average(self, series, days):
+        """Mean price over the last ``days`` calendar days"""
+        _, prices = self.window(series, days)
+        return float(prices.mean()) if len(prices) else None
+    
+    def high_low(self, series, days=365):
+        """(high, low) over the last ``days`` calendar days (52 weeks by default)"""
+        _, prices = self.window(series, days)
+        if not len(prices):
+            return None, None
+        return float(prices.max()), float(prices.min())
+    
+    def context(self, series):
+        """Derived figures for the podcast script, keyed by a lower-case series prefix"""
+        prefix = series.lower()
+        high, low = self.high_low(series, 365)
+        figures = {
+            f'change_{prefix}_7d': self.change(series, 7),
+            f'change_{prefix}_30d': self.change(series, 30),
+            f'{prefix}_ma_30': self.moving_average(series, 30),
+            f'{prefix}_high_52w': high,
+            f'{prefix}_low_52w': low
+        }
+        return {key: value for key, value in figures.items() if value is not None}
@@ -0,0 +1,141 @@
+# src/prompt_budget.py
+import html
+import re
+from src.near_duplicates import shingles
+
+_TAG = re.compile(r'<[^>]+>')
+_SPACE = re.compile(r'\s+')
+_PIECE = re.compile(r'\w+|[^\w\s]')
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+def clean_text(text):
+    """Feed HTML to plain prose: tags removed, entities decoded, whitespace collapsed"""
+    if not text:
+        return ""
+    text = html.unescape(_TAG.sub(' ', text))
+    return _SPACE.sub(' ', text).strip()
+
+def estimate_tokens(text):
+    """
+    Fast local token estimate, no tokenizer needed.
+
+    Punctuation counts as one token and words as one token per four
+    characters, which tracks SentencePiece counts for English news text
+    closely enough for budgeting.
+    """
+    return sum((len(piece) + 3) // 4 for piece in _PIECE.findall(text))
+
+def truncate_to_tokens(text, max_tokens):
+    """Longest prefix within ``max_tokens``, cut at a sentence end when possible"""
+    if max_tokens <= 0:
+        return ""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    kept = []
+    used = 0
+    for sentence in _SENTENCE_END.split(text):
+        cost = estimate_tokens(sentence)
+        if used + cost > max_tokens:
+            break
+        kept.append(sentence)
+        used += cost
+    if kept:
+        return ' '.join(kept)
+
+    # First sentence alone is too long: cut it at a word boundary instead
+    words = []
+    used = 0
+    for word in text.split(' '):
+        cost = estimate_tokens(word)
+        if used + cost > max_tokens:
+            break
+        words.append(word)
+        used += cost
+    return ' '.join(words) + '...'
+
+class PromptBudgeter:
+    """
+    Compacts the article material that goes into the script prompt.
+
+    Summaries and bodies are cleaned of feed HTML, summaries that repeat an
+    earlier article's summary are dropped, and the remaining text is trimmed
+    so all articles together fit in ``max_tokens``. Budget an article does
+    not use is passed on to the ones after it.
+    """
+
+    def __init__(self, max_tokens=3000, summary_share=0.3, duplicate_threshold=0.6):
+        self.max_tokens = max_tokens
+        self.summary_share = summary_share
+        self.duplicate_threshold = duplicate_threshold
+        self.raw_tokens = 0
+        self.sent_tokens = 0
+
+    @property
+    def saved_tokens(self):
+        return max(self.raw_tokens - self.sent_tokens, 0)
+
+    def _is_repeat(self, summary_shingles, seen):
+        if not summary_shingles:
+            return False
+        for other in seen:
+            overlap = len(summary_shingles & other) / len(summary_shingles | other)
+            if overlap >= self.duplicate_threshold:
+                return True
+        return False
+
+    def compact(self, articles):
+        """
+        Return copies of ``articles`` with budgeted ``summary`` and ``body`` text.
+
+        Titles and sources are always kept; they are what the hosts talk about.
+        """
+        self.raw_tokens = 0
+        self.sent_tokens = 0
+
+        cleaned = []
+        seen = []
+        for article in articles:
+            raw_summary = article.get('summary') or ''
+            raw_body = article.get('body') or ''
+            self.raw_tokens += estimate_tokens(article['title']) + estimate_tokens(raw_summary) + estimate_tokens(raw_body)
+
+            summary = clean_text(raw_summary)
+            summary_shingles = shingles(summary)
+            if self._is_repeat(summary_shingles, seen):
+                summary = ""
+            elif summary_shingles:
+                seen.append(summary_shingles)
+
+            # A summary that just repeats the title adds nothing
+            if summary and summary.lower().startswith(article['title'].lower()) and \
+                    estimate_tokens(summary) - estimate_tokens(article['title']) < 8:
+                summary = ""
+            cleaned.append((article, summary, clean_text(raw_body)))
+
+        remaining = self.max_tokens
+        compacted = []
+        for i, (article, summary, body) in enumerate(cleaned):
+            allowance = remaining // (len(cleaned) - i)
+            title_tokens = estimate_tokens(article['title'])
+            text_budget = max(allowance - title_tokens, 0)
+
+            if body:
+                summary = truncate_to_tokens(summary, int(text_budget * self.summary_share))
+                body = truncate_to_tokens(body, text_budget - estimate_tokens(summary))
+            else:
+                summary = truncate_to_tokens(summary, text_budget)
+
+            used = title_tokens + estimate_tokens(summary) + estimate_tokens(body)
+            remaining -= used
+            self.sent_tokens += used
+
+            item = dict(article)
+            item['summary'] = summary
+            if body:
+                item['body'] = body
+            else:
+                item.pop('body', None)
+            compacted.append(item)
+
+        return compacted
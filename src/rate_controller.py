@@ -0,0 +1,73 @@
+# src/rate_controller.py
+import asyncio
+import time
+
+class AIMDRateController:
+    """
+    Shared concurrency limit for requests to a rate-limited service.
+
+    Works like TCP congestion control: every success raises the limit by
+    ``increase / limit`` (about ``increase`` per full round of requests),
+    a throttle or timeout halves it. A throttle also starts a global
+    cooldown during which no new request starts, so one 403 pauses every
+    in-flight worker instead of each retrying into the next 403. Cuts are
+    applied at most once per cooldown window, since requests that were
+    already in flight tend to fail together.
+    """
+
+    def __init__(self, initial=4, minimum=1, maximum=16, increase=1.0, decrease=0.5, cooldown=6.0):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.cooldown_until = 0.0
+        self.last_cut = float('-inf')
+        self.throttles = 0
+        self._condition = None
+
+    def _get_condition(self):
+        # Created lazily so the controller can be built outside a running event loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def acquire(self):
+        """Wait for a free slot under the current limit and outside any cooldown"""
+        condition = self._get_condition()
+        async with condition:
+            while True:
+                wait = self.cooldown_until - time.monotonic()
+                if wait <= 0 and self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                try:
+                    await asyncio.wait_for(condition.wait(), timeout=wait if wait > 0 else None)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def release(self, outcome='ok'):
+        """
+        Free a slot and adjust the limit.
+
+        ``outcome`` is 'ok', 'throttled' (403 / invalid status), 'timeout'
+        or 'error' (anything that says nothing about load).
+        """
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if outcome == 'ok':
+                self.limit = min(self.maximum, self.limit + self.increase / self.limit)
+            elif outcome in ('throttled', 'timeout'):
+                if now - self.last_cut >= self.cooldown:
+                    self.limit = max(self.minimum, self.limit * self.decrease)
+                    self.last_cut = now
+                if outcome == 'throttled':
+                    self.throttles += 1
+                    self.cooldown_until = max(self.cooldown_until, now + self.cooldown)
+                    print(f"  [WARNING] Throttled by TTS service, pausing {self.cooldown:.0f}s "
+                          f"(concurrency now {int(self.limit)})")
+            condition.notify_all()
@@ -26,7 +26,8 @@ class PodcastRSSGenerator:
         rss = ET.Element('rss', {
             'version': '2.0',
             'xmlns:itunes': 'http://www.itunes.com/dtds/podcast-1.0.dtd',
-            'xmlns:content': 'http://purl.org/rss/1.0/modules/content/'
+            'xmlns:content': 'http://purl.org/rss/1.0/modules/content/',
+            'xmlns:podcast': 'https://podcastindex.org/namespace/1.0'
         })
         
         channel = ET.SubElement(rss, 'channel')
@@ -107,7 +108,16 @@ class PodcastRSSGenerator:
                     except:
                         date = datetime.now()
                     
+                    # Timed transcript and chapters written alongside the MP3, when present
+                    base = filename[:-len('.mp3')]
+                    extras = {
+                        name: f"{base}{suffix}" for name, suffix in
+                        (('transcript', '.vtt'), ('chapters', '.chapters.json'))
+                        if os.path.exists(os.path.join(episodes_dir, f"{base}{suffix}"))
+                    }
+                    
                     episodes.append({
+                        **extras,
                         'title': f"Oil Field Insights - {date.strftime('%B %d, %Y')}",
                         'description': f"Daily oil and gas industry news for {date.strftime('%B %d, %Y')}. AI-generated podcast featuring two hosts discussing the latest developments, market trends, and industry insights.",
                         'file': filename,
@@ -147,6 +157,19 @@ class PodcastRSSGenerator:
         ET.SubElement(item, 'itunes:duration').text = episode['duration']
         ET.SubElement(item, 'itunes:explicit').text = 'no'
         ET.SubElement(item, 'itunes:keywords').text = episode['keywords']
+        
+        # Podcasting 2.0 transcript and chapters
+        base_url = f"{self.base_url}/episodes" if self.base_url else "episodes"
+        if episode.get('transcript'):
+            ET.SubElement(item, 'podcast:transcript', {
+                'url': f"{base_url}/{episode['transcript']}",
+                'type': 'text/vtt'
+            })
+        if episode.get('chapters'):
+            ET.SubElement(item, 'podcast:chapters', {
+                'url': f"{base_url}/{episode['chapters']}",
+                'type': 'application/json+chapters'
+            })
     
     def _estimate_duration(self, file_size_bytes):
         """Estimate duration based on file size (128kbps MP3)"""
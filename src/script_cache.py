@@ -0,0 +1,50 @@
+# src/script_cache.py
+import json
+import hashlib
+from src.file_cache import FileCache
+
+class ScriptCache(FileCache):
+    """
+    Content-addressed on-disk cache of generated dialogue scripts.
+    
+    Keys hash everything that shapes the LLM output - the article set,
+    market data, prompt template version and generation config - so a
+    rerun on the same inputs skips the model call entirely. The cache is
+    size-capped and evicts least recently used scripts first.
+    """
+    
+    def __init__(self, cache_dir='.cache/scripts', max_bytes=20 * 1024 * 1024):
+        super().__init__(cache_dir, max_bytes, ('json',))
+    
+    @staticmethod
+    def make_key(articles, market_data, prompt_version, generation_config, **extra):
+        """Stable hash of the generation inputs; ``extra`` covers anything else in the prompt"""
+        payload = {
+            'articles': [
+                {field: article.get(field, '') for field in ('title', 'summary', 'link', 'source', 'body')}
+                for article in articles
+            ],
+            'market_data': market_data,
+            'prompt_version': prompt_version,
+            'generation_config': generation_config,
+            'extra': extra
+        }
+        canonical = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+    
+    def get(self, key):
+        """Return the cached script for ``key`` or None"""
+        data = self.read(key, 'json')
+        if data is None:
+            return None
+        try:
+            return json.loads(data)
+        except ValueError:
+            return None
+    
+    def put(self, key, script):
+        """Store a script, then evict old entries if the cache is over its size cap"""
+        try:
+            self.write(key, 'json', json.dumps(script, ensure_ascii=False))
+        except OSError as e:
+            print(f"[WARNING] Could not cache script: {e}")
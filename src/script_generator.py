@@ -5,17 +5,25 @@ import json
 import google.generativeai as genai
 from datetime import datetime
 import re
+from concurrent.futures import ThreadPoolExecutor
+from src.json_stream import IncrementalJSONArrayParser
+from src.prompt_budget import PromptBudgeter, estimate_tokens
 
 # Load .env file
 load_dotenv()
 
 class DialogueScriptGenerator:
-    def __init__(self):
+    # Bump whenever the prompt template changes so cached scripts are not reused
+    PROMPT_VERSION = 3
+    
+    def __init__(self, cache=None, sectioned=False, section_workers=4, prompt_token_budget=3000):
+        self.model_name = 'gemini-1.5-flash'
+        
         # Configure Gemini (API key from environment)
         api_key = os.getenv('GEMINI_API_KEY')
         if api_key:
             genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel('gemini-1.5-flash')
+            self.model = genai.GenerativeModel(self.model_name)
             self.use_ai = True
         else:
             print("Warning: No GEMINI_API_KEY found, using basic script generation")
@@ -23,12 +31,39 @@ class DialogueScriptGenerator:
         
         self.host1_name = "Alex"
         self.host2_name = "Sam"
+        
+        self.generation_config = {
+            'temperature': 0.9,
+            'top_p': 0.95,
+            'max_output_tokens': 8000,  # Doubled for 15-minute content
+        }
+        
+        # Optional ScriptCache - reruns on the same inputs skip the LLM call
+        self.cache = cache
+        
+        # Article text is cleaned, deduplicated and trimmed to this many input tokens
+        self.budgeter = PromptBudgeter(max_tokens=prompt_token_budget)
+        
+        # Sectioned mode: plan an outline, then write each section in its own concurrent request
+        self.sectioned = sectioned
+        self.section_workers = section_workers
+        self.outline_config = {
+            'temperature': 0.4,
+            'max_output_tokens': 1500,
+        }
+        self.section_config = {
+            'temperature': 0.9,
+            'top_p': 0.95,
+            'max_output_tokens': 3000,
+        }
     
     def generate_dialogue_script(self, articles, market_data=None):
         """Create natural two-host conversation using Gemini AI"""
         
         if self.use_ai and len(articles) > 0:
             try:
+                if self.sectioned:
+                    return self._generate_sectioned_script(articles, market_data)
                 return self._generate_ai_script(articles, market_data)
             except Exception as e:
                 print(f"AI generation failed: {e}, falling back to template")
@@ -36,18 +71,79 @@ class DialogueScriptGenerator:
         else:
             return self._generate_template_script(articles, market_data)
     
+    def _cache_key(self, articles, market_data, mode='single'):
+        """Cache key for a script; includes the date because it is part of the prompt"""
+        if mode == 'sectioned':
+            config = {'outline': self.outline_config, 'section': self.section_config}
+        else:
+            config = self.generation_config
+        return self.cache.make_key(
+            articles[:8],
+            market_data,
+            self.PROMPT_VERSION,
+            config,
+            model=self.model_name,
+            token_budget=self.budgeter.max_tokens,
+            date=datetime.now().strftime('%Y-%m-%d'),
+            mode=mode
+        )
+    
     def _generate_ai_script(self, articles, market_data):
         """Generate NotebookLM-style script using Gemini"""
         
+        cache_key = None
+        if self.cache:
+            cache_key = self._cache_key(articles, market_data)
+            cached = self.cache.get(cache_key)
+            if cached:
+                print(f"[OK] Using cached script ({len(cached)} segments)")
+                return cached
+        
+        prompt = self._build_prompt(articles, market_data)
+        
+        # Generate with Gemini - increased tokens for longer script
+        response = self.model.generate_content(
+            prompt,
+            generation_config=self.generation_config
+        )
+        
+        # Parse response
+        try:
+            # Clean up response text
+            response_text = response.text.strip()
+            # Remove markdown code blocks if present
+            response_text = re.sub(r'^```json\s*', '', response_text)
+            response_text = re.sub(r'\s*```$', '', response_text)
+            
+            script_data = json.loads(response_text)
+            
+            # Ensure proper format
+            formatted_script = []
+            for item in script_data:
+                previous = formatted_script[-1].get('section') if formatted_script else None
+                formatted_script.append(self._format_turn(item, previous))
+            
+            # Add closing if script is too short
+            if len(formatted_script) < 30:  # Increased minimum for longer podcast
+                formatted_script.extend(self._add_closing())
+            
+            # Only well-formed scripts are cached, never the fallbacks below
+            if cache_key:
+                self.cache.put(cache_key, formatted_script)
+            
+            return formatted_script
+            
+        except json.JSONDecodeError as e:
+            print(f"Failed to parse AI response: {e}")
+            # Extract any dialogue we can find
+            return self._extract_dialogue_fallback(response.text, articles)
+    
+    def _build_prompt(self, articles, market_data):
+        """Build the single-call 15-minute episode prompt"""
+        
         # Prepare articles summary - use more articles for longer podcast
-        articles_text = ""
-        for i, article in enumerate(articles[:8], 1):  # Increased from 5 to 8 articles
-            articles_text += f"""
-            Article {i}:
-            Title: {article['title']}
-            Summary: {article['summary'][:400]}  # More detail
-            Source: {article['source']}
-            ---"""
+        articles = self._compact_articles(articles[:8])
+        articles_text = "".join(self._article_block(article, i) for i, article in enumerate(articles, 1))
         
         # Create the prompt
         prompt = f"""
@@ -62,6 +158,7 @@ class DialogueScriptGenerator:
         {"Market Data:" if market_data else ""}
         {f"- WTI Crude: ${market_data.get('wti_crude'):.2f} ({market_data.get('change_wti')})" if market_data else ""}
         {f"- Brent Crude: ${market_data.get('brent_crude'):.2f} ({market_data.get('change_brent')})" if market_data else ""}
+        {self._market_trends(market_data)}
         
         News Articles:
         {articles_text}
@@ -100,55 +197,328 @@ class DialogueScriptGenerator:
         
         IMPORTANT: Return ONLY a JSON array with this exact format, no markdown:
         [
-            {{"speaker": "host1", "text": "Hey everyone, welcome back to Oil Field Insights Daily! [upbeat] It's {datetime.now().strftime('%B %d')}, and Sam, you're not going to believe what's happening in the Permian Basin today.", "emotion": "excited"}},
-            {{"speaker": "host2", "text": "[laughs] Oh no, what now? Every time you start like that, I know we're in for a wild ride!", "emotion": "amused"}},
+            {{"speaker": "host1", "text": "Hey everyone, welcome back to Oil Field Insights Daily! [upbeat] It's {datetime.now().strftime('%B %d')}, and Sam, you're not going to believe what's happening in the Permian Basin today.", "emotion": "excited", "section": "Opening"}},
+            {{"speaker": "host2", "text": "[laughs] Oh no, what now? Every time you start like that, I know we're in for a wild ride!", "emotion": "amused", "section": "Opening"}},
             ...
         ]
         
         Emotions: neutral, excited, thoughtful, concerned, optimistic, amused, surprised, skeptical
         
+        Sections (used as podcast chapters): "Opening" for the opening, the story's exact headline
+        from the list above for its deep dive, "Industry Analysis", and "Closing".
+        
         REMEMBER: Make this feel like a real conversation between friends who happen to be oil industry experts. Include enough content for 15 minutes of audio!
         """
         
-        # Generate with Gemini - increased tokens for longer script
-        response = self.model.generate_content(
-            prompt,
-            generation_config={
-                'temperature': 0.9,
-                'top_p': 0.95,
-                'max_output_tokens': 8000,  # Doubled for 15-minute content
-            }
-        )
+        self._report_prompt(prompt)
+        return prompt
+    
+    def _compact_articles(self, articles):
+        """Clean and trim the article text to the prompt token budget"""
+        return self.budgeter.compact(articles)
+    
+    def _report_prompt(self, prompt, label="Prompt"):
+        print(f"[INFO] {label}: ~{estimate_tokens(prompt)} tokens sent, "
+              f"~{self.budgeter.saved_tokens} saved on article text")
+    
+    def _format_turn(self, item, section=None):
+        """Normalize one dialogue turn from the model output; ``section`` carries over from the previous turn"""
+        turn = {
+            'speaker': item.get('speaker', 'host1'),
+            'text': item.get('text', ''),
+            'emotion': item.get('emotion', 'neutral')
+        }
+        if isinstance(item.get('section'), str) and item['section'].strip():
+            section = item['section'].strip()
+        if section:
+            turn['section'] = section
+        return turn
+    
+    async def stream_dialogue_script(self, articles, market_data=None):
+        """
+        Async generator version of generate_dialogue_script.
         
-        # Parse response
+        Streams the Gemini response and yields each dialogue turn as soon as
+        its JSON object is complete, so speech synthesis can start on the
+        first turns while the rest of the script is still being written.
+        """
+        if not self.use_ai or not articles:
+            for turn in self._generate_template_script(articles, market_data):
+                yield turn
+            return
+        
+        cache_key = None
+        if self.cache:
+            cache_key = self._cache_key(articles, market_data)
+            cached = self.cache.get(cache_key)
+            if cached:
+                print(f"[OK] Using cached script ({len(cached)} segments)")
+                for turn in cached:
+                    yield turn
+                return
+        
+        parser = IncrementalJSONArrayParser()
+        raw_text = ''
+        script = []
         try:
-            # Clean up response text
-            response_text = response.text.strip()
-            # Remove markdown code blocks if present
-            response_text = re.sub(r'^```json\s*', '', response_text)
-            response_text = re.sub(r'\s*```$', '', response_text)
-            
-            script_data = json.loads(response_text)
-            
-            # Ensure proper format
-            formatted_script = []
-            for item in script_data:
-                formatted_script.append({
-                    'speaker': item.get('speaker', 'host1'),
-                    'text': item.get('text', ''),
-                    'emotion': item.get('emotion', 'neutral')
-                })
-            
-            # Add closing if script is too short
-            if len(formatted_script) < 30:  # Increased minimum for longer podcast
-                formatted_script.extend(self._add_closing())
-            
-            return formatted_script
-            
-        except json.JSONDecodeError as e:
-            print(f"Failed to parse AI response: {e}")
-            # Extract any dialogue we can find
-            return self._extract_dialogue_fallback(response.text, articles)
+            response = await self.model.generate_content_async(
+                self._build_prompt(articles, market_data),
+                generation_config=self.generation_config,
+                stream=True
+            )
+            async for chunk in response:
+                try:
+                    text = chunk.text
+                except ValueError:
+                    continue  # chunk without text parts (e.g. finish or safety metadata)
+                raw_text += text
+                for item in parser.feed(text):
+                    turn = self._format_turn(item, script[-1].get('section') if script else None)
+                    script.append(turn)
+                    yield turn
+        except Exception as e:
+            print(f"AI streaming failed: {e}")
+            if not script:
+                print("Falling back to template")
+                for turn in self._generate_template_script(articles, market_data):
+                    yield turn
+                return
+        
+        if not script:
+            # Nothing parseable arrived - same recovery as the non-streaming path
+            print("Failed to parse streamed AI response")
+            for turn in self._extract_dialogue_fallback(raw_text, articles):
+                yield turn
+            return
+        
+        # Add closing if script is too short (or was cut off mid-stream)
+        if len(script) < 30 or not parser.finished:
+            for turn in self._add_closing():
+                script.append(turn)
+                yield turn
+        
+        if cache_key and parser.finished:
+            self.cache.put(cache_key, script)
+    
+    def _parse_turns(self, text):
+        """Parse a JSON array of turns, keeping every complete turn even if the output was cut off"""
+        parser = IncrementalJSONArrayParser()
+        return [self._format_turn(item) for item in parser.feed(text)]
+    
+    def _show_context(self, market_data):
+        """Shared context every sectioned request starts from"""
+        market_lines = ""
+        if market_data:
+            market_lines = f"""
+        Market Data:
+        - WTI Crude: ${market_data.get('wti_crude'):.2f} ({market_data.get('change_wti')})
+        - Brent Crude: ${market_data.get('brent_crude'):.2f} ({market_data.get('change_brent')})
+        {self._market_trends(market_data)}"""
+        
+        return f"""
+        You are writing part of a podcast script for "Oil Field Insights Daily" - an engaging, conversational podcast about the oil and gas industry.
+        
+        Hosts:
+        - Alex (host1): Analytical, occasionally makes dry jokes, asks probing questions, connects stories to bigger trends
+        - Sam (host2): Enthusiastic, sometimes laughs at Alex's observations, explains technical concepts with analogies, adds personal reactions
+        
+        Today's date: {datetime.now().strftime('%B %d, %Y')}
+        {market_lines}
+        """
+    
+    def _article_block(self, article, number):
+        """Prompt lines for one already compacted article"""
+        lines = [f"Article {number}:", f"Title: {article['title']}"]
+        if article.get('summary'):
+            lines.append(f"Summary: {article['summary']}")
+        # Full text from the optional enrichment stage, when available
+        if article.get('body'):
+            lines.append(f"Details: {article['body']}")
+        lines.append(f"Source: {article['source']}")
+        return "\n        " + "\n        ".join(lines) + "\n        ---"
+    
+    def _plan_outline(self, articles, market_data):
+        """Ask for a short episode plan: story order, angles and the closing takeaways"""
+        articles_text = "".join(self._article_block(article, i) for i, article in enumerate(articles, 1))
+        prompt = f"""
+        {self._show_context(market_data)}
+        
+        News Articles:
+        {articles_text}
+        
+        Plan today's 15-minute episode. Pick the 5-6 most interesting articles, order them so the
+        conversation flows, and give each an angle and a link to the other stories.
+        
+        Return ONLY JSON, no markdown:
+        {{"theme": "one sentence tying the day together",
+          "stories": [{{"article": 1, "angle": "what to focus on", "connection": "link to another story"}}],
+          "takeaways": ["key takeaway"],
+          "watch_tomorrow": "what to watch next"}}
+        """
+        
+        self._report_prompt(prompt, "Outline prompt")
+        try:
+            response = self.model.generate_content(prompt, generation_config=self.outline_config)
+            text = re.sub(r'^```(?:json)?\s*|\s*```$', '', response.text.strip())
+            outline = json.loads(text)
+            stories = [story for story in outline.get('stories', [])
+                       if isinstance(story.get('article'), int) and 1 <= story['article'] <= len(articles)]
+            if stories:
+                outline['stories'] = stories
+                return outline
+        except Exception as e:
+            print(f"Outline generation failed: {e}, using article order")
+        
+        # Default plan: the top stories in ranking order
+        return {
+            'theme': '',
+            'stories': [{'article': i, 'angle': '', 'connection': ''} for i in range(1, min(len(articles), 6) + 1)],
+            'takeaways': [],
+            'watch_tomorrow': ''
+        }
+    
+    def _section_prompts(self, articles, market_data, outline):
+        """One (section title, prompt) pair per section, in episode order"""
+        context = self._show_context(market_data)
+        story_titles = "\n".join(
+            f"        {n}. {articles[story['article'] - 1]['title']}" for n, story in enumerate(outline['stories'], 1)
+        )
+        plan = f"""
+        Episode plan (shared by every part of the script):
+        Theme: {outline.get('theme') or 'Today in oil and gas'}
+        Stories, in order:
+{story_titles}
+        """
+        json_format = """
+        IMPORTANT: Return ONLY a JSON array with this exact format, no markdown:
+        [
+            {"speaker": "host1", "text": "...", "emotion": "thoughtful"},
+            {"speaker": "host2", "text": "...", "emotion": "amused"}
+        ]
+        
+        Emotions: neutral, excited, thoughtful, concerned, optimistic, amused, surprised, skeptical
+        Include natural reactions ("[chuckles]", "Hmm...", "Oh wow!") and conversational fillers.
+        """
+        
+        sections = [('Opening', f"""
+        {context}
+        {plan}
+        Write ONLY the WARM OPENING (4-6 turns):
+        - Casual greeting with date reference and a little banter
+        - Market overview with personal reaction
+        - Tease the stories coming up, then hand over to the first one
+        Do not discuss any story in detail yet.
+        {json_format}
+        """)]
+        
+        for n, story in enumerate(outline['stories'], 1):
+            article = articles[story['article'] - 1]
+            position = "the first story" if n == 1 else f"story {n} of {len(outline['stories'])}"
+            sections.append((article['title'], f"""
+        {context}
+        {plan}
+        Write ONLY the deep dive on {position} (8-12 turns). The previous part of the show has
+        just ended, so open with a natural transition rather than a greeting, and do not sign off.
+        {self._article_block(article, n)}
+        Angle: {story.get('angle') or 'Why this matters for the industry'}
+        Connection to other stories: {story.get('connection') or 'Connect it to the day if it fits'}
+        
+        Ask follow-up questions, explain technical points with analogies, add reactions and
+        moments of surprise or skepticism.
+        {json_format}
+        """))
+        
+        takeaways = "; ".join(outline.get('takeaways') or []) or "Summarize the day's key points"
+        sections.append(('Closing', f"""
+        {context}
+        {plan}
+        Write ONLY the INDUSTRY ANALYSIS and CLOSING (8-12 turns):
+        - Connect today's stories to broader trends and what they mean for different stakeholders
+        - Key takeaways: {takeaways}
+        - What to watch tomorrow: {outline.get('watch_tomorrow') or 'preview what to watch tomorrow'}
+        - Sign off with personality as {self.host1_name} and {self.host2_name}
+        {json_format}
+        """))
+        return sections
+    
+    def _generate_section(self, title, prompt):
+        response = self.model.generate_content(prompt, generation_config=self.section_config)
+        turns = self._parse_turns(response.text)
+        for turn in turns:
+            turn['section'] = title
+        return turns
+    
+    def _generate_sectioned_script(self, articles, market_data):
+        """
+        Outline first, then generate the opening, each deep dive and the closing
+        as concurrent requests and stitch them back together in order.
+        
+        No single response has to hold the whole episode, so the script is no
+        longer capped (or truncated) by one call's output token limit.
+        """
+        cache_key = None
+        if self.cache:
+            cache_key = self._cache_key(articles, market_data, mode='sectioned')
+            cached = self.cache.get(cache_key)
+            if cached:
+                print(f"[OK] Using cached script ({len(cached)} segments)")
+                return cached
+        
+        articles = self._compact_articles(articles[:8])
+        outline = self._plan_outline(articles, market_data)
+        sections = self._section_prompts(articles, market_data, outline)
+        print(f"Generating {len(sections)} script sections concurrently...")
+        
+        with ThreadPoolExecutor(max_workers=self.section_workers) as executor:
+            futures = [executor.submit(self._generate_section, title, prompt) for title, prompt in sections]
+        
+        script = []
+        generated = 0
+        for (title, _), future in zip(sections, futures):
+            try:
+                turns = future.result()
+            except Exception as e:
+                turns = []
+                print(f"Section '{title}' failed: {e}")
+            if turns:
+                generated += 1
+            elif title == 'Closing':
+                # The stock sign-off keeps a partial episode from ending abruptly
+                turns = self._add_closing()
+            script.extend(turns)
+        
+        # Counted before the stock closing is added, so it cannot pass for a generated section
+        if not generated:
+            raise Exception("no script sections could be generated")
+        complete = generated == len(sections)
+        
+        # Partial scripts are still used, but not cached, so a rerun can fill the gaps
+        if cache_key and complete:
+            self.cache.put(cache_key, script)
+        
+        return script
+    
+    def _market_trends(self, market_data):
+        """Longer-range price context (from the local price history) as prompt lines"""
+        if not market_data:
+            return ""
+        
+        lines = []
+        for prefix, label in (('wti', 'WTI'), ('brent', 'Brent')):
+            parts = []
+            if f'change_{prefix}_7d' in market_data:
+                parts.append(f"{market_data[f'change_{prefix}_7d']:+.2f}% over 7 days")
+            if f'change_{prefix}_30d' in market_data:
+                parts.append(f"{market_data[f'change_{prefix}_30d']:+.2f}% over 30 days")
+            if f'{prefix}_ma_30' in market_data:
+                parts.append(f"30-day average ${market_data[f'{prefix}_ma_30']:.2f}")
+            if f'{prefix}_low_52w' in market_data and f'{prefix}_high_52w' in market_data:
+                parts.append(f"52-week range ${market_data[f'{prefix}_low_52w']:.2f}-"
+                             f"${market_data[f'{prefix}_high_52w']:.2f}")
+            if parts:
+                lines.append(f"- {label} trend: {', '.join(parts)}")
+        
+        return "\n        ".join(lines)
     
     def _extract_dialogue_fallback(self, text, articles):
         """Fallback to extract dialogue from malformed response"""
@@ -228,13 +598,15 @@ class DialogueScriptGenerator:
                 script.append({
                     'speaker': 'host1',
                     'text': f"Let's start with our top story: {article['title']}.",
-                    'emotion': 'neutral'
+                    'emotion': 'neutral',
+                    'story': article['title']
                 })
             else:
                 script.append({
                     'speaker': 'host1',
                     'text': f"Now, here's another important development: {article['title']}.",
-                    'emotion': 'neutral'
+                    'emotion': 'neutral',
+                    'story': article['title']
                 })
             
             summary = article['summary'][:200] if len(article['summary']) > 200 else article['summary']
@@ -261,6 +633,12 @@ class DialogueScriptGenerator:
         # Closing
         script.extend(self._add_closing())
         
+        # Opening and market turns come first; each story starts with its headline turn
+        section = 'Opening'
+        for turn in script:
+            section = turn.get('section') or turn.pop('story', None) or section
+            turn['section'] = section
+        
         return script
     
     def _add_closing(self):
@@ -269,17 +647,20 @@ class DialogueScriptGenerator:
             {
                 'speaker': 'host1',
                 'text': "And that wraps up today's Oil Field Insights. Thanks for joining us!",
-                'emotion': 'neutral'
+                'emotion': 'neutral',
+                'section': 'Closing'
             },
             {
                 'speaker': 'host2',
                 'text': f"Remember to subscribe for daily updates on the oil and gas industry. "
                        f"I'm {self.host2_name}...",
-                'emotion': 'neutral'
+                'emotion': 'neutral',
+                'section': 'Closing'
             },
             {
                 'speaker': 'host1',
                 'text': f"And I'm {self.host1_name}. Have a great day, and we'll see you tomorrow!",
-                'emotion': 'optimistic'
+                'emotion': 'optimistic',
+                'section': 'Closing'
             }
         ]
\ No newline at end of file
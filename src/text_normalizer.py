@@ -0,0 +1,102 @@
+# src/text_normalizer.py
+import os
+import re
+import yaml
+
+DEFAULT_LEXICON = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config', 'pronunciation.yaml'
+)
+
+_URL = r'https?://[^\s<>"{}|\\^`\[\]]+|www\.[^\s<>"{}|\\^`\[\]]+'
+_STAGE_DIRECTION = r'\[[^\]]*\]'
+
+def speak_domain(url):
+    """'https://www.eia.gov/petroleum' -> 'eia dot gov'"""
+    match = re.match(r'(?:https?://)?(?:www\.)?([^/]+)', url)
+    domain = match.group(1) if match else url
+    return ' dot '.join(part for part in domain.split('.') if part)
+
+class TextNormalizer:
+    """
+    Single-pass text normalization for speech synthesis.
+
+    URLs, stage directions and every lexicon entry are compiled into one
+    prefix-tree regex and applied with a single ``re.sub`` callback, so
+    each line is scanned once no matter how large the lexicon grows. Keys
+    that begin or end with a word character only match on word boundaries.
+    """
+
+    SECTIONS = ('reactions', 'terms', 'abbreviations', 'pauses')
+
+    def __init__(self, lexicon=None, path=DEFAULT_LEXICON):
+        if lexicon is None:
+            lexicon = self.load(path)
+        self.replacements = lexicon
+        self.pattern = self._compile(lexicon)
+
+    @classmethod
+    def load(cls, path=DEFAULT_LEXICON):
+        """Flatten the sections of a lexicon YAML file into one replacement table"""
+        with open(path, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f) or {}
+
+        lexicon = {}
+        for section in cls.SECTIONS:
+            for key, value in (config.get(section) or {}).items():
+                lexicon[str(key)] = '' if value is None else str(value)
+        return lexicon
+
+    @staticmethod
+    def _trie_pattern(keys):
+        """
+        Regex for ``keys`` with shared prefixes factored out.
+
+        At each position the engine tests one character class instead of
+        every key in turn, and a longer key is always tried before a key
+        that is its prefix ("bbl/d" before "bbl").
+        """
+        trie = {}
+        for key in keys:
+            node = trie
+            for char in key:
+                node = node.setdefault(char, {})
+            node[''] = key
+
+        def emit(node):
+            branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+            if '' in node:
+                # Keys ending in a word character must end on a word boundary
+                branches.append(r'(?!\w)' if re.search(r'\w$', node['']) else '')
+            if len(branches) == 1:
+                return branches[0]
+            return '(?:' + '|'.join(branches) + ')'
+
+        return emit(trie)
+
+    def _compile(self, lexicon):
+        # Keys starting with a word character must start on a word boundary
+        word_keys = [key for key in lexicon if re.match(r'\w', key)]
+        other_keys = [key for key in lexicon if key not in word_keys]
+
+        alternatives = [f'(?P<url>{_URL})', f'(?P<stage>{_STAGE_DIRECTION})']
+        if word_keys:
+            alternatives.append(r'(?<!\w)' + self._trie_pattern(word_keys))
+        if other_keys:
+            alternatives.append(self._trie_pattern(other_keys))
+        return re.compile('|'.join(alternatives))
+
+    def _replace(self, match):
+        if match.lastgroup == 'url':
+            return speak_domain(match.group())
+        if match.lastgroup == 'stage':
+            return ''
+        return self.replacements[match.group()]
+
+    def normalize(self, text):
+        return self.pattern.sub(self._replace, text)
+
+    def normalize_many(self, texts):
+        """Normalize an iterable of lines, e.g. a whole transcript archive"""
+        replace = self._replace
+        sub = self.pattern.sub
+        return [sub(replace, text) for text in texts]
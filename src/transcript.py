@@ -0,0 +1,123 @@
+# src/transcript.py
+import json
+import os
+
+def _timestamp(ms, separator='.'):
+    ms = int(round(ms))
+    hours, ms = divmod(ms, 3600000)
+    minutes, ms = divmod(ms, 60000)
+    seconds, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{separator}{ms:03d}"
+
+class TranscriptBuilder:
+    """
+    Timed transcript and chapter markers for an assembled episode.
+
+    Turns are added with their position in the final audio and the word
+    timings the TTS service reported while synthesizing them, so captions
+    line up with the speech without running recognition on the MP3.
+    Chapters start wherever the turn's ``section`` changes.
+    """
+
+    def __init__(self, speaker_names=None, max_cue_words=12, max_cue_ms=6000, pause_ms=600):
+        self.speaker_names = speaker_names or {'host1': 'Alex', 'host2': 'Sam'}
+        self.max_cue_words = max_cue_words
+        self.max_cue_ms = max_cue_ms
+        self.pause_ms = pause_ms
+        self.turns = []
+        self.chapters = []
+
+    def add_turn(self, turn, start_ms, duration_ms, words=None):
+        """``words`` are (start_ms, end_ms, text) relative to the start of the turn's audio"""
+        section = turn.get('section')
+        if section and (not self.chapters or self.chapters[-1]['title'] != section):
+            self.chapters.append({'start_ms': start_ms, 'title': section})
+
+        self.turns.append({
+            'speaker': self.speaker_names.get(turn.get('speaker'), turn.get('speaker')),
+            'text': turn.get('text', ''),
+            'start_ms': start_ms,
+            'end_ms': start_ms + duration_ms,
+            'words': [(start_ms + start, start_ms + end, text) for start, end, text in (words or [])]
+        })
+
+    def cues(self):
+        """(start_ms, end_ms, speaker, text) caption cues, split at pauses and length limits"""
+        cues = []
+        for turn in self.turns:
+            words = turn['words']
+            if not words:
+                # No word timings (e.g. audio cached before they were recorded): one cue per turn
+                cues.append((turn['start_ms'], turn['end_ms'], turn['speaker'], turn['text']))
+                continue
+
+            current = [words[0]]
+            for word in words[1:]:
+                if (len(current) >= self.max_cue_words or word[1] - current[0][0] > self.max_cue_ms
+                        or word[0] - current[-1][1] > self.pause_ms):
+                    cues.append((current[0][0], current[-1][1], turn['speaker'], ' '.join(w[2] for w in current)))
+                    current = []
+                current.append(word)
+            cues.append((current[0][0], current[-1][1], turn['speaker'], ' '.join(w[2] for w in current)))
+        return cues
+
+    def to_vtt(self):
+        lines = ["WEBVTT", ""]
+        for start, end, speaker, text in self.cues():
+            lines.append(f"{_timestamp(start)} --> {_timestamp(end)}")
+            lines.append(f"<v {speaker}>{text}")
+            lines.append("")
+        return "\n".join(lines)
+
+    def to_srt(self):
+        lines = []
+        for number, (start, end, speaker, text) in enumerate(self.cues(), 1):
+            lines.append(str(number))
+            lines.append(f"{_timestamp(start, ',')} --> {_timestamp(end, ',')}")
+            lines.append(f"{speaker}: {text}")
+            lines.append("")
+        return "\n".join(lines)
+
+    def to_json(self):
+        return {
+            'turns': [
+                {
+                    'speaker': turn['speaker'],
+                    'text': turn['text'],
+                    'start': round(turn['start_ms'] / 1000, 3),
+                    'end': round(turn['end_ms'] / 1000, 3),
+                    'words': [
+                        {'start': round(start / 1000, 3), 'end': round(end / 1000, 3), 'word': text}
+                        for start, end, text in turn['words']
+                    ]
+                }
+                for turn in self.turns
+            ],
+            'chapters': self.chapters_json()['chapters']
+        }
+
+    def chapters_json(self):
+        """Chapters in the Podcasting 2.0 JSON chapters format"""
+        return {
+            'version': '1.2.0',
+            'chapters': [
+                {'startTime': round(chapter['start_ms'] / 1000, 3), 'title': chapter['title']}
+                for chapter in self.chapters
+            ]
+        }
+
+    def write(self, audio_file):
+        """Write .vtt, .srt, .json and (if there are chapters) .chapters.json next to ``audio_file``"""
+        base = os.path.splitext(audio_file)[0]
+        outputs = {
+            f"{base}.vtt": self.to_vtt(),
+            f"{base}.srt": self.to_srt(),
+            f"{base}.json": json.dumps(self.to_json(), ensure_ascii=False, indent=2)
+        }
+        if self.chapters:
+            outputs[f"{base}.chapters.json"] = json.dumps(self.chapters_json(), ensure_ascii=False, indent=2)
+
+        for path, content in outputs.items():
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+        return list(outputs)
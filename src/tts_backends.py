@@ -0,0 +1,202 @@
+# src/tts_backends.py
+import io
+import os
+import re
+import wave
+import shutil
+import asyncio
+import zlib
+import numpy as np
+import edge_tts
+
+# edge-tts reports WordBoundary offsets and durations in 100-nanosecond ticks
+TICKS_PER_MS = 10000
+
+def _percent(value):
+    """'+5%' -> 5.0"""
+    return float(value.rstrip('%'))
+
+def _hertz(value):
+    """'-3Hz' -> -3.0"""
+    return float(value[:-2])
+
+def _wav_bytes(samples, frame_rate):
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(frame_rate)
+        wav.writeframes(samples.astype('<i2').tobytes())
+    return buffer.getvalue()
+
+def _streamed_wav(audio):
+    """
+    Rewrite the header of a WAV that was written to a pipe.
+
+    A writer that cannot seek back (espeak with ``--stdout``) leaves a
+    placeholder data size of 0x7ffff000, about 13.5 hours at 22 kHz; the
+    real length is whatever bytes arrived. Returns (WAV bytes, duration in ms).
+    """
+    with wave.open(io.BytesIO(audio), 'rb') as wav:
+        channels, sample_width, frame_rate = wav.getnchannels(), wav.getsampwidth(), wav.getframerate()
+        # Reads up to the end of the data actually received
+        frames = wav.readframes(wav.getnframes())
+    frame_size = channels * sample_width
+    frames = frames[:len(frames) - len(frames) % frame_size]
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(sample_width)
+        wav.setframerate(frame_rate)
+        wav.writeframes(frames)
+    return buffer.getvalue(), len(frames) / frame_size * 1000 / frame_rate
+
+def _spread_words(text, duration_ms):
+    """Word timings estimated by spreading ``duration_ms`` over the words by length"""
+    words = re.findall(r'\w[\w\'.-]*', text)
+    total = sum(len(word) + 1 for word in words)
+    timings = []
+    position = 0.0
+    for word in words:
+        length = duration_ms * (len(word) + 1) / total
+        timings.append([position, position + length * 0.85, word])
+        position += length
+    return timings
+
+class EdgeTTSBackend:
+    """Microsoft Edge neural voices over the network (the default)"""
+
+    name = 'edge'
+    audio_format = 'mp3'
+
+    async def synthesize(self, text, voice, rate, pitch):
+        """Return (MP3 bytes, [[start_ms, end_ms, word], ...]) for ``text``"""
+        communicate = edge_tts.Communicate(
+            text,
+            voice,
+            rate=rate,
+            pitch=pitch,
+            # Word timings cost nothing extra and feed transcripts and turn splitting
+            boundary="WordBoundary"
+        )
+
+        audio = bytearray()
+        words = []
+        async for chunk in communicate.stream():
+            if chunk['type'] == 'audio':
+                audio.extend(chunk['data'])
+            elif chunk['type'] == 'WordBoundary':
+                start = chunk['offset'] / TICKS_PER_MS
+                words.append([start, start + chunk['duration'] / TICKS_PER_MS, chunk['text']])
+        return bytes(audio), words
+
+class ToneBackend:
+    """
+    Offline, deterministic stand-in for a TTS service.
+
+    Each word becomes a short voiced tone burst whose length follows the
+    word length and speaking rate, with pauses after commas and sentence
+    ends. The voice name picks the base pitch. The same text always gives
+    the same WAV bytes, so caching, concurrency, assembly and mixing can be
+    profiled without network access.
+    """
+
+    name = 'tone'
+    audio_format = 'wav'
+
+    def __init__(self, frame_rate=24000, latency=0.0):
+        self.frame_rate = frame_rate
+        # Optional simulated request latency in seconds, for load tests
+        self.latency = latency
+
+    async def synthesize(self, text, voice, rate, pitch):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        speed = 1 + _percent(rate) / 100
+        base_hz = 95 + zlib.crc32(voice.encode('utf-8')) % 120 + _hertz(pitch)
+        rng = np.random.RandomState(zlib.crc32(text.encode('utf-8')))
+
+        chunks = []
+        words = []
+        position = 0
+        for token in text.split():
+            word = re.sub(r'^\W+|\W+$', '', token)
+            if word:
+                length = int(self.frame_rate * (0.08 + 0.045 * len(word)) / speed)
+                t = np.arange(length) / self.frame_rate
+                hz = base_hz * (1 + 0.08 * rng.uniform(-1, 1))
+                envelope = np.sin(np.pi * np.arange(length) / length)
+                burst = (np.sin(2 * np.pi * hz * t) + 0.3 * np.sin(4 * np.pi * hz * t)
+                         + 0.05 * rng.standard_normal(length)) * envelope * 6000
+                words.append([position * 1000 / self.frame_rate, (position + length) * 1000 / self.frame_rate, word])
+                chunks.append(burst)
+                position += length
+
+            gap = 0.28 if re.search(r'[.!?]$', token) else 0.16 if token.endswith(',') else 0.05
+            gap_length = int(self.frame_rate * gap / speed)
+            chunks.append(np.zeros(gap_length))
+            position += gap_length
+
+        if not words:
+            # Nothing speakable (e.g. only punctuation left after normalizing) is a short pause,
+            # not an error: retrying the same text would only fail the same way
+            chunks = [np.zeros(int(self.frame_rate * 0.25))]
+        return _wav_bytes(np.concatenate(chunks), self.frame_rate), words
+
+class EspeakBackend:
+    """Offline speech with espeak-ng (or espeak) when it is installed"""
+
+    name = 'espeak'
+    audio_format = 'wav'
+
+    # Closest espeak variants for the Edge voices used by the show
+    VOICES = {
+        'en-US-GuyNeural': 'en-us+m3',
+        'en-US-AriaNeural': 'en-us+f3'
+    }
+
+    def __init__(self, executable=None):
+        self.executable = executable or shutil.which('espeak-ng') or shutil.which('espeak')
+        if not self.executable:
+            raise RuntimeError("espeak-ng / espeak is not installed")
+
+    @staticmethod
+    def available():
+        return bool(shutil.which('espeak-ng') or shutil.which('espeak'))
+
+    async def synthesize(self, text, voice, rate, pitch):
+        words_per_minute = int(175 * (1 + _percent(rate) / 100))
+        espeak_pitch = max(0, min(99, int(50 + _hertz(pitch) * 2)))
+        process = await asyncio.create_subprocess_exec(
+            self.executable, '-v', self.VOICES.get(voice, 'en-us'),
+            '-s', str(words_per_minute), '-p', str(espeak_pitch), '--stdout',
+            # Text starting with '-' must not be read as an option
+            '--', text,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        audio, error = await process.communicate()
+        if process.returncode != 0:
+            raise RuntimeError(f"espeak failed: {error.decode('utf-8', 'replace').strip()}")
+
+        # espeak reports no word timings; estimate them from the audio length
+        audio, duration_ms = _streamed_wav(audio)
+        return audio, _spread_words(text, duration_ms)
+
+def get_backend(name=None):
+    """
+    TTS backend by name: 'edge', 'tone', 'espeak', or 'local' (espeak if
+    installed, otherwise tone). Defaults to the TTS_BACKEND environment
+    variable, then 'edge'.
+    """
+    name = (name or os.getenv('TTS_BACKEND') or 'edge').lower()
+    if name == 'edge':
+        return EdgeTTSBackend()
+    if name == 'tone':
+        return ToneBackend()
+    if name == 'espeak':
+        return EspeakBackend()
+    if name == 'local':
+        return EspeakBackend() if EspeakBackend.available() else ToneBackend()
+    raise ValueError(f"Unknown TTS backend: {name}")
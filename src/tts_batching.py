@@ -0,0 +1,83 @@
+# src/tts_batching.py
+import re
+
+def _as_sentence(text):
+    text = text.strip()
+    if not re.search(r'[.!?]$', text):
+        text += '.'
+    return text
+
+def join_turns(texts):
+    """Join turn texts into one request, making sure every turn ends a sentence"""
+    return ' '.join(_as_sentence(text) for text in texts)
+
+def split_points(texts, words):
+    """
+    Millisecond positions where merged audio should be cut back into turns.
+
+    ``texts`` are the turn texts that went into ``join_turns`` and
+    ``words`` the [start_ms, end_ms, word] timings the TTS backend
+    reported for the result.
+    Each spoken word is located in the joined text in order, which tells
+    us which turn it belongs to; cuts fall halfway through the gap between
+    the last word of one turn and the first word of the next. Returns None
+    if some turn cannot be located, so the caller can fall back to one
+    request per turn.
+    """
+    joined = join_turns(texts).lower()
+
+    # Where each turn ends in the joined text
+    ends = []
+    position = 0
+    for text in texts:
+        position += len(_as_sentence(text)) + 1
+        ends.append(position)
+
+    first_start = [None] * len(texts)
+    last_end = [None] * len(texts)
+    cursor = 0
+    turn = 0
+    for start, end, word in words:
+        word = word.lower()
+        if not word:
+            continue
+        found = joined.find(word, cursor)
+        if found < 0:
+            continue
+        cursor = found + len(word)
+        while turn < len(texts) - 1 and found >= ends[turn]:
+            turn += 1
+
+        if first_start[turn] is None:
+            first_start[turn] = start
+        last_end[turn] = end
+
+    if None in first_start:
+        return None
+    return [(last_end[k] + first_start[k + 1]) / 2 for k in range(len(texts) - 1)]
+
+async def coalesce_turns(turns, key, max_chars=1000):
+    """
+    Group consecutive turns that share ``key(turn)`` into lists.
+
+    ``turns`` is an async iterable, so groups are yielded as soon as the
+    next turn (or the end of the script) closes them. Turns whose key is
+    None are always yielded alone, and a group never grows past
+    ``max_chars`` of text.
+    """
+    group = []
+    group_key = None
+    group_chars = 0
+    async for turn in turns:
+        turn_key = key(turn)
+        chars = len(turn.get('text', ''))
+        if group and (turn_key is None or turn_key != group_key or group_chars + chars > max_chars):
+            yield group
+            group = []
+        if not group:
+            group_key = turn_key
+            group_chars = 0
+        group.append(turn)
+        group_chars += chars
+    if group:
+        yield group
@@ -0,0 +1,60 @@
+# src/tts_cache.py
+import json
+import hashlib
+from src.file_cache import FileCache
+
+class TTSCache(FileCache):
+    """
+    Content-addressed on-disk cache of synthesized speech.
+
+    Keys hash the voice, rate, pitch and the exact text sent to the TTS
+    service, so recurring lines (closings, template openers) and every line
+    of an episode that is rebuilt after a crash or a mixing change are
+    served from disk. Writes are atomic renames, so concurrent runs never
+    see a partial file, and the cache is size-capped with least recently
+    used entries evicted first.
+    """
+
+    # Bump if the audio format requested from the TTS service changes
+    FORMAT_VERSION = 1
+    # File extensions of the audio formats backends return (see src/tts_backends.py)
+    AUDIO_FORMATS = ('mp3', 'wav')
+
+    def __init__(self, cache_dir='.cache/tts', max_bytes=500 * 1024 * 1024):
+        super().__init__(cache_dir, max_bytes, self.AUDIO_FORMATS, sidecars=('json',))
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def make_key(cls, voice, rate, pitch, text):
+        payload = '\x1f'.join([str(cls.FORMAT_VERSION), voice, rate, pitch, text])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get_meta(self, key):
+        """Metadata stored alongside the audio for ``key`` (e.g. turn split points), or None"""
+        try:
+            with open(self._path(key, 'json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def get(self, key, audio_format='mp3'):
+        """Return the cached audio bytes for ``key`` or None"""
+        data = self.read(key, audio_format)
+        if data is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return data
+
+    def put(self, key, data, meta=None, audio_format='mp3'):
+        """Store audio bytes (and optional JSON metadata), then evict if over the size cap"""
+        if not data:
+            return
+        try:
+            # Metadata first, so a reader that finds the audio also finds its metadata
+            if meta is not None:
+                self.write(key, 'json', json.dumps(meta))
+            self.write(key, audio_format, data)
+        except OSError as e:
+            print(f"[WARNING] Could not cache audio: {e}")
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Tests for the streaming top-k article selector"""
+
+import os
+import sys
+import random
+# Add the project root to the path (go up one directory from tests/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.article_selector import DiverseTopK
+
+def sort_and_walk(articles, k, per_source):
+    """The original buffered selection: sort everything, then apply the quota"""
+    selected, counts = [], {}
+    for article in sorted(articles, key=lambda a: a['score'], reverse=True):
+        if counts.get(article['source'], 0) < per_source:
+            selected.append(article)
+            counts[article['source']] = counts.get(article['source'], 0) + 1
+            if len(selected) >= k:
+                break
+    return selected
+
+def test_matches_buffered_selection():
+    rng = random.Random(7)
+    for _ in range(500):
+        articles = [{'id': i, 'score': rng.randint(0, 30), 'source': rng.choice('ABCDE')}
+                    for i in range(rng.randint(0, 60))]
+        k, per_source = rng.randint(1, 12), rng.randint(1, 3)
+        
+        selector = DiverseTopK(k=k, per_source=per_source)
+        selector.extend(articles)
+        
+        assert [a['id'] for a in selector.results()] == [a['id'] for a in sort_and_walk(articles, k, per_source)]
+
+def test_better_copy_of_a_story_replaces_the_selected_one():
+    selector = DiverseTopK(k=5, per_source=2)
+    selector.push({'title': 'wire copy', 'score': 10, 'source': 'Yahoo', 'cluster': 'story'})
+    selector.push({'title': 'original', 'score': 15, 'source': 'Rigzone', 'cluster': 'story'})
+    selector.push({'title': 'late copy', 'score': 12, 'source': 'MarketWatch', 'cluster': 'story'})
+    
+    assert [a['title'] for a in selector.results()] == ['original']
+
+def test_replacement_from_a_full_source_refills_the_selection():
+    selector = DiverseTopK(k=2, per_source=1)
+    selector.push({'title': 'A10', 'score': 10, 'source': 'A', 'cluster': 'x'})
+    selector.push({'title': 'B9', 'score': 9, 'source': 'B', 'cluster': 'y'})
+    selector.push({'title': 'C8', 'score': 8, 'source': 'C', 'cluster': 'z'})
+    
+    # B11 replaces A10's story and B9's quota slot; C8 was over capacity but now fits
+    assert selector.push({'title': 'B11', 'score': 11, 'source': 'B', 'cluster': 'x'})
+    assert [a['title'] for a in selector.results()] == ['B11', 'C8']
+    assert len(selector) == 2
+    
+    # The capacity still applies after a refill
+    selector.push({'title': 'D12', 'score': 12, 'source': 'D', 'cluster': 'w'})
+    assert [a['title'] for a in selector.results()] == ['D12', 'B11']
+
+if __name__ == "__main__":
+    test_matches_buffered_selection()
+    test_better_copy_of_a_story_replaces_the_selected_one()
+    test_replacement_from_a_full_source_refills_the_selection()
+    print("All article selector tests passed")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Tests for the SQLite article store"""
+
+import os
+import sys
+# Add the project root to the path (go up one directory from tests/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime, timedelta
+from src.article_store import ArticleStore
+
+def article(title, link, relevance=3, hours_ago=1, **extra):
+    return dict({
+        'title': title,
+        'summary': f"Summary of {title}",
+        'link': link,
+        'source': 'Test Wire',
+        'relevance': relevance,
+        'published': datetime.now() - timedelta(hours=hours_ago)
+    }, **extra)
+
+def age(store, key, days):
+    """Pretend an entry was first seen ``days`` ago"""
+    with store.conn:
+        store.conn.execute("UPDATE articles SET first_seen = ? WHERE link = ?",
+                           ((datetime.now() - timedelta(days=days)).timestamp(), key))
+
+def test_ingest_and_dedup_by_link_and_title():
+    store = ArticleStore(':memory:')
+    store.upsert(article("OPEC+ agrees to extend cuts", "https://a.example/1"))
+    assert store.count() == 1
+
+    assert store.is_known("https://a.example/1", "A different title")
+    # Same headline from another site, modulo case and punctuation
+    assert store.is_known("https://b.example/9", "opec+ agrees to extend cuts!")
+    assert not store.is_known("https://b.example/9", "Shale output hits record")
+
+    # Upserting the same link updates in place
+    store.upsert(article("OPEC+ agrees to extend cuts (updated)", "https://a.example/1", relevance=5))
+    assert store.count() == 1
+    assert next(store.recent())['relevance'] == 5
+
+def test_recurring_headline_is_new_after_title_window():
+    store = ArticleStore(':memory:', title_window_days=7)
+    store.upsert(article("Weekly EIA inventory report", "https://eia.example/week-1"))
+    assert store.is_known("https://eia.example/week-2", "Weekly EIA inventory report")
+
+    age(store, "https://eia.example/week-1", 8)
+    assert not store.is_known("https://eia.example/week-2", "Weekly EIA inventory report")
+    # Links stay known however old they are
+    assert store.is_known("https://eia.example/week-1", "Weekly EIA inventory report")
+
+    # A linkless entry is keyed by its title and comes back as a fresh story
+    store.upsert(article("Oil prices rise as OPEC+ meets", "", hours_ago=24 * 8))
+    key = store.key({'title': "Oil prices rise as OPEC+ meets", 'link': ''})
+    age(store, key, 8)
+    assert not store.is_known("", "Oil prices rise as OPEC+ meets")
+    store.upsert(article("Oil prices rise as OPEC+ meets", ""))
+    assert "Oil prices rise as OPEC+ meets" in [a['title'] for a in store.recent(hours=48)]
+
+def test_recent_filters_and_orders():
+    store = ArticleStore(':memory:')
+    store.upsert(article("Low", "https://x.example/low", relevance=1))
+    store.upsert(article("High", "https://x.example/high", relevance=6))
+    store.upsert(article("Irrelevant", "https://x.example/none", relevance=0))
+    store.upsert(article("Old", "https://x.example/old", relevance=9, hours_ago=72))
+    store.upsert(article("No link", "", relevance=2, dated=False))
+
+    recent = list(store.recent(hours=48, min_relevance=1))
+    assert [a['title'] for a in recent] == ["High", "No link", "Low"]
+    assert recent[1]['link'] == ''
+    assert recent[1]['dated'] is False
+    assert recent[0]['cluster'] == "https://x.example/high"
+
+if __name__ == "__main__":
+    test_ingest_and_dedup_by_link_and_title()
+    test_recurring_headline_is_new_after_title_window()
+    test_recent_filters_and_orders()
+    print("All article store tests passed")
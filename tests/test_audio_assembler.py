@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Tests for the linear-time episode audio assembler"""
+
+import os
+import sys
+import numpy as np
+from pydub import AudioSegment
+# Add the project root to the path (go up one directory from tests/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.audio_assembler import AudioAssembler
+
+def tone(duration_ms, frame_rate=24000, value=1000):
+    samples = np.full(int(frame_rate * duration_ms / 1000), value, dtype=np.int16)
+    return AudioSegment(samples.tobytes(), sample_width=2, frame_rate=frame_rate, channels=1)
+
+def test_segments_and_pauses_land_in_place():
+    assembler = AudioAssembler()
+    assembler.add(tone(200, value=1000))
+    assembler.add_silence(300)
+    assembler.add(tone(100, value=-500))
+    
+    audio = assembler.build(lead_in_ms=50, tail_ms=150)
+    samples = np.frombuffer(audio.raw_data, dtype=np.int16)
+    
+    assert audio.frame_rate == 24000
+    assert len(audio) == 50 + 200 + 300 + 100 + 150
+    assert not samples[:1200].any()
+    assert (samples[1200:6000] == 1000).all()
+    assert not samples[6000:13200].any()
+    assert (samples[13200:15600] == -500).all()
+    assert not samples[15600:].any()
+
+def test_mixed_formats_use_the_highest_quality():
+    assembler = AudioAssembler()
+    assembler.add(tone(100, frame_rate=16000))
+    assembler.add(tone(100, frame_rate=24000).set_channels(2))
+    
+    audio = assembler.build()
+    
+    assert (audio.frame_rate, audio.channels, audio.sample_width) == (24000, 2, 2)
+    assert len(audio) == 200
+
+if __name__ == "__main__":
+    test_segments_and_pauses_land_in_place()
+    test_mixed_formats_use_the_highest_quality()
+    print("All audio assembler tests passed")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Tests for the per-episode build journal used by --resume"""
+
+import os
+import sys
+import asyncio
+import tempfile
+# Add the project root to the path (go up one directory from tests/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.build_journal import BuildJournal
+
+SCRIPT = [
+    {'speaker': 'host1', 'text': 'Welcome to the show.', 'emotion': 'neutral'},
+    {'speaker': 'host1', 'text': 'Oil is up today.', 'emotion': 'neutral'},
+    {'speaker': 'host2', 'text': 'Big news!', 'emotion': 'excited'}
+]
+
+def test_record_and_resume():
+    with tempfile.TemporaryDirectory() as root:
+        journal = BuildJournal('2025-01-01', root=root)
+        assert journal.script is None
+        journal.save_script(SCRIPT)
+
+        # Two turns cut from one merged request share a file; the third failed
+        merged = b'merged-audio'
+        journal.record(0, SCRIPT[:2], [(merged, 0, 900, [[0, 400, 'Welcome']]), (merged, 900, None, [])])
+        journal.record(2, SCRIPT[2:], [None])
+
+        resumed = BuildJournal('2025-01-01', root=root)
+        assert resumed.script == SCRIPT
+        assert resumed.lookup(0, SCRIPT[0]) == (merged, 0, 900, [[0, 400, 'Welcome']])
+        assert resumed.lookup(1, SCRIPT[1]) == (merged, 900, None, [])
+        assert resumed.lookup(2, SCRIPT[2]) is None
+        assert len(os.listdir(resumed.audio_dir)) == 1
+
+        resumed.reset()
+        assert resumed.script is None and resumed.segments == {}
+        assert BuildJournal('2025-01-01', root=root).lookup(0, SCRIPT[0]) is None
+
+def test_changed_turn_is_not_reused():
+    with tempfile.TemporaryDirectory() as root:
+        journal = BuildJournal('2025-01-01', root=root)
+        journal.record(0, SCRIPT[:1], [(b'audio', 0, None, [])])
+
+        edited = dict(SCRIPT[0], text='Welcome back to the show.')
+        assert journal.lookup(0, edited) is None
+        assert journal.lookup(0, dict(SCRIPT[0], emotion='excited')) is None
+        # Same turn at a different position is not a match either
+        assert journal.lookup(1, SCRIPT[0]) is None
+        assert journal.lookup(0, SCRIPT[0]) == (b'audio', 0, None, [])
+
+def test_torn_last_line_is_skipped():
+    with tempfile.TemporaryDirectory() as root:
+        journal = BuildJournal('2025-01-01', root=root)
+        journal.record(0, SCRIPT[:1], [(b'audio', 0, None, [])])
+        with open(os.path.join(journal.path, 'segments.jsonl'), 'a', encoding='utf-8') as f:
+            f.write('{"file": "0001.mp3", "tu')
+
+        resumed = BuildJournal('2025-01-01', root=root)
+        assert list(resumed.segments) == [0]
+
+def test_journal_write_errors_do_not_fail_the_build():
+    from src.podcast_creator import MultiVoicePodcastCreator
+
+    class BrokenJournal:
+        script = None
+
+        def lookup(self, index, turn):
+            return None
+
+        def save_script(self, script):
+            raise OSError("No space left on device")
+
+        def record(self, first_index, group, pieces, audio_format='mp3'):
+            raise OSError("No space left on device")
+
+    creator = MultiVoicePodcastCreator()
+
+    async def speech(text, speaker, emotion, words=None):
+        return b'audio'
+
+    creator._generate_speech_with_retry = speech
+    decoded = []
+
+    def decode(data):
+        # Stop after synthesis: assembly and export are not what this test is about
+        decoded.append(data)
+        raise ValueError("not real audio")
+
+    creator._decode = decode
+
+    try:
+        asyncio.run(creator.create_podcast(SCRIPT[:1], os.path.join(tempfile.gettempdir(), 'unused.mp3'),
+                                           journal=BrokenJournal()))
+        assert False, "expected no audio"
+    except OSError:
+        assert False, "journal error escaped"
+    except Exception as e:
+        assert str(e) == "No audio segments were generated"
+    assert decoded == [b'audio']
+
+if __name__ == "__main__":
+    test_record_and_resume()
+    test_changed_turn_is_not_reused()
+    test_torn_last_line_is_skipped()
+    test_journal_write_errors_do_not_fail_the_build()
+    print("All build journal tests passed")
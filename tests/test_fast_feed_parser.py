@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Tests for the lxml feed parser against feedparser's output"""
+
+import os
+import sys
+import feedparser
+# Add the project root to the path (go up one directory from tests/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fast_feed_parser import parse_feed, FeedParseError
+from src.news_collector import SmartNewsCollector
+
+RSS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/">
+  <channel>
+    <title>Oil Wire</title>
+    <link>https://oilwire.example/</link>
+    <item>
+      <title>OPEC+ extends output cuts</title>
+      <link>https://oilwire.example/opec</link>
+      <description>Producers agreed to keep barrels off the market.</description>
+      <pubDate>Tue, 14 Jan 2025 09:30:00 +0100</pubDate>
+    </item>
+    <item>
+      <title>Permian rig count &amp; shale output</title>
+      <link>https://oilwire.example/permian</link>
+      <description><![CDATA[Rig count fell by three.]]></description>
+      <pubDate>Mon, 13 Jan 2025 18:00:00 GMT</pubDate>
+    </item>
+    <item>
+      <description>Entries without a title are skipped</description>
+    </item>
+  </channel>
+</rss>"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Energy Desk</title>
+  <entry>
+    <title>LNG exports hit a record</title>
+    <link rel="enclosure" href="https://energy.example/lng.mp3"/>
+    <link rel="alternate" href="https://energy.example/lng"/>
+    <summary>Gulf Coast terminals ran at full capacity.</summary>
+    <published>2025-01-14T06:15:00-05:00</published>
+    <updated>2025-01-14T08:00:00Z</updated>
+  </entry>
+</feed>"""
+
+def reference(content):
+    """What the collector gets from feedparser for the same document"""
+    collector = SmartNewsCollector.__new__(SmartNewsCollector)
+    collector.entries_per_feed = 10
+    return collector._normalize_entries(feedparser.parse(content))
+
+def test_rss_matches_feedparser():
+    title, entries = parse_feed(RSS)
+    assert (title, entries) == reference(RSS)
+    assert title == "Oil Wire"
+    assert [e['title'] for e in entries] == ["OPEC+ extends output cuts", "Permian rig count & shale output"]
+    assert entries[0]['published_parsed'] == [2025, 1, 14, 8, 30, 0]
+    assert entries[1]['summary'] == "Rig count fell by three."
+
+def test_dublin_core_date_is_a_fallback():
+    # feedparser only exposes dc:date as 'updated'; the collector wants any date it can get
+    content = RSS.replace(b"<pubDate>Mon, 13 Jan 2025 18:00:00 GMT</pubDate>",
+                          b"<dc:date>2025-01-13T18:00:00Z</dc:date>")
+    _, entries = parse_feed(content)
+    assert entries[1]['published'] == "2025-01-13T18:00:00Z"
+    assert entries[1]['published_parsed'] == [2025, 1, 13, 18, 0, 0]
+
+def test_atom_matches_feedparser():
+    title, entries = parse_feed(ATOM)
+    assert (title, entries) == reference(ATOM)
+    assert entries[0]['link'] == "https://energy.example/lng"
+    assert entries[0]['published_parsed'] == [2025, 1, 14, 11, 15, 0]
+
+def test_max_entries_stops_early():
+    title, entries = parse_feed(RSS, max_entries=1)
+    assert len(entries) == 1
+
+def test_malformed_feed_falls_back_to_feedparser():
+    broken = RSS.replace(b"</channel>", b"")
+    for content in (broken, b"<html><body>Not a feed</body></html>"):
+        try:
+            parse_feed(content)
+            assert False, "expected FeedParseError"
+        except FeedParseError:
+            pass
+
+    # The collector retries with feedparser, which recovers what it can
+    collector = SmartNewsCollector.__new__(SmartNewsCollector)
+    collector.entries_per_feed = 10
+    collector.fast_parser = True
+    title, entries = collector._parse(broken)
+    assert title == "Oil Wire"
+    assert entries[0]['link'] == "https://oilwire.example/opec"
+
+if __name__ == "__main__":
+    test_rss_matches_feedparser()
+    test_dublin_core_date_is_a_fallback()
+    test_atom_matches_feedparser()
+    test_max_entries_stops_early()
+    test_malformed_feed_falls_back_to_feedparser()
+    print("All fast feed parser tests passed")
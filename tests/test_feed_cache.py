@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Tests for conditional-GET feed caching (ETag / Last-Modified and 304 reuse)"""
+
+import os
+import sys
+import tempfile
+# Add the project root to the path (go up one directory from tests/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.news_collector as news_collector
+from src.feed_cache import FeedCache
+from src.news_collector import SmartNewsCollector
+
+FEED = "https://oilwire.example/rss"
+RSS = b"""<?xml version="1.0"?><rss version="2.0"><channel><title>Oil Wire</title>
+<item><title>OPEC+ extends cuts</title><link>https://oilwire.example/opec</link>
+<description>Barrels stay off the market.</description></item></channel></rss>"""
+
+class FakeResponse:
+    def __init__(self, status_code, body=b'', headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(f"HTTP {self.status_code}")
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.body), chunk_size):
+            yield self.body[i:i + chunk_size]
+
+    def close(self):
+        pass
+
+def test_validators_round_trip():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = FeedCache(directory)
+        assert cache.get(FEED) is None
+        assert cache.conditional_headers(FEED) == {}
+
+        entries = [{'title': 'OPEC+ extends cuts', 'link': 'https://oilwire.example/opec'}]
+        cache.put(FEED, "Oil Wire", entries, etag='"abc"', last_modified='Tue, 14 Jan 2025 09:00:00 GMT')
+
+        record = FeedCache(directory).get(FEED)
+        assert record['title'] == "Oil Wire" and record['entries'] == entries
+        assert cache.conditional_headers(FEED) == {
+            'If-None-Match': '"abc"',
+            'If-Modified-Since': 'Tue, 14 Jan 2025 09:00:00 GMT'
+        }
+
+        # Only the validators the server sent are replayed
+        cache.put(FEED, "Oil Wire", entries, last_modified='Wed, 15 Jan 2025 09:00:00 GMT')
+        assert cache.conditional_headers(FEED) == {'If-Modified-Since': 'Wed, 15 Jan 2025 09:00:00 GMT'}
+        assert cache.get("https://other.example/rss") is None
+
+def test_not_modified_reuses_cached_entries():
+    with tempfile.TemporaryDirectory() as directory:
+        collector = SmartNewsCollector(feed_cache=FeedCache(directory), fast_parser=True)
+        requests_seen = []
+        responses = [
+            FakeResponse(200, RSS, {'ETag': '"v1"'}),
+            FakeResponse(304),
+        ]
+
+        def fake_get(url, headers=None, **kwargs):
+            requests_seen.append(headers)
+            return responses.pop(0)
+
+        original_get = news_collector.requests.get
+        news_collector.requests.get = fake_get
+        try:
+            first = collector._fetch_feed(FEED)
+            second = collector._fetch_feed(FEED)
+        finally:
+            news_collector.requests.get = original_get
+
+        assert 'If-None-Match' not in requests_seen[0]
+        assert requests_seen[1]['If-None-Match'] == '"v1"'
+        assert first[0] == "Oil Wire" and first[1][0]['title'] == "OPEC+ extends cuts"
+        assert second == first
+
+if __name__ == "__main__":
+    test_validators_round_trip()
+    test_not_modified_reuses_cached_entries()
+    print("All feed cache tests passed")
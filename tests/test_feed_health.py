@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Tests for the per-feed circuit breaker and adaptive poll interval"""
+
+import os
+import sys
+import tempfile
+# Add the project root to the path (go up one directory from tests/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.feed_health import FeedHealthRegistry
+
+FEED = "https://example.com/feed"
+
+def registry(directory, **options):
+    return FeedHealthRegistry(os.path.join(directory, 'health.json'), **options)
+
+def test_circuit_opens_after_threshold_and_probes_with_backoff():
+    with tempfile.TemporaryDirectory() as directory:
+        health = registry(directory, failure_threshold=3, base_backoff_minutes=30)
+        now = 1000000.0
+
+        for _ in range(2):
+            health.record_failure(FEED, now=now)
+        assert health.should_fetch(FEED, now=now) == (True, None)
+
+        health.record_failure(FEED, now=now)
+        assert health.should_fetch(FEED, now=now + 60) == (False, 'circuit open')
+
+        # Half-open: once the backoff expires, one probe is allowed
+        probe = now + 30 * 60
+        assert health.should_fetch(FEED, now=probe) == (True, None)
+
+        # A failed probe doubles the backoff
+        health.record_failure(FEED, now=probe)
+        assert health.should_fetch(FEED, now=probe + 59 * 60) == (False, 'circuit open')
+        assert health.should_fetch(FEED, now=probe + 60 * 60) == (True, None)
+
+        # A successful probe closes the circuit
+        health.record_success(FEED, 0.2, now=probe + 60 * 60)
+        health.record_failure(FEED, now=probe + 61 * 60)
+        assert health.should_fetch(FEED, now=probe + 61 * 60) == (True, None)
+        assert health.success_rate(FEED) == 1 / 6
+
+def test_poll_interval_follows_content_changes():
+    with tempfile.TemporaryDirectory() as directory:
+        health = registry(directory, max_poll_hours=72)
+        hour = 3600.0
+        start = 1000000.0
+
+        health.record_success(FEED, 0.1, digest='a', now=start)
+        assert health.should_fetch(FEED, now=start + 1) == (True, None)
+
+        # Unchanged content does not shorten the interval; a change 4h later sets it
+        health.record_success(FEED, 0.1, digest='a', now=start + 2 * hour)
+        health.record_success(FEED, 0.1, digest='b', now=start + 4 * hour)
+        # Polls about twice per observed update cycle
+        assert health.should_fetch(FEED, now=start + 5 * hour) == (False, 'not due')
+        assert health.should_fetch(FEED, now=start + 6 * hour) == (True, None)
+
+        # A slower change pulls the weighted interval up
+        health.record_success(FEED, 0.1, digest='c', now=start + 14 * hour)
+        interval = health.records[FEED]['change_interval']
+        assert 4 * hour < interval < 10 * hour
+        assert health.records[FEED]['next_poll'] == start + 14 * hour + interval / 2
+
+def test_records_persist_across_runs():
+    with tempfile.TemporaryDirectory() as directory:
+        health = registry(directory, failure_threshold=1)
+        health.record_failure(FEED, latency=2.0, now=100.0)
+        health.record_success("https://other.example/rss", 0.5, digest='x', now=100.0)
+        health.save()
+
+        reloaded = registry(directory, failure_threshold=1)
+        assert reloaded.records == health.records
+        assert reloaded.should_fetch(FEED, now=101.0) == (False, 'circuit open')
+
+        # A corrupt file starts over instead of failing the run
+        with open(os.path.join(directory, 'health.json'), 'w') as f:
+            f.write('{not json')
+        assert registry(directory).records == {}
+
+if __name__ == "__main__":
+    test_circuit_opens_after_threshold_and_probes_with_backoff()
+    test_poll_interval_follows_content_changes()
+    test_records_persist_across_runs()
+    print("All feed health tests passed")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Tests for the shared atomic write helper and size-capped file cache"""
+
+import os
+import sys
+import time
+import tempfile
+# Add the project root to the path (go up one directory from tests/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.file_cache import FileCache, atomic_write
+from src.script_cache import ScriptCache
+from src.tts_cache import TTSCache
+
+def test_atomic_write_replaces_without_leftovers():
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, 'data.json')
+        atomic_write(path, '{"a": 1}')
+        atomic_write(path, b'{"a": 2}')
+        with open(path, 'rb') as f:
+            assert f.read() == b'{"a": 2}'
+        assert os.listdir(root) == ['data.json']
+
+        try:
+            atomic_write(os.path.join(root, 'missing', 'data.json'), 'x')
+            assert False, "expected OSError"
+        except OSError:
+            pass
+
+def test_least_recently_used_evicted_with_sidecars():
+    with tempfile.TemporaryDirectory() as root:
+        cache = FileCache(root, max_bytes=100, extensions=('bin',), sidecars=('json',))
+        for n, key in enumerate(('a', 'b', 'c')):
+            cache.write(key, 'json', '{}')
+            cache.write(key, 'bin', b'x' * 10)
+            os.utime(os.path.join(root, f"{key}.bin"), (n, n))
+
+        # 'a' is read, so 'b' is now the least recently used; sidecars do not count towards the cap
+        assert cache.read('a', 'bin') == b'x' * 10
+        cache.max_bytes = 25
+        cache.evict()
+        assert sorted(os.listdir(root)) == ['a.bin', 'a.json', 'c.bin', 'c.json']
+        assert cache.read('b', 'bin') is None
+
+        assert cache.invalidate('a') == 1
+        assert cache.invalidate() == 1
+        assert os.listdir(root) == []
+
+def test_caches_round_trip():
+    with tempfile.TemporaryDirectory() as root:
+        scripts = ScriptCache(os.path.join(root, 'scripts'))
+        key = scripts.make_key([{'title': 'Oil'}], None, 1, {})
+        scripts.put(key, [{'speaker': 'host1', 'text': 'Héllo'}])
+        assert scripts.get(key) == [{'speaker': 'host1', 'text': 'Héllo'}]
+        assert scripts.get('missing') is None
+
+        tts = TTSCache(os.path.join(root, 'tts'), max_bytes=10)
+        tts.put('one', b'12345678', meta={'words': [[0, 1, 'a']]})
+        assert tts.get('one') == b'12345678' and tts.get_meta('one') == {'words': [[0, 1, 'a']]}
+        time.sleep(0.01)
+        tts.put('two', b'12345678', audio_format='wav')
+        # Over the cap: the older entry and its metadata go
+        assert tts.get('one') is None and tts.get_meta('one') is None
+        assert tts.get('two', 'wav') == b'12345678'
+        assert (tts.hits, tts.misses) == (2, 1)
+
+if __name__ == "__main__":
+    test_atomic_write_replaces_without_leftovers()
+    test_least_recently_used_evicted_with_sidecars()
+    test_caches_round_trip()
+    print("All file cache tests passed")
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Tests for the incremental JSON array parser used by streaming script generation"""
+
+import os
+import sys
+import json
+# Add the project root to the path (go up one directory from tests/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.json_stream import IncrementalJSONArrayParser
+
+TURNS = [
+    {"speaker": "host1", "text": "Welcome back! [upbeat] Brent is {up}, \"finally\".", "emotion": "excited"},
+    {"speaker": "host2", "text": "[laughs] Wait\\what? OPEC+ again?", "emotion": "amused"},
+    {"speaker": "host1", "text": "Here's the thing...", "emotion": "thoughtful"}
+]
+
+def test_yields_each_turn_as_soon_as_it_completes():
+    text = "```json\n" + json.dumps(TURNS, indent=2) + "\n```"
+    parser = IncrementalJSONArrayParser()
+    
+    seen = []
+    for i in range(0, len(text), 7):
+        for turn in parser.feed(text[i:i + 7]):
+            # The turn is emitted before the rest of the array has arrived
+            assert i < len(text) - 7 or turn == TURNS[-1]
+            seen.append(turn)
+    
+    assert seen == TURNS
+    assert parser.finished
+
+def test_malformed_objects_are_skipped():
+    parser = IncrementalJSONArrayParser()
+    
+    assert parser.feed('[{"speaker": "host1"}, {"speaker": ') == [{"speaker": "host1"}]
+    assert parser.feed('"host2",}, {"speaker": "host1"}]') == [{"speaker": "host1"}]
+    assert parser.skipped == 1
+
+def test_brackets_in_preamble_are_not_the_array():
+    text = "Here [is] the script [v2]:\n[\n  " + json.dumps(TURNS)[1:]
+    for size in (1, 5, len(text)):
+        parser = IncrementalJSONArrayParser()
+        seen = []
+        for i in range(0, len(text), size):
+            seen.extend(parser.feed(text[i:i + size]))
+        assert seen == TURNS
+        assert parser.finished
+
+if __name__ == "__main__":
+    test_yields_each_turn_as_soon_as_it_completes()
+    test_malformed_objects_are_skipped()
+    test_brackets_in_preamble_are_not_the_array()
+    print("All JSON stream tests passed")
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Tests for the single-pass keyword matcher used in relevance scoring"""
+
+import os
+import sys
+# Add the project root to the path (go up one directory from tests/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.keyword_matcher import KeywordMatcher
+
+KEYWORDS = {
+    'critical': {'words': ['drilling', 'horizontal drilling'], 'weight': 3},
+    'important': {'words': ['OPEC', 'natural gas', 'gas processing'], 'weight': 2},
+    'relevant': {'words': ['E&P', 'drilling technology', 'API'], 'weight': 1}
+}
+
+def test_overlapping_keywords_all_count():
+    matcher = KeywordMatcher(KEYWORDS)
+    
+    # "horizontal drilling" (3) + "drilling" (3) + "drilling technology" (1) + "drilling" (3)
+    assert matcher.scan("Horizontal drilling and drilling technology")[0] == 10
+    # "natural gas" and "gas processing" overlap on "gas"
+    assert matcher.scan("natural gas processing")[0] == 4
+
+def test_word_boundaries_and_metacharacters():
+    matcher = KeywordMatcher(KEYWORDS)
+    
+    assert matcher.scan("Mid-size E&P firms")[0] == 1
+    assert matcher.scan("OPEC+ meeting")[0] == 2
+    # "API" must not match inside longer words
+    assert matcher.scan("rapid capital")[0] == 0
+
+def test_exclusions_short_circuit():
+    matcher = KeywordMatcher(KEYWORDS, ['solar', 'wind power'])
+    
+    assert matcher.scan("OPEC drilling meets solar boom") == (0, 'solar')
+    assert matcher.scan("Onshore wind powered rigs")[1] == 'wind power'
+    assert matcher.scan("OPEC drilling")[1] is None
+
+if __name__ == "__main__":
+    test_overlapping_keywords_all_count()
+    test_word_boundaries_and_metacharacters()
+    test_exclusions_short_circuit()
+    print("All keyword matcher tests passed")
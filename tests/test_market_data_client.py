@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Offline tests for the cached, rate-limited Alpha Vantage client"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import requests
+# Add the project root to the path (go up one directory from tests/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.market_data import MarketDataClient, TokenBucket
+from src.price_history import PriceHistory
+
+SERIES = {'name': 'Crude Oil Prices WTI', 'data': [{'date': '2025-01-14', 'value': '78.50'},
+                                                   {'date': '2025-01-13', 'value': '77.00'}]}
+STALE = {'name': 'Crude Oil Prices WTI', 'data': [{'date': '2025-01-10', 'value': '75.00'}]}
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+def client(directory, responses, **options):
+    """Client whose session.get answers from ``responses`` (payloads or exceptions), in order"""
+    market = MarketDataClient(api_key='demo', cache_dir=os.path.join(directory, 'market'),
+                              history=PriceHistory(os.path.join(directory, 'prices')), **options)
+    market.calls = []
+
+    def fake_get(url, params=None, timeout=None):
+        market.calls.append(params['function'])
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return FakeResponse(response)
+
+    market.session.get = fake_get
+    return market
+
+def write_cache(market, function, payload, age_hours):
+    path = market._cache_path(function)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f)
+    mtime = time.time() - age_hours * 3600
+    os.utime(path, (mtime, mtime))
+
+def test_token_bucket_limits_and_refills():
+    bucket = TokenBucket(capacity=2, period=60.0)
+    assert bucket.acquire(timeout=0) and bucket.acquire(timeout=0)
+    assert not bucket.acquire(timeout=0.01)
+
+    # One token every 50ms
+    fast = TokenBucket(capacity=1, period=0.05)
+    assert fast.acquire(timeout=0)
+    started = time.monotonic()
+    assert fast.acquire(timeout=1)
+    assert 0.02 < time.monotonic() - started < 0.5
+
+def test_fresh_cache_skips_the_api():
+    with tempfile.TemporaryDirectory() as directory:
+        market = client(directory, [])
+        write_cache(market, 'WTI', SERIES, age_hours=1)
+        assert market.fetch_series('WTI') == SERIES
+        assert market.calls == []
+
+def test_success_is_cached():
+    with tempfile.TemporaryDirectory() as directory:
+        market = client(directory, [SERIES])
+        assert market.fetch_series('WTI') == SERIES
+        assert market._read_cache('WTI')[0] == SERIES
+        assert market.fetch_series('WTI') == SERIES
+        assert market.calls == ['WTI']
+
+def test_throttle_notes_serve_stale_data():
+    for message in ('Note', 'Information'):
+        with tempfile.TemporaryDirectory() as directory:
+            market = client(directory, [{message: 'Thank you for using Alpha Vantage!'}] * 2)
+            assert market.fetch_series('WTI') is None
+
+            write_cache(market, 'WTI', STALE, age_hours=24)
+            assert market.fetch_series('WTI') == STALE
+            # The throttle message never replaces the last good payload
+            assert market._read_cache('WTI')[0] == STALE
+
+def test_error_message_serves_stale_data():
+    with tempfile.TemporaryDirectory() as directory:
+        market = client(directory, [{'Error Message': 'Invalid API call.'}])
+        write_cache(market, 'BRENT', STALE, age_hours=24)
+        assert market.fetch_series('BRENT') == STALE
+        assert market._read_cache('BRENT')[0] == STALE
+
+def test_network_error_serves_stale_data():
+    with tempfile.TemporaryDirectory() as directory:
+        market = client(directory, [requests.exceptions.ConnectionError("unreachable"), ValueError("not JSON")])
+        write_cache(market, 'WTI', STALE, age_hours=24)
+        assert market.fetch_series('WTI') == STALE
+        assert market.fetch_series('WTI') == STALE
+        assert market.calls == ['WTI', 'WTI']
+
+def test_local_rate_limit_serves_stale_data():
+    with tempfile.TemporaryDirectory() as directory:
+        market = client(directory, [SERIES], calls_per_minute=1, timeout=0.01)
+        assert market.fetch_series('WTI') == SERIES
+
+        # The bucket is empty, so BRENT never reaches the API
+        write_cache(market, 'BRENT', STALE, age_hours=24)
+        assert market.fetch_series('BRENT') == STALE
+        assert market.calls == ['WTI']
+
+if __name__ == "__main__":
+    test_token_bucket_limits_and_refills()
+    test_fresh_cache_skips_the_api()
+    test_success_is_cached()
+    test_throttle_notes_serve_stale_data()
+    test_error_message_serves_stale_data()
+    test_network_error_serves_stale_data()
+    test_local_rate_limit_serves_stale_data()
+    print("All market data client tests passed")
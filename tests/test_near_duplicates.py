@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""Tests for MinHash-LSH near-duplicate story detection"""
+
+import os
+import sys
+# Add the project root to the path (go up one directory from tests/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.near_duplicates import NearDuplicateIndex
+
+BODY = ("Oil prices rose on Monday after OPEC+ signaled it could deepen production cuts "
+        "at its meeting next week, as traders weighed weak demand data from China.")
+
+def test_syndicated_headlines_cluster_together():
+    index = NearDuplicateIndex()
+    
+    first = index.find_or_add('rigzone', index.signature(f"Oil climbs as OPEC+ signals deeper cuts {BODY}"))
+    second = index.find_or_add('yahoo', index.signature(f"Crude rallies after OPEC+ hints at cuts {BODY}"))
+    
+    assert first == 'rigzone'
+    assert second == 'rigzone'
+    assert len(index) == 1
+
+def test_different_stories_stay_separate():
+    index = NearDuplicateIndex()
+    
+    index.find_or_add('opec', index.signature(BODY))
+    other = index.find_or_add('permian', index.signature(
+        "Exxon Mobil said production in the Permian Basin hit a record in the third quarter."
+    ))
+    
+    assert other == 'permian'
+    assert len(index) == 2
+
+if __name__ == "__main__":
+    test_syndicated_headlines_cluster_together()
+    test_different_stories_stay_separate()
+    print("All near-duplicate tests passed")
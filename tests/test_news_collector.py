@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Tests for the concurrent feed fetch deadlines"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+# Add the project root to the path (go up one directory from tests/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.news_collector as news_collector
+from src.feed_cache import FeedCache
+from src.feed_health import FeedHealthRegistry
+from src.news_collector import SmartNewsCollector
+
+RSS = b"""<?xml version="1.0"?><rss version="2.0"><channel><title>Oil Wire</title>
+<item><title>OPEC+ extends cuts</title><link>https://oilwire.example/opec</link>
+<description>Barrels stay off the market.</description></item></channel></rss>"""
+
+class SlowResponse:
+    """Streams ``body`` in small chunks, sleeping ``delay`` seconds before each one"""
+
+    def __init__(self, body, delay=0.0):
+        self.status_code = 200
+        self.body = body
+        self.delay = delay
+        self.headers = {}
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.body), 64):
+            time.sleep(self.delay)
+            yield self.body[i:i + 64]
+
+    def close(self):
+        pass
+
+def collector(directory, feeds, fake_get, feed_timeout=0.2):
+    news = SmartNewsCollector(max_workers=len(feeds), feed_timeout=feed_timeout,
+                              feed_cache=FeedCache(os.path.join(directory, 'feeds')),
+                              health=FeedHealthRegistry(os.path.join(directory, 'health.json')),
+                              fast_parser=True)
+    news.feeds = feeds
+    news_collector.requests.get = fake_get
+    return news
+
+def test_slow_download_hits_the_feed_deadline():
+    with tempfile.TemporaryDirectory() as directory:
+        original_get = news_collector.requests.get
+        try:
+            news = collector(directory, ["https://slow.example/rss"],
+                             lambda url, **kwargs: SlowResponse(RSS, delay=0.05))
+            try:
+                news._fetch_feed("https://slow.example/rss")
+                assert False, "expected TimeoutError"
+            except TimeoutError:
+                pass
+        finally:
+            news_collector.requests.get = original_get
+
+def test_stalled_feed_does_not_block_collection():
+    release = threading.Event()
+
+    def fake_get(url, **kwargs):
+        # A DNS lookup or connect that never returns, as far as the deadline is concerned
+        if 'stalled' in url:
+            release.wait(10)
+            raise ConnectionError("gave up")
+        return SlowResponse(RSS)
+
+    with tempfile.TemporaryDirectory() as directory:
+        original_get = news_collector.requests.get
+        try:
+            news = collector(directory, ["https://fast.example/rss", "https://stalled.example/rss"], fake_get)
+            started = time.monotonic()
+            fetched = [url for url, _, _ in news._fetch_feeds()]
+            elapsed = time.monotonic() - started
+        finally:
+            release.set()
+            news_collector.requests.get = original_get
+
+        assert fetched == ["https://fast.example/rss"]
+        assert elapsed < 2
+        reloaded = FeedHealthRegistry(os.path.join(directory, 'health.json'))
+        assert reloaded.success_rate("https://fast.example/rss") == 1
+        assert reloaded.success_rate("https://stalled.example/rss") == 0
+
+def test_slow_consumer_keeps_finished_feeds():
+    feeds = ["https://one.example/rss", "https://two.example/rss"]
+    with tempfile.TemporaryDirectory() as directory:
+        original_get = news_collector.requests.get
+        try:
+            news = collector(directory, feeds, lambda url, **kwargs: SlowResponse(RSS))
+            fetched = []
+            for url, _, _ in news._fetch_feeds():
+                fetched.append(url)
+                # Longer than the whole fetch deadline; the other feed is already done
+                time.sleep(0.5)
+        finally:
+            news_collector.requests.get = original_get
+
+        assert sorted(fetched) == feeds
+
+if __name__ == "__main__":
+    test_slow_download_hits_the_feed_deadline()
+    test_stalled_feed_does_not_block_collection()
+    test_slow_consumer_keeps_finished_feeds()
+    print("All news collector tests passed")
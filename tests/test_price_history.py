@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Tests for the append-only local price history store"""
+
+import os
+import sys
+import tempfile
+# Add the project root to the path (go up one directory from tests/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import date
+from src.price_history import PriceHistory
+
+def points(*pairs):
+    return [{'date': day, 'value': value} for day, value in pairs]
+
+def test_update_appends_only_newer_points():
+    with tempfile.TemporaryDirectory() as data_dir:
+        history = PriceHistory(data_dir)
+        dates, prices = history.load('WTI')
+        assert len(dates) == 0 and len(prices) == 0
+
+        # Any order; "." and unparseable values are skipped
+        added = history.update('WTI', points(('2025-01-03', '72.0'), ('2025-01-01', '70.0'),
+                                             ('2025-01-02', '.'), ('bad', '1')))
+        assert added == 2
+        assert history.update('WTI', points(('2025-01-01', '99.0'), ('2025-01-03', '99.0'))) == 0
+        assert history.update('WTI', points(('2025-01-04', '73.5'))) == 1
+
+        dates, prices = history.load('wti')
+        assert list(prices) == [70.0, 72.0, 73.5]
+        assert history.latest('WTI') == (date(2025, 1, 4), 73.5)
+        assert round(history.change('WTI', 3), 3) == 5.0
+
+def test_torn_write_is_dropped_before_next_append():
+    with tempfile.TemporaryDirectory() as data_dir:
+        history = PriceHistory(data_dir)
+        history.update('WTI', points(('2025-01-01', '70.0'), ('2025-01-02', '71.0')))
+
+        # Crash after the price was appended but before its date was
+        dates_path, prices_path = history._paths('WTI')
+        with open(prices_path, 'ab') as f:
+            f.write(b'\x00' * 8 + b'\x01\x02')
+        dates, prices = history.load('WTI')
+        assert list(prices) == [70.0, 71.0]
+
+        assert history.update('WTI', points(('2025-01-03', '99.0'))) == 1
+        dates, prices = history.load('WTI')
+        assert [str(date.fromordinal(date(1970, 1, 1).toordinal() + int(d))) for d in dates] == \
+            ['2025-01-01', '2025-01-02', '2025-01-03']
+        assert list(prices) == [70.0, 71.0, 99.0]
+        assert os.path.getsize(dates_path) == 3 * 4
+        assert os.path.getsize(prices_path) == 3 * 8
+
+if __name__ == "__main__":
+    test_update_appends_only_newer_points()
+    test_torn_write_is_dropped_before_next_append()
+    print("All price history tests passed")
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Tests for the prompt token budgeter used to build the script prompt"""
+
+import os
+import sys
+# Add the project root to the path (go up one directory from tests/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.prompt_budget import PromptBudgeter, clean_text, estimate_tokens
+
+def make_article(title, summary, body=''):
+    return {'title': title, 'summary': summary, 'body': body, 'source': 'Test'}
+
+def test_clean_text_strips_feed_html():
+    raw = '<div><p>OPEC+ &amp; allies   agreed\n to <b>extend</b> cuts.</p></div>'
+    assert clean_text(raw) == 'OPEC+ & allies agreed to extend cuts.'
+
+def test_repeated_summaries_are_dropped():
+    summary = 'OPEC+ agreed on Sunday to extend its output cuts into next year as prices slide'
+    articles = [
+        make_article('OPEC+ extends cuts', summary),
+        make_article('Cartel keeps oil off the market', '<p>' + summary + '.</p>'),
+        make_article('Exxon beats estimates', 'Exxon posted a record quarterly profit on refining margins')
+    ]
+
+    compacted = PromptBudgeter().compact(articles)
+
+    assert [a['summary'] != '' for a in compacted] == [True, False, True]
+    assert [a['title'] for a in compacted] == [a['title'] for a in articles]
+
+def test_articles_fit_the_token_budget():
+    body = 'Rig counts fell again this week as operators cut spending. ' * 200
+    articles = [make_article(f'Story {i}', '<p>Drilling slows in the Permian basin for story %d.</p>' % i, body)
+                for i in range(8)]
+    budgeter = PromptBudgeter(max_tokens=800)
+
+    compacted = budgeter.compact(articles)
+
+    used = sum(estimate_tokens(a['title']) + estimate_tokens(a['summary']) + estimate_tokens(a.get('body', ''))
+               for a in compacted)
+    assert used == budgeter.sent_tokens
+    assert used <= 800
+    assert budgeter.saved_tokens > 0
+    # Every article keeps something, and bodies are cut at sentence ends
+    assert all(a.get('body', '').endswith('.') for a in compacted)
+    # The originals are left untouched
+    assert articles[0]['body'] == body
+
+if __name__ == "__main__":
+    test_clean_text_strips_feed_html()
+    test_repeated_summaries_are_dropped()
+    test_articles_fit_the_token_budget()
+    print("All prompt budget tests passed")
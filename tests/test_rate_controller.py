@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Tests for the AIMD concurrency controller used for edge-tts requests"""
+
+import os
+import sys
+import time
+import asyncio
+# Add the project root to the path (go up one directory from tests/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.rate_controller import AIMDRateController
+
+def test_additive_increase_multiplicative_decrease():
+    async def run():
+        controller = AIMDRateController(initial=4, maximum=8, cooldown=0)
+        for _ in range(4):
+            await controller.acquire()
+            await controller.release('ok')
+        assert 4.9 < controller.limit < 5.0
+        
+        await controller.acquire()
+        await controller.release('timeout')
+        assert 2.4 < controller.limit < 2.5
+        assert controller.throttles == 0
+    
+    asyncio.run(run())
+
+def test_limit_bounds_in_flight_requests():
+    async def run():
+        controller = AIMDRateController(initial=2, cooldown=0)
+        await controller.acquire()
+        await controller.acquire()
+        
+        third = asyncio.ensure_future(controller.acquire())
+        await asyncio.sleep(0.01)
+        assert not third.done()
+        
+        await controller.release('ok')
+        await asyncio.wait_for(third, timeout=1)
+        assert controller.in_flight == 2
+    
+    asyncio.run(run())
+
+def test_throttle_pauses_everyone_and_cuts_once():
+    async def run():
+        controller = AIMDRateController(initial=8, cooldown=0.2)
+        for _ in range(3):
+            await controller.acquire()
+        for _ in range(3):
+            await controller.release('throttled')
+        
+        # Three simultaneous 403s count as one congestion event
+        assert controller.limit == 4
+        assert controller.throttles == 3
+        
+        started = time.monotonic()
+        await controller.acquire()
+        assert time.monotonic() - started >= 0.15
+    
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    test_additive_increase_multiplicative_decrease()
+    test_limit_bounds_in_flight_requests()
+    test_throttle_pauses_everyone_and_cuts_once()
+    print("All rate controller tests passed")
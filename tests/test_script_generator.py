@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Tests for sectioned script generation with a stub model"""
+
+import os
+import re
+import sys
+import json
+import tempfile
+# Add the project root to the path (go up one directory from tests/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.script_generator import DialogueScriptGenerator
+from src.script_cache import ScriptCache
+
+ARTICLES = [
+    {'title': 'OPEC+ extends output cuts', 'summary': 'Producers keep barrels off the market.', 'source': 'Oil Wire'},
+    {'title': 'Permian rig count falls', 'summary': 'Three rigs were idled this week.', 'source': 'Rig Report'},
+    {'title': 'LNG exports hit a record', 'summary': 'Gulf Coast terminals ran at capacity.', 'source': 'Energy Desk'}
+]
+
+class Response:
+    def __init__(self, text):
+        self.text = text
+
+class StubModel:
+    """Answers outline and section prompts; sections named in ``fail`` raise"""
+
+    def __init__(self, outline=None, fail=()):
+        self.outline = outline
+        self.fail = set(fail)
+
+    def generate_content(self, prompt, generation_config=None):
+        if "Plan today's" in prompt:
+            if self.outline is None:
+                return Response("Sorry, I can't help with that.")
+            return Response("```json\n" + json.dumps(self.outline) + "\n```")
+        if "WARM OPENING" in prompt:
+            section = 'Opening'
+        elif "CLOSING" in prompt:
+            section = 'Closing'
+        else:
+            section = re.search(r"Title: (.*)", prompt).group(1)
+        if section in self.fail:
+            raise Exception(f"503 while writing {section}")
+        return Response(json.dumps([
+            {'speaker': 'host1', 'text': f"{section}, part one.", 'emotion': 'neutral'},
+            {'speaker': 'host2', 'text': f"{section}, part two.", 'emotion': 'excited'}
+        ]))
+
+def sections_of(script):
+    """Section titles in script order, one per run of turns"""
+    titles = []
+    for turn in script:
+        if not titles or titles[-1] != turn['section']:
+            titles.append(turn['section'])
+    return titles
+
+class FailingModel:
+    def generate_content(self, prompt, generation_config=None):
+        raise Exception("503 Service Unavailable")
+
+def generator(model, cache=None):
+    os.environ.pop('GEMINI_API_KEY', None)
+    gen = DialogueScriptGenerator(cache=cache, sectioned=True, section_workers=2)
+    gen.use_ai = True
+    gen.model = model
+    return gen
+
+def test_sections_follow_the_outline_order():
+    outline = {'theme': 'Supply tightens', 'stories': [{'article': 3, 'angle': 'Exports'}, {'article': 1}],
+               'takeaways': ['Watch OPEC'], 'watch_tomorrow': 'Inventories'}
+    gen = generator(StubModel(outline=outline))
+    script = gen.generate_dialogue_script(ARTICLES)
+
+    # Sections finish in any order but are stitched back in episode order
+    assert sections_of(script) == ['Opening', 'LNG exports hit a record', 'OPEC+ extends output cuts', 'Closing']
+    assert script[0] == {'speaker': 'host1', 'text': 'Opening, part one.', 'emotion': 'neutral', 'section': 'Opening'}
+    assert len(script) == 8
+
+def test_outline_falls_back_to_article_order():
+    # Unparseable outline, then one whose article numbers are all out of range
+    for outline in (None, {'stories': [{'article': 9}, {'article': 'two'}]}):
+        gen = generator(StubModel(outline=outline))
+        plan = gen._plan_outline(ARTICLES, None)
+        assert [story['article'] for story in plan['stories']] == [1, 2, 3]
+
+        script = gen.generate_dialogue_script(ARTICLES)
+        assert sections_of(script) == ['Opening'] + [a['title'] for a in ARTICLES] + ['Closing']
+
+def test_partial_script_is_used_but_not_cached():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ScriptCache(directory)
+        gen = generator(StubModel(fail={'Permian rig count falls', 'Closing'}), cache=cache)
+        script = gen.generate_dialogue_script(ARTICLES)
+
+        # The failed story is skipped and the stock sign-off stands in for the closing
+        assert sections_of(script) == ['Opening', 'OPEC+ extends output cuts', 'LNG exports hit a record', 'Closing']
+        assert script[-3:] == gen._add_closing()
+        assert os.listdir(directory) == []
+
+        # A complete rerun is cached and reused without calling the model
+        gen.model = StubModel()
+        complete = gen.generate_dialogue_script(ARTICLES)
+        assert len(complete) == 10 and len(os.listdir(directory)) == 1
+        gen.model = FailingModel()
+        assert gen.generate_dialogue_script(ARTICLES) == complete
+
+def test_all_sections_failed_falls_back_to_template():
+    gen = generator(FailingModel())
+    script = gen.generate_dialogue_script(ARTICLES)
+
+    # The stock sign-off alone is not an episode
+    assert script == gen._generate_template_script(ARTICLES, None)
+    assert len(script) > len(gen._add_closing())
+    assert script[0]['section'] == 'Opening'
+
+    with tempfile.TemporaryDirectory() as directory:
+        gen = generator(StubModel(fail={'Opening', 'Closing'} | {a['title'] for a in ARTICLES}),
+                        cache=ScriptCache(directory))
+        assert gen.generate_dialogue_script(ARTICLES) == gen._generate_template_script(ARTICLES, None)
+        assert os.listdir(directory) == []
+
+if __name__ == "__main__":
+    test_sections_follow_the_outline_order()
+    test_outline_falls_back_to_article_order()
+    test_partial_script_is_used_but_not_cached()
+    test_all_sections_failed_falls_back_to_template()
+    print("All script generator tests passed")
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""Tests for the single-pass TTS text normalizer"""
+
+import os
+import sys
+# Add the project root to the path (go up one directory from tests/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.text_normalizer import TextNormalizer
+
+def test_longer_terms_win_and_words_stay_whole():
+    normalizer = TextNormalizer()
+    
+    text = "Output hit 2 million bbl/d, or 60 million bbl, says the RAPID API team"
+    assert normalizer.normalize(text) == (
+        "Output hit 2 million barrels per day, or 60 million barrels, says the RAPID A P I team"
+    )
+    assert normalizer.normalize("OPEC+ and OPEC") == "O P E C plus and O P E C"
+
+def test_reactions_urls_and_pauses():
+    normalizer = TextNormalizer()
+    
+    text = "[laughs] Hmm... check https://www.eia.gov/petroleum vs. Q3 — wild"
+    assert normalizer.normalize(text) == " Hmm, check eia dot gov versus third quarter ,  wild"
+
+def test_custom_lexicon():
+    normalizer = TextNormalizer(lexicon={'FPSO': 'F P S O', 'Mb/d': 'million barrels a day'})
+    
+    assert normalizer.normalize_many(["An FPSO pumps 1 Mb/d", "FPSOs [sighs]"]) == [
+        "An F P S O pumps 1 million barrels a day", "FPSOs "
+    ]
+
+if __name__ == "__main__":
+    test_longer_terms_win_and_words_stay_whole()
+    test_reactions_urls_and_pauses()
+    test_custom_lexicon()
+    print("All text normalizer tests passed")
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Tests for timed transcripts and chapters built from TTS word timings"""
+
+import os
+import sys
+# Add the project root to the path (go up one directory from tests/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.transcript import TranscriptBuilder
+
+def build():
+    transcript = TranscriptBuilder(max_cue_words=3)
+    transcript.add_turn(
+        {'speaker': 'host1', 'text': 'Welcome back to the show, everyone.', 'section': 'Opening'},
+        1000, 2000,
+        [[0, 300, 'Welcome'], [300, 500, 'back'], [500, 600, 'to'], [600, 700, 'the'], [700, 1200, 'show'],
+         [1300, 1900, 'everyone']]
+    )
+    transcript.add_turn(
+        {'speaker': 'host2', 'text': 'OPEC again!', 'section': 'OPEC cuts output'},
+        3300, 900,
+        [[0, 500, 'O P E C'], [500, 900, 'again']]
+    )
+    transcript.add_turn({'speaker': 'host2', 'text': 'Wild.', 'section': 'OPEC cuts output'}, 4300, 400)
+    return transcript
+
+def test_cues_are_shifted_into_episode_time():
+    cues = build().cues()
+    
+    assert cues == [
+        (1000, 1600, 'Alex', 'Welcome back to'),
+        (1600, 2900, 'Alex', 'the show everyone'),
+        (3300, 4200, 'Sam', 'O P E C again'),
+        (4300, 4700, 'Sam', 'Wild.')
+    ]
+
+def test_vtt_srt_and_chapters():
+    transcript = build()
+    
+    vtt = transcript.to_vtt()
+    assert vtt.startswith("WEBVTT\n")
+    assert "00:00:01.000 --> 00:00:01.600\n<v Alex>Welcome back to" in vtt
+    assert "3\n00:00:03,300 --> 00:00:04,200\nSam: O P E C again" in transcript.to_srt()
+    assert transcript.chapters_json()['chapters'] == [
+        {'startTime': 1.0, 'title': 'Opening'},
+        {'startTime': 3.3, 'title': 'OPEC cuts output'}
+    ]
+    assert transcript.to_json()['turns'][1]['words'][0] == {'start': 3.3, 'end': 3.8, 'word': 'O P E C'}
+
+if __name__ == "__main__":
+    test_cues_are_shifted_into_episode_time()
+    test_vtt_srt_and_chapters()
+    print("All transcript tests passed")
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Tests for the pluggable TTS backends (offline ones only)"""
+
+import io
+import os
+import sys
+import wave
+import struct
+import tempfile
+import asyncio
+# Add the project root to the path (go up one directory from tests/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.tts_backends import EspeakBackend, ToneBackend, get_backend
+from src.tts_batching import join_turns, split_points
+from src.tts_cache import TTSCache
+from src.build_journal import BuildJournal
+
+def test_tone_backend_is_deterministic_wav_with_timings():
+    backend = ToneBackend()
+    text = "Brent crude rose, and WTI followed. Big week!"
+    audio, words = asyncio.run(backend.synthesize(text, 'en-US-GuyNeural', '+0%', '-3Hz'))
+    again, _ = asyncio.run(backend.synthesize(text, 'en-US-GuyNeural', '+0%', '-3Hz'))
+    assert audio == again
+
+    assert [word for _, _, word in words] == ["Brent", "crude", "rose", "and", "WTI", "followed", "Big", "week"]
+    assert all(start < end for start, end, _ in words)
+    assert all(a[1] <= b[0] for a, b in zip(words, words[1:]))
+
+    with wave.open(io.BytesIO(audio), 'rb') as wav:
+        duration_ms = wav.getnframes() * 1000 / wav.getframerate()
+    assert words[-1][1] <= duration_ms
+
+    # Another voice or a faster rate changes the audio
+    other, _ = asyncio.run(backend.synthesize(text, 'en-US-AriaNeural', '+0%', '-3Hz'))
+    faster, fast_words = asyncio.run(backend.synthesize(text, 'en-US-GuyNeural', '+20%', '-3Hz'))
+    assert other != audio
+    assert fast_words[-1][1] < words[-1][1]
+
+def test_tone_backend_unspeakable_text_is_silence():
+    audio, words = asyncio.run(ToneBackend().synthesize("... !", 'en-US-GuyNeural', '+0%', '+0Hz'))
+    assert words == []
+    with wave.open(io.BytesIO(audio), 'rb') as wav:
+        assert wav.getnframes() > 0
+        assert set(wav.readframes(wav.getnframes())) == {0}
+
+def test_tone_timings_split_merged_turns():
+    texts = ["Oil is up", "Big news!"]
+    _, words = asyncio.run(ToneBackend().synthesize(join_turns(texts), 'en-US-GuyNeural', '+0%', '+0Hz'))
+    cuts = split_points(texts, words)
+    assert len(cuts) == 1
+    assert words[2][1] < cuts[0] < words[3][0]
+
+def test_get_backend_names():
+    assert get_backend('edge').name == 'edge'
+    assert get_backend('tone').name == 'tone'
+    assert get_backend('local').name in ('espeak', 'tone')
+    try:
+        get_backend('nope')
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+def test_wav_audio_is_stored_as_wav():
+    with tempfile.TemporaryDirectory() as root:
+        cache = TTSCache(os.path.join(root, 'tts'))
+        cache.put('k', b'RIFF....WAVE', meta={'words': []}, audio_format='wav')
+        assert os.path.exists(os.path.join(root, 'tts', 'k.wav'))
+        assert cache.get('k', 'wav') == b'RIFF....WAVE'
+        assert cache.get('k') is None
+
+        journal = BuildJournal('2025-01-01', root=root)
+        turn = {'speaker': 'host1', 'text': 'Hi'}
+        journal.record(0, [turn], [(b'RIFF....WAVE', 0, None, [])], 'wav')
+        assert os.listdir(journal.audio_dir) == ['0000.wav']
+        assert BuildJournal('2025-01-01', root=root).lookup(0, turn)[0] == b'RIFF....WAVE'
+
+def test_espeak_duration_ignores_streamed_header_size():
+    with tempfile.TemporaryDirectory() as root:
+        # Half a second of 22.05 kHz audio behind the placeholder sizes espeak writes to a pipe
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(22050)
+            wav.writeframes(b'\x01\x00' * 11025)
+        streamed = bytearray(buffer.getvalue())
+        struct.pack_into('<I', streamed, 4, 0x7ffff024)
+        struct.pack_into('<I', streamed, 40, 0x7ffff000)
+        audio_path = os.path.join(root, 'speech.wav')
+        with open(audio_path, 'wb') as f:
+            f.write(streamed)
+
+        # Stands in for espeak: writes the WAV to stdout whatever the arguments
+        executable = os.path.join(root, 'espeak')
+        with open(executable, 'w') as f:
+            f.write(f"#!{sys.executable}\nimport sys\n"
+                    f"sys.stdout.buffer.write(open({audio_path!r}, 'rb').read())\n")
+        os.chmod(executable, 0o755)
+
+        backend = EspeakBackend(executable)
+        audio, words = asyncio.run(backend.synthesize("Brent rose", 'en-US-GuyNeural', '+0%', '+0Hz'))
+        assert [word for _, _, word in words] == ['Brent', 'rose']
+        assert 400 < words[-1][1] < 500
+        with wave.open(io.BytesIO(audio), 'rb') as wav:
+            assert wav.getnframes() == 11025
+        assert struct.unpack_from('<I', audio, 4)[0] == len(audio) - 8
+
+if __name__ == "__main__":
+    test_tone_backend_is_deterministic_wav_with_timings()
+    test_tone_backend_unspeakable_text_is_silence()
+    test_tone_timings_split_merged_turns()
+    test_get_backend_names()
+    test_wav_audio_is_stored_as_wav()
+    test_espeak_duration_ignores_streamed_header_size()
+    print("All TTS backend tests passed")
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Tests for merging same-voice turns into one TTS request and splitting them back"""
+
+import os
+import sys
+import asyncio
+# Add the project root to the path (go up one directory from tests/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.tts_batching import coalesce_turns, join_turns, split_points
+
+def word(text, start_ms, duration_ms=100):
+    return [start_ms, start_ms + duration_ms, text]
+
+def test_split_points_fall_between_turns():
+    texts = ["Oil is up", "Big news!", "Yes"]
+    assert join_turns(texts) == "Oil is up. Big news! Yes."
+    
+    boundaries = [
+        word("Oil", 0), word("is", 100), word("up", 200),
+        word("Big", 600), word("news", 700),
+        word("Yes", 1200)
+    ]
+    assert split_points(texts, boundaries) == [450, 1000]
+
+def test_unmatched_turn_gives_up():
+    boundaries = [word("Oil", 0), word("is", 100), word("up", 200)]
+    assert split_points(["Oil is up", "Big news"], boundaries) is None
+
+def test_coalesce_groups_consecutive_keys():
+    turns = [
+        {'speaker': 'host1', 'text': 'a'}, {'speaker': 'host1', 'text': 'b'},
+        {'speaker': 'host2', 'text': 'c'}, {'speaker': None, 'text': 'd'},
+        {'speaker': None, 'text': 'e'}, {'speaker': 'host2', 'text': 'f' * 5},
+        {'speaker': 'host2', 'text': 'g' * 5}
+    ]
+    
+    async def collect():
+        async def stream():
+            for turn in turns:
+                yield turn
+        return [[t['text'][0] for t in group]
+                async for group in coalesce_turns(stream(), lambda t: t['speaker'], max_chars=8)]
+    
+    assert asyncio.run(collect()) == [['a', 'b'], ['c'], ['d'], ['e'], ['f'], ['g']]
+
+if __name__ == "__main__":
+    test_split_points_fall_between_turns()
+    test_unmatched_turn_gives_up()
+    test_coalesce_groups_consecutive_keys()
+    print("All TTS batching tests passed")